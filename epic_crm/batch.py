@@ -0,0 +1,197 @@
+import click
+import shlex
+import time
+from typing import Iterable, List
+
+from click import termui
+from sqlalchemy import Connection
+from sqlalchemy.orm import Session
+
+from controllers.database_controller import SessionLocal, get_engine
+from controllers.permissions import get_security_context
+from controllers.utils import use_session_factory
+
+
+class BatchLine:
+    """
+    Result of one line of a batch.
+
+    Attributes:
+        number (int): Line number in the script.
+        argv (List[str]): CLI arguments of the line.
+        ok (bool): Whether the command succeeded.
+        duration (float): Execution time in seconds.
+    """
+
+    def __init__(self, number: int, argv: List[str], ok: bool, duration: float) -> None:
+        self.number = number
+        self.argv = argv
+        self.ok = ok
+        self.duration = duration
+
+    def __str__(self) -> str:
+        status = "ok" if self.ok else "échec"
+        return f"[{status}] ligne {self.number} ({self.duration * 1000:.1f} ms) : {shlex.join(self.argv)}"
+
+
+def parse_script(lines: Iterable[str]) -> Iterable[tuple]:
+    """
+    Read the commands of a batch script: one CLI command per line (without ``python main.py``),
+    ``#`` starting a comment.
+
+    Args:
+        lines (Iterable[str]): Lines of the script.
+
+    Yields:
+        tuple: ``(line number, argv)`` for each non-empty line.
+
+    Raises:
+        ValueError: If a line is not valid shell syntax (unbalanced quotes).
+    """
+    for number, line in enumerate(lines, start=1):
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as e:
+            raise ValueError(f"Ligne {number} : {e}")
+        if argv:
+            yield number, argv
+
+
+def _no_prompt(text: str = "") -> str:
+    # Batch lines must give every option: a missing one aborts the command instead of
+    # reading the next lines of the script.
+    raise EOFError()
+
+
+class BatchRunner:
+    """
+    Run CLI commands one after the other in the current process, on a single connection.
+
+    The sessions of the commands are bound to that connection and share one security
+    context, so the principal is resolved once for the whole batch. With
+    ``single_transaction``, the batch runs in one transaction: each line gets a savepoint,
+    rolled back when the line fails, and the commits of the managers only release
+    their own savepoints.
+    """
+
+    def __init__(self, connection: Connection, single_transaction: bool = False) -> None:
+        """
+        Initialize the runner.
+
+        Args:
+            connection (Connection): Connection shared by every command.
+            single_transaction (bool): Run the whole batch in one transaction.
+        """
+        self.connection = connection
+        self.single_transaction = single_transaction
+        self.security_context = None
+        self.transaction = None
+
+    def open_session(self) -> Session:
+        """
+        Open the session of a command on the shared connection.
+
+        Returns:
+            Session: The new session.
+        """
+        join_transaction_mode = "create_savepoint" if self.single_transaction else "conditional_savepoint"
+        session = SessionLocal(bind=self.connection, join_transaction_mode=join_transaction_mode)
+        if self.security_context is None:
+            self.security_context = get_security_context(session)
+        else:
+            self.security_context.bind(session)
+        return session
+
+    def run(self, commands: Iterable[tuple], stop_on_error: bool = False) -> List[BatchLine]:
+        """
+        Run the commands, reporting each line as it completes.
+
+        Args:
+            commands (Iterable[tuple]): ``(line number, argv)`` pairs (see ``parse_script``).
+            stop_on_error (bool): Stop at the first failure; with ``single_transaction``,
+                nothing is committed then.
+
+        Returns:
+            List[BatchLine]: The result of each executed line.
+        """
+        results = []
+        if self.single_transaction:
+            # Nested in the caller's transaction when the connection already has one.
+            self.transaction = (
+                self.connection.begin_nested() if self.connection.in_transaction() else self.connection.begin()
+            )
+
+        visible_prompt, hidden_prompt = termui.visible_prompt_func, termui.hidden_prompt_func
+        termui.visible_prompt_func = termui.hidden_prompt_func = _no_prompt
+        completed = False
+        try:
+            with use_session_factory(self.open_session):
+                for number, argv in commands:
+                    results.append(self._run_line(number, argv))
+                    click.secho(str(results[-1]), fg="green" if results[-1].ok else "red", err=True)
+                    if stop_on_error and not results[-1].ok:
+                        break
+                else:
+                    completed = True
+        finally:
+            termui.visible_prompt_func, termui.hidden_prompt_func = visible_prompt, hidden_prompt
+            if self.transaction is not None and completed:
+                self.transaction.commit()
+            elif self.transaction is not None:
+                self.transaction.rollback()
+        return results
+
+    def _run_line(self, number: int, argv: List[str]) -> BatchLine:
+        from main import run
+
+        savepoint = self.connection.begin_nested() if self.single_transaction else None
+        start = time.perf_counter()
+        exit_code = 0
+        # The commands report their failures with a non-zero exit code (see ``views.output.echo_error``).
+        try:
+            run(argv)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            # Already reported by run(): the batch goes on with the next line.
+            exit_code = 1
+        ok = exit_code == 0
+        if savepoint is not None and ok:
+            savepoint.commit()
+        elif savepoint is not None:
+            savepoint.rollback()
+        return BatchLine(number, argv, ok, time.perf_counter() - start)
+
+
+def run_batch(lines: Iterable[str], single_transaction: bool = False, stop_on_error: bool = False) -> List[BatchLine]:
+    """
+    Run a batch script on one pooled connection and print the throughput.
+
+    The whole script is parsed before the first command runs.
+
+    Args:
+        lines (Iterable[str]): Lines of the script (see ``parse_script``).
+        single_transaction (bool): Run the whole batch in one transaction, a savepoint per line.
+        stop_on_error (bool): Stop at the first failure.
+
+    Returns:
+        List[BatchLine]: The result of each executed line.
+
+    Raises:
+        ValueError: If a line is not valid shell syntax.
+    """
+    commands = list(parse_script(lines))
+    start = time.perf_counter()
+    with get_engine().connect() as connection:
+        results = BatchRunner(connection, single_transaction).run(commands, stop_on_error)
+    elapsed = time.perf_counter() - start
+
+    failed = sum(not result.ok for result in results)
+    rate = len(results) / elapsed if elapsed else 0
+    click.secho(
+        f"{len(results)} commande(s) en {elapsed:.2f} s ({rate:.1f} commandes/s) : "
+        f"{len(results) - failed} réussie(s), {failed} en échec.",
+        fg="red" if failed else "green",
+        err=True,
+    )
+    return results
@@ -0,0 +1,434 @@
+import click
+import contextlib
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+
+MAIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MAIN_DIR)
+
+# The engine is created on first use: the benchmark database is configured before that.
+from controllers.database_controller import get_engine
+
+# Size label -> number of clients, contracts and events.
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+SALES_USERS = 10
+SUPPORT_USERS = 10
+SEED_CHUNK_SIZE = 10_000
+
+# A scenario is a regression when it is this much slower than the baseline...
+REGRESSION_TOLERANCE = 0.2
+# ...and at least this many milliseconds slower (timer noise on the fastest scenarios).
+NOISE_FLOOR_MS = 0.5
+
+_unique = itertools.count()
+
+
+def summarize(durations) -> dict:
+    """
+    Return the ``min``, ``median``, ``mean`` and ``max`` of durations in milliseconds.
+    """
+    return {
+        "min": round(min(durations), 3),
+        "median": round(statistics.median(durations), 3),
+        "mean": round(statistics.mean(durations), 3),
+        "max": round(max(durations), 3),
+    }
+
+
+class Dataset:
+    """
+    Users of a seeded benchmark database: one accounting user, ``SALES_USERS`` sales
+    users and ``SUPPORT_USERS`` support users. Client, contract and event ``n`` (IDs
+    from 1) belong together; clients are spread over the sales users round-robin.
+    """
+
+    def __init__(self, size: int, accounting_id: int, sales_ids: list, support_ids: list) -> None:
+        self.size = size
+        self.accounting_id = accounting_id
+        self.sales_ids = sales_ids
+        self.support_ids = support_ids
+
+
+def seed(session, size: int) -> Dataset:
+    """
+    Recreate the tables and insert ``size`` clients, contracts and events with batched INSERTs.
+
+    Args:
+        session (Session): Session on the benchmark database.
+        size (int): Number of clients, contracts and events.
+
+    Returns:
+        Dataset: IDs of the seeded users.
+    """
+    from sqlalchemy import insert
+    from controllers.authentication import hash_password
+    from models.base import Base
+    from models.clients import Client
+    from models.contracts import Contract
+    from models.events import Event
+    from models.users import Department, User
+
+    Base.metadata.drop_all(session.get_bind())
+    Base.metadata.create_all(session.get_bind())
+
+    # bcrypt is slow on purpose: every seeded user shares one hash.
+    hashed_password = hash_password("benchmark")
+    roles = [Department.ACCOUNTING] + [Department.SALES] * SALES_USERS + [Department.SUPPORT] * SUPPORT_USERS
+    session.execute(
+        insert(User),
+        [
+            {
+                "first_name": role.name.title(),
+                "last_name": str(index),
+                "email": f"{role.name.lower()}{index}@bench.com",
+                "hashed_password": hashed_password,
+                "role": role,
+            }
+            for index, role in enumerate(roles)
+        ],
+    )
+    session.commit()
+    accounting_id, *user_ids = range(1, len(roles) + 1)
+    sales_ids, support_ids = user_ids[:SALES_USERS], user_ids[SALES_USERS:]
+
+    start_date = datetime(2025, 1, 1)
+    for first in range(0, size, SEED_CHUNK_SIZE):
+        numbers = range(first, min(first + SEED_CHUNK_SIZE, size))
+        session.execute(
+            insert(Client),
+            [
+                {
+                    "full_name": f"Client {n}",
+                    "email": f"client{n}@bench.com",
+                    "phone": f"+33{n:09d}",
+                    "enterprise": f"Enterprise {n % 1000}",
+                    "sales_contact_id": sales_ids[n % SALES_USERS],
+                }
+                for n in numbers
+            ],
+        )
+        session.execute(
+            insert(Contract),
+            [
+                {
+                    "client_id": n + 1,
+                    "sales_contact_id": sales_ids[n % SALES_USERS],
+                    "total_amount": 1000 + n % 9000,
+                    "to_be_paid": (n % 3) * 500,
+                    "is_signed": n % 4 != 3,
+                }
+                for n in numbers
+            ],
+        )
+        session.execute(
+            insert(Event),
+            [
+                {
+                    "event_name": f"Event {n}",
+                    "start_date": start_date + timedelta(hours=n),
+                    "end_date": start_date + timedelta(hours=n + 4),
+                    "location": f"Room {n % 50}",
+                    "attendees": n % 300,
+                    "notes": "",
+                    "contract_id": n + 1,
+                    "client_id": n + 1,
+                    "support_contact_id": support_ids[n % SUPPORT_USERS] if n % 5 else None,
+                }
+                for n in numbers
+            ],
+        )
+        session.commit()
+    return Dataset(size, accounting_id, sales_ids, support_ids)
+
+
+def login_as(user_id: int, role: str):
+    """
+    Write the token of a user in the current directory, as ``login`` does.
+    """
+    from controllers.authentication import create_access_token
+
+    with open(".token", "w") as f:
+        f.write(create_access_token({"user_id": user_id, "role": role}))
+
+
+def run_view(command, arguments):
+    """
+    Run a click command with its output discarded (the formatting cost is still measured).
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        command.main(arguments, standalone_mode=False)
+
+
+def build_scenarios(data: Dataset) -> list:
+    """
+    Build the scenarios of a seeded database.
+
+    Each scenario is ``(name, (user ID, role), prepare, run)``: ``prepare(session)``
+    creates what the timed ``run(session, prepared)`` needs (e.g. a record to delete)
+    and is not timed. Every run gets a new session, like a CLI command.
+    """
+    from sqlalchemy import insert
+    from controllers.cascade_controller import CascadeResolver
+    from controllers.client_controller import ClientsManager
+    from controllers.contract_controller import ContractsManager
+    from controllers.event_controller import EventsManager
+    from controllers.user_controller import UserManager
+    from models.clients import Client
+    from models.contracts import Contract
+    from models.events import Event
+    from models.users import Department, User
+    from views import client_view, contract_view, event_view, user_view
+
+    sales = (data.sales_ids[0], "SALES")
+    support = (data.support_ids[1], "SUPPORT")
+    accounting = (data.accounting_id, "ACCOUNTING")
+    middle = data.size // 2 + 1
+
+    def new_client(session):
+        n = next(_unique)
+        row = {"full_name": "New", "email": f"new{n}@bench.com", "phone": f"+34{n:09d}", "sales_contact_id": sales[0]}
+        return session.execute(insert(Client).returning(Client.id), [row]).scalar_one()
+
+    def new_contract(session):
+        row = {"client_id": 1, "sales_contact_id": sales[0], "total_amount": 10, "to_be_paid": 0, "is_signed": True}
+        return session.execute(insert(Contract).returning(Contract.id), [row]).scalar_one()
+
+    def new_event(session):
+        row = {
+            "event_name": "New",
+            "start_date": datetime(2026, 1, 1),
+            "end_date": datetime(2026, 1, 2),
+            "location": "Room",
+            "attendees": 1,
+            "contract_id": 1,
+            "client_id": 1,
+        }
+        return session.execute(insert(Event).returning(Event.id), [row]).scalar_one()
+
+    def new_user(session):
+        row = {
+            "first_name": "New",
+            "last_name": "User",
+            "email": f"user{next(_unique)}@bench.com",
+            "hashed_password": "x",
+            "role": Department.SUPPORT,
+        }
+        return session.execute(insert(User).returning(User.id), [row]).scalar_one()
+
+    def prepared(factory):
+        def prepare(session):
+            id_ = factory(session)
+            session.commit()
+            return id_
+
+        return prepare
+
+    def create_client(session, _):
+        n = next(_unique)
+        ClientsManager(session).create(email=f"c{n}@bench.com", full_name="C", phone=f"+35{n:09d}", enterprise="E")
+
+    def create_event(session, _):
+        EventsManager(session).create("E", datetime(2026, 1, 1), datetime(2026, 1, 2), "Room", 10, "", 1)
+
+    def create_user(session, _):
+        UserManager(session).create("New", "User", f"u{next(_unique)}@bench.com", "password", Department.SUPPORT)
+
+    def resolve_user_cascade(session, _):
+        CascadeResolver(session).resolve_user_cascade([session.get(User, sales[0])])
+
+    return [
+        ("clients.create", sales, None, create_client),
+        ("clients.update", sales, None, lambda s, _: ClientsManager(s).update(Client.id == 1, enterprise="Updated")),
+        ("clients.delete", sales, prepared(new_client), lambda s, id_: ClientsManager(s).delete(Client.id == id_)),
+        ("clients.get", sales, None, lambda s, _: ClientsManager(s).get(Client.id == middle)),
+        ("clients.get_page", sales, None, lambda s, _: ClientsManager(s).get_page(after=middle)),
+        ("contracts.create", sales, None, lambda s, _: ContractsManager(s).create(1, 1000, 500, True)),
+        ("contracts.update", sales, None, lambda s, _: ContractsManager(s).update(Contract.id == 1, to_be_paid=100)),
+        (
+            "contracts.delete",
+            sales,
+            prepared(new_contract),
+            lambda s, id_: ContractsManager(s).delete(Contract.id == id_),
+        ),
+        ("contracts.get_page", sales, None, lambda s, _: ContractsManager(s).get_page(after=middle)),
+        ("events.create", sales, None, create_event),
+        ("events.update", support, None, lambda s, _: EventsManager(s).update(Event.id == 2, notes="Updated")),
+        ("events.delete", accounting, prepared(new_event), lambda s, id_: EventsManager(s).delete(Event.id == id_)),
+        ("events.get_page", support, None, lambda s, _: EventsManager(s).get_page(after=middle)),
+        ("users.create", accounting, None, create_user),
+        ("users.update", accounting, None, lambda s, _: UserManager(s).update(User.id == sales[0], first_name="S")),
+        ("users.delete", accounting, prepared(new_user), lambda s, id_: UserManager(s).delete(User.id == id_)),
+        ("users.get_rows", accounting, None, lambda s, _: UserManager(s).get_rows(limit=50)),
+        ("cascade.resolve_user_cascade", accounting, None, resolve_user_cascade),
+        (
+            "cascade.summarize_user_cascade",
+            accounting,
+            None,
+            lambda s, _: CascadeResolver(s).summarize_user_cascade(User.id == sales[0]),
+        ),
+        ("views.client_list_page", sales, None, lambda s, _: run_view(client_view.list, ["--limit", "50"])),
+        ("views.client_list_csv", sales, None, lambda s, _: run_view(client_view.list, ["--format", "csv"])),
+        ("views.contract_list_csv", sales, None, lambda s, _: run_view(contract_view.list, ["--format", "csv"])),
+        ("views.event_list_ndjson", sales, None, lambda s, _: run_view(event_view.list, ["--format", "ndjson"])),
+        ("views.list_users", accounting, None, lambda s, _: run_view(user_view.list_users, [])),
+    ]
+
+
+def run_scenario(scenario, runs: int) -> dict:
+    """
+    Run a scenario ``runs`` times (plus one discarded warm-up run) and summarize its durations.
+    """
+    from controllers.database_controller import SessionLocal
+
+    _, (user_id, role), prepare, run = scenario
+    login_as(user_id, role)
+    durations = []
+    for index in range(runs + 1):
+        session = SessionLocal()
+        try:
+            prepared = prepare(session) if prepare else None
+            start = time.perf_counter()
+            run(session, prepared)
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            session.close()
+        if index > 0:
+            durations.append(elapsed)
+    return summarize(durations)
+
+
+def compare(results: dict, baseline: dict, tolerance: float = REGRESSION_TOLERANCE) -> list:
+    """
+    Compare the median durations of two benchmark results.
+
+    Args:
+        results (dict): ``{size: {scenario: stats}}`` of the current run.
+        baseline (dict): Same structure, from a previous run.
+        tolerance (float): Accepted slowdown, as a fraction of the baseline.
+
+    Returns:
+        list: ``(size, scenario, baseline median, current median)`` of the regressions.
+    """
+    regressions = []
+    for size, scenarios in results.items():
+        for name, stats in scenarios.items():
+            reference = baseline.get(size, {}).get(name)
+            if reference is None:
+                continue
+            before, after = reference["median"], stats["median"]
+            if after > before * (1 + tolerance) and after - before > NOISE_FLOOR_MS:
+                regressions.append((size, name, before, after))
+    return regressions
+
+
+def run_benchmark(labels: List[str], runs: int, selected: Tuple[str]) -> dict:
+    """
+    Seed the database of each size and measure its scenarios.
+
+    Returns:
+        dict: Statistics of each scenario, per size.
+    """
+    from controllers.database_controller import SessionLocal
+
+    results = {}
+    for label in labels:
+        session = SessionLocal()
+        start = time.perf_counter()
+        data = seed(session, SIZES[label])
+        session.close()
+        click.echo(f"[{label}] base remplie en {time.perf_counter() - start:.1f} s ({get_engine().dialect.name})")
+
+        results[label] = {}
+        for scenario in build_scenarios(data):
+            if selected and not any(scenario[0].startswith(prefix) for prefix in selected):
+                continue
+            stats = run_scenario(scenario, runs)
+            results[label][scenario[0]] = stats
+            click.echo(
+                f"{scenario[0]:<32} min {stats['min']:>10} ms | median {stats['median']:>10} ms | "
+                f"mean {stats['mean']:>10} ms | max {stats['max']:>10} ms"
+            )
+    get_engine().dispose()
+    return results
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    default="1k",
+    show_default=True,
+    help=f"Tailles mesurées, séparées par des virgules ({', '.join(SIZES)}).",
+)
+@click.option("--runs", default=5, show_default=True, help="Nombre d'exécutions mesurées par scénario.")
+@click.option(
+    "--database-url",
+    default=None,
+    help="Base utilisée (SQLite temporaire par défaut). ATTENTION : ses tables sont supprimées et recréées.",
+)
+@click.option("--scenario", "selected", multiple=True, help="Ne mesurer que ces scénarios (préfixe, ex : clients.).")
+@click.option(
+    "--json-output",
+    type=click.Path(dir_okay=False, resolve_path=True),
+    default=None,
+    help="Fichier JSON des résultats.",
+)
+@click.option(
+    "--compare",
+    "baseline_path",
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    default=None,
+    help="Résultats JSON de référence : les régressions sont signalées (code de sortie 1).",
+)
+@click.option(
+    "--tolerance", default=REGRESSION_TOLERANCE, show_default=True, help="Ralentissement toléré (0.2 = 20 %)."
+)
+def managers(sizes, runs, database_url, selected, json_output, baseline_path, tolerance):
+    """
+    Measure the managers (CRUD and permission-checked reads), the user cascade and
+    the list views on a seeded database of 1k, 100k or 1M clients, contracts and events.
+    """
+    labels = [label.strip().lower() for label in sizes.split(",") if label.strip()]
+    unknown = [label for label in labels if label not in SIZES]
+    if unknown:
+        raise click.BadParameter(f"Tailles inconnues : {', '.join(unknown)}.", param_hint="--sizes")
+
+    # The paths of the options are absolute (resolve_path): the benchmark runs in its temporary directory.
+    caller_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = database_url or f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        os.environ.setdefault("AUDIT_FILE", os.path.join(workdir, "audit.log"))
+        os.chdir(workdir)
+        try:
+            results = run_benchmark(labels, runs, selected)
+        finally:
+            os.chdir(caller_dir)
+
+    if json_output:
+        with open(json_output, "w") as f:
+            json.dump({"database": get_engine().dialect.name, "runs": runs, "results": results}, f, indent=2)
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, tolerance)
+        for size, name, before, after in regressions:
+            click.secho(
+                f"RÉGRESSION [{size}] {name} : {before} ms -> {after} ms (+{after / before - 1:.0%})", fg="red"
+            )
+        if regressions:
+            sys.exit(1)
+        click.secho("Aucune régression.", fg="green")
+
+
+if __name__ == "__main__":
+    managers()
@@ -0,0 +1,71 @@
+import click
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# Scenario name -> CLI arguments passed to main.py
+SCENARIOS = {
+    "help": ["--help"],
+    "logout": ["logout"],
+}
+
+
+def time_command(arguments, runs: int, cwd: str) -> dict:
+    """
+    Run ``python main.py <arguments>`` several times and measure its wall-clock duration.
+
+    Args:
+        arguments (List[str]): Arguments passed to main.py.
+        runs (int): Number of measured runs (one extra warm-up run is discarded).
+        cwd (str): Working directory of the process (``logout`` deletes ``.token`` there).
+
+    Returns:
+        dict: ``min``, ``median``, ``mean`` and ``max`` durations in milliseconds.
+    """
+    durations = []
+    for run in range(runs + 1):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN_PATH, *arguments], cwd=cwd, capture_output=True, check=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        if run > 0:
+            durations.append(elapsed)
+
+    return {
+        "min": round(min(durations), 2),
+        "median": round(statistics.median(durations), 2),
+        "mean": round(statistics.mean(durations), 2),
+        "max": round(max(durations), 2),
+    }
+
+
+@click.command()
+@click.option("--runs", default=10, show_default=True, help="Nombre d'exécutions mesurées par scénario.")
+@click.option("--json-output", type=click.Path(dir_okay=False), default=None, help="Fichier JSON des résultats.")
+def startup(runs, json_output):
+    """
+    Measure the startup time of the CLI for `main.py --help` and `main.py logout`.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as cwd:
+        for name, arguments in SCENARIOS.items():
+            results[name] = time_command(arguments, runs, cwd)
+            stats = results[name]
+            click.echo(
+                f"{name:<8} min {stats['min']:>8} ms | median {stats['median']:>8} ms | "
+                f"mean {stats['mean']:>8} ms | max {stats['max']:>8} ms"
+            )
+
+    if json_output:
+        with open(json_output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    startup()
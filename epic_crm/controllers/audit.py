@@ -0,0 +1,216 @@
+import atexit
+import json
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+
+from controllers import config
+
+
+AUDIT_FILE = "audit.log"
+AUDIT_BUFFER_SIZE = 10000
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 1.0
+
+_STOP = object()
+
+
+class AuditLog:
+    """
+    Append-only audit trail of the writes made through the managers.
+
+    Entries are put in a bounded in-memory buffer and written by a background thread,
+    in batches, as JSON lines; the managers never wait for the disk or for Sentry. When
+    the buffer is full, ``record`` waits for the writer (it never drops an entry).
+    A sample of the entries can be forwarded to Sentry.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = AUDIT_BUFFER_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        sentry_sample_rate: float = 0.0,
+    ) -> None:
+        """
+        Initialize the audit log and start its writer thread.
+
+        Args:
+            path (str): File the entries are appended to.
+            buffer_size (int): Maximum number of entries waiting to be written.
+            batch_size (int): Maximum number of entries written at once.
+            flush_interval (float): Maximum time, in seconds, an entry waits for a batch.
+            sentry_sample_rate (float): Share of the entries forwarded to Sentry (0 to 1).
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sentry_sample_rate = sentry_sample_rate
+        self._buffer = queue.Queue(maxsize=buffer_size)
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, action: str, table: str, user_id: int = None, ids: List[int] = None, count: int = None, **details):
+        """
+        Add an entry to the buffer.
+
+        Args:
+            action (str): ``create``, ``update`` or ``delete``.
+            table (str): Name of the modified table.
+            user_id (int): ID of the authenticated user (None for unauthenticated operations).
+            ids (List[int]): IDs of the modified records, when known.
+            count (int): Number of modified records.
+            **details: Other fields of the entry, written with ``str`` when they are not
+                JSON-serializable.
+        """
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "user_id": user_id,
+            "action": action,
+            "table": table,
+            "ids": ids,
+            "count": count,
+            **details,
+        }
+        self._buffer.put(entry)
+
+    def flush(self):
+        """
+        Wait until every recorded entry is written.
+        """
+        self._buffer.join()
+
+    def close(self):
+        """
+        Write the remaining entries and stop the writer thread.
+        """
+        if self._writer.is_alive():
+            self._buffer.put(_STOP)
+            self._writer.join()
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            try:
+                batch = [self._buffer.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._buffer.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [entry for entry in batch if entry is not _STOP]
+            stopped = len(entries) != len(batch)
+            try:
+                self._write(entries)
+            except Exception as e:
+                # The writer thread must survive any error: ``record`` and ``flush`` wait for it.
+                self._report(e)
+            finally:
+                for _ in batch:
+                    self._buffer.task_done()
+
+    def _write(self, entries: List[dict]):
+        if not entries:
+            return
+        try:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.writelines(json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in entries)
+        except OSError as e:
+            self._report(e)
+        for entry in entries:
+            if self.sentry_sample_rate and random.random() < self.sentry_sample_rate:
+                self._forward(entry)
+
+    def _forward(self, entry: dict):
+        from controllers.monitoring import capture_message
+
+        ids = entry["ids"] if entry["ids"] is not None else f"{entry['count']} record(s)"
+        try:
+            capture_message(message=f"user {entry['user_id']} : {entry['action']} {entry['table']} : {ids}")
+        except Exception as e:
+            self._report(e)
+
+    def _report(self, error: Exception):
+        # The writer thread must survive a full disk or an unreachable Sentry.
+        from controllers.monitoring import capture_exception
+
+        try:
+            capture_exception(error)
+        except Exception:
+            pass
+
+
+_audit_log = None
+_audit_log_lock = threading.Lock()
+
+
+def get_audit_log() -> AuditLog:
+    """
+    Return the audit log of the process, created on first use from the settings
+    (``AUDIT_FILE``, ``AUDIT_BUFFER_SIZE``, ``AUDIT_BATCH_SIZE``, ``AUDIT_FLUSH_INTERVAL``,
+    ``AUDIT_SENTRY_SAMPLE_RATE``). Its remaining entries are written when the process exits.
+
+    Returns:
+        AuditLog: The audit log.
+    """
+    global _audit_log
+    with _audit_log_lock:
+        if _audit_log is None:
+            _audit_log = AuditLog(
+                config.get_str("AUDIT_FILE", AUDIT_FILE),
+                buffer_size=config.get_int("AUDIT_BUFFER_SIZE", AUDIT_BUFFER_SIZE),
+                batch_size=config.get_int("AUDIT_BATCH_SIZE", AUDIT_BATCH_SIZE),
+                flush_interval=config.get_float("AUDIT_FLUSH_INTERVAL", AUDIT_FLUSH_INTERVAL),
+                sentry_sample_rate=config.get_float("AUDIT_SENTRY_SAMPLE_RATE", 0.0),
+            )
+            atexit.register(_audit_log.close)
+    return _audit_log
+
+
+def record(action: str, table: str, user_id: int = None, ids: List[int] = None, count: int = None, **details):
+    """
+    Add an entry to the audit log of the process (see ``AuditLog.record``).
+    """
+    get_audit_log().record(action, table, user_id=user_id, ids=ids, count=count, **details)
+
+
+def ids_from_clause(model: type, where_clause) -> List[int]:
+    """
+    Read the targeted IDs from a ``Model.id == value`` or ``Model.id.in_(values)`` condition,
+    so that they are audited without querying the database.
+
+    Args:
+        model (type): SQLAlchemy model.
+        where_clause: SQLAlchemy condition.
+
+    Returns:
+        List[int]: The IDs, or None when the condition is not on the ID alone.
+    """
+    if not isinstance(where_clause, BinaryExpression) or not where_clause.left.compare(model.__table__.c.id):
+        return None
+    if not isinstance(where_clause.right, BindParameter):
+        return None
+    value = where_clause.right.value
+    if where_clause.operator is operators.eq:
+        return [value]
+    if where_clause.operator is operators.in_op:
+        return list(value)
+    return None
+
+
+def describe_clause(where_clause) -> str:
+    """
+    Render a condition as SQL with its values, for the entries whose IDs are unknown.
+    """
+    try:
+        return str(where_clause.compile(compile_kwargs={"literal_binds": True}))
+    except Exception:
+        return str(where_clause)
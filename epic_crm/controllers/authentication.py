@@ -1,34 +1,90 @@
 import bcrypt
+import functools
 import jwt
-import os
 import click
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from typing import Iterable, List
 from models.users import User
-from dotenv import load_dotenv
 import sqlalchemy
 from sqlalchemy.orm import Session
+from controllers import config
 from .database_controller import SessionLocal
 
 
-load_dotenv()
-
-SECRET_KEY = os.getenv("SECRET_KEY", "super-secret-key")
+SECRET_KEY = config.get_str("SECRET_KEY", "super-secret-key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
-MASTER_PASSWORD = os.getenv("MASTER_PASSWORD")
+MASTER_PASSWORD = config.get_str("MASTER_PASSWORD")
+DECODED_TOKENS_CACHE_SIZE = 128
+# Cost factor of the new password hashes (each increment doubles the hashing time).
+BCRYPT_ROUNDS = config.get_int("BCRYPT_ROUNDS", 12)
+# user ID -> time of the last demotion or deletion of the user (see revoke_tokens).
+REVOCATION_FILE = config.get_str("REVOCATION_FILE", ".revoked")
+
+# token -> payload of the tokens already verified by this process
+_decoded_tokens = {}
 
 
-def hash_password(password):
+def hash_password(password, rounds: int = None):
     """
     Hash a plaintext password using bcrypt.
 
     Args:
         password (str): The plaintext password.
+        rounds (int): Cost factor, defaults to ``BCRYPT_ROUNDS``.
 
     Returns:
         str: The hashed password.
     """
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds or BCRYPT_ROUNDS)).decode()
+
+
+def password_rounds(hashed: str) -> int:
+    """
+    Return the cost factor of a bcrypt hash (``$2b$<cost>$...``), or None if it cannot be read.
+    """
+    try:
+        return int(hashed.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """
+    Return the number of CPU cores this process may run on.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def hash_passwords(passwords: List[str], workers: int = None) -> List[str]:
+    """
+    Hash many passwords in a pool of processes, one per available core by default.
+
+    bcrypt is CPU-bound: hashing thousands of passwords one after the other takes minutes.
+
+    Args:
+        passwords (List[str]): The plaintext passwords.
+        workers (int): Number of processes; with 1, the passwords are hashed in this process.
+
+    Returns:
+        List[str]: The hashed passwords, in the order of ``passwords``.
+    """
+    workers = min(workers or available_cpus(), len(passwords))
+    if workers <= 1:
+        return [hash_password(password) for password in passwords]
+    # The workers are spawned: forking a process running threads (e.g. the audit writer) is unsafe.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        hash_with_cost = functools.partial(hash_password, rounds=BCRYPT_ROUNDS)
+        return list(executor.map(hash_with_cost, passwords, chunksize=chunksize))
 
 
 def verify_password(password, hashed):
@@ -48,7 +104,7 @@ def verify_password(password, hashed):
 def require_master_password(function):
     """
     Decorator that prompts for the master password before allowing access
-    to a CLI command. Aborts if the password is incorrect.
+    to a CLI command. Aborts with exit code 1 if the password is incorrect.
 
     Args:
         function (Callable): The CLI command to wrap.
@@ -57,11 +113,12 @@ def require_master_password(function):
         Callable: The wrapped function.
     """
 
+    @functools.wraps(function)
     def wrapper(*args, **kwargs):
         pwd = click.prompt("Mot de passe administrateur", hide_input=True)
         if pwd != MASTER_PASSWORD:
             click.secho("Mot de passe incorrect. Accès refusé.", fg="red")
-            return
+            click.get_current_context().exit(1)
         return function(*args, **kwargs)
 
     return wrapper
@@ -79,32 +136,102 @@ def create_access_token(data: dict):
     """
     to_encode = data.copy()
     expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # The issue time tells whether the claims predate a revocation.
+    to_encode.update({"exp": expire, "iat": int(time.time())})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def read_revocations() -> dict:
+    """
+    Read the local revocation list.
+
+    Returns:
+        dict: ``{user ID (str): revocation time (epoch seconds)}``, empty if there is no list.
+    """
+    try:
+        with open(REVOCATION_FILE, "r") as f:
+            revocations = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return revocations if isinstance(revocations, dict) else {}
+
+
+def revoke_tokens(user_ids: Iterable[int]):
+    """
+    Stop trusting the claims of the tokens issued until now to some users (see
+    ``is_token_revoked``), e.g. before their role changes or they are deleted.
+
+    Entries older than the lifetime of a token are dropped: the tokens they revoke have
+    expired, so the list stays small.
+
+    Args:
+        user_ids (Iterable[int]): IDs of the users.
+    """
+    now = time.time()
+    oldest = now - ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    revocations = {user_id: revoked_at for user_id, revoked_at in read_revocations().items() if revoked_at > oldest}
+    revocations.update({str(user_id): now for user_id in user_ids})
+    temporary_file = f"{REVOCATION_FILE}.{os.getpid()}.tmp"
+    with open(temporary_file, "w") as f:
+        json.dump(revocations, f)
+    os.replace(temporary_file, REVOCATION_FILE)
+
+
+def is_token_revoked(payload: dict) -> bool:
+    """
+    Tell whether the claims of a token may be outdated: its user was revoked after
+    (or in the same second as) the token was issued.
+
+    Args:
+        payload (dict): Decoded payload of the token.
+
+    Returns:
+        bool: True if the claims must be checked against the database.
+    """
+    revoked_at = read_revocations().get(str(payload.get("user_id")))
+    if revoked_at is None:
+        return False
+    issued_at = payload.get("iat")
+    return not isinstance(issued_at, (int, float)) or issued_at <= revoked_at
+
+
 def decode_token(token: str):
     """
     Decode a JWT token and return its payload.
 
+    Valid payloads are kept in memory until they expire, so a long-lived process
+    (the daemon) does not verify the same token on every command.
+
     Args:
         token (str): The JWT token to decode.
 
     Returns:
         dict or None: The decoded payload, or None if invalid or expired.
     """
+    payload = _decoded_tokens.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return dict(payload)
+
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+    if len(_decoded_tokens) >= DECODED_TOKENS_CACHE_SIZE:
+        _decoded_tokens.clear()
+    _decoded_tokens[token] = payload
+    return dict(payload)
+
 
 def authenticate_user(email, password):
     """
     Authenticate a user by email and password.
 
+    When the stored hash was made with another cost than ``BCRYPT_ROUNDS``, the password
+    is hashed again with the configured cost.
+
     Args:
         email (str): The user's email.
         password (str): The user's plaintext password.
@@ -119,6 +246,13 @@ def authenticate_user(email, password):
         user = db.query(User).filter_by(email=email).first()
         if user and verify_password(password, user.hashed_password):
             token = create_access_token({"user_id": user.id, "role": user.role.name})
+            if password_rounds(user.hashed_password) != BCRYPT_ROUNDS:
+                # The plaintext password is only known here: upgrade the hash to the configured cost.
+                try:
+                    user.hashed_password = hash_password(password)
+                    db.commit()
+                except sqlalchemy.exc.SQLAlchemyError:
+                    db.rollback()
             return True, token
         else:
             return False, "Email ou mot de passe incorrect."
@@ -154,6 +288,20 @@ def get_current_user_token_payload():
         raise ValueError("Token non trouvé. Veuillez vous connecter.")
 
 
+def token_file_signature():
+    """
+    Return a cheap signature of the token file, which changes when a new token is saved.
+
+    Returns:
+        tuple or None: ``(inode, size, modification time)`` of ``.token``, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(".token")
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
 def retrieve_authenticated_user(session: Session) -> User:
     """
     Get the currently authenticated user from the database using the token payload.
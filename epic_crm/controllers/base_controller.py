@@ -1,13 +1,53 @@
+import itertools
 import sqlalchemy
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Iterable, List
 from abc import ABC, abstractmethod
 
-from controllers.authentication import retrieve_authenticated_user
+from controllers import audit, filters
+from controllers.cache import cached_get, get_record_cache
+from controllers.permissions import SECURITY_CONTEXT_KEY, get_security_context
 from controllers.cascade_controller import CascadeDetails, CascadeResolver
 from models.users import User
 
 
+DEFAULT_PAGE_SIZE = 50
+STREAM_BATCH_SIZE = 1000
+CREATE_CHUNK_SIZE = 1000
+
+
+class BulkCreateResult:
+    """
+    Outcome of a bulk creation: number of inserted rows and rows that could not be created.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty result.
+        """
+        self.created = 0
+        self.failures = []
+
+    def add_failure(self, index: int, error: Exception):
+        """
+        Record a row that could not be created.
+
+        Args:
+            index (int): Position of the row in the input (starting at 0).
+            error (Exception): Validation, permission or database error raised for the row.
+        """
+        self.failures.append((index, str(error)))
+
+    def __str__(self) -> str:
+        """
+        Return a summary of the creation, with one line per failed row.
+        """
+        lines = [f"{self.created} créé(s), {len(self.failures)} en échec."]
+        lines.extend(f"  ligne {index + 1} : {error}" for index, error in self.failures)
+        return "\n".join(lines)
+
+
 class BaseManager(ABC):
     """
     Abstract base class for all model managers.
@@ -28,25 +68,30 @@ class BaseManager(ABC):
         self._session = session
         self._model = model
         self.cascade_resolver = CascadeResolver(session)
+        # Records referenced by the chunk being built by ``create_many`` (see ``_reference``).
+        self._references = None
 
     def get_authenticated_user(self) -> User:
         """
         Retrieve the currently authenticated user from the database session.
 
+        The user is resolved once per session by the security context and shared with
+        the permission checks.
+
         Returns:
             User: Authenticated user instance.
 
         Raises:
             PermissionError: If no authenticated user is found.
         """
-        user = retrieve_authenticated_user(self._session)
+        user = get_security_context(self._session).get_user()
         if not user:
             raise PermissionError("Aucun utilisateur authentifié trouvé.")
         return user
 
     def create(self, obj):
         """
-        Persist a new object to the database.
+        Persist a new object to the database and audit its creation.
 
         Args:
             obj: Instance of the managed model.
@@ -57,8 +102,151 @@ class BaseManager(ABC):
         self._session.add(obj)
         self._session.commit()
 
+        # The identity survives the expiration of the commit: no refresh query.
+        identity = sqlalchemy.inspect(obj).identity
+        self._audit("create", ids=list(identity) if identity else None, count=1)
         return obj
 
+    def create_many(self, rows: Iterable[dict], chunk_size: int = CREATE_CHUNK_SIZE) -> BulkCreateResult:
+        """
+        Create many records with batched multi-row INSERT statements.
+
+        Rows are processed ``chunk_size`` at a time. The records referenced by the rows
+        of a chunk (see ``_referenced_ids``) are loaded first, with one query per model,
+        then each row is validated by ``_build`` (the rules of ``create``) and a row
+        failing validation is reported without stopping the batch. The valid rows of the
+        chunk are inserted and committed together; when a chunk is rejected by the
+        database (duplicate email, missing foreign key...), its rows are inserted one by
+        one to report the faulty ones and keep the others.
+
+        Args:
+            rows (Iterable[dict]): Arguments of ``create`` for each record.
+            chunk_size (int): Number of rows inserted and committed together.
+
+        Returns:
+            BulkCreateResult: Number of created records and failed rows.
+        """
+        result = BulkCreateResult()
+        indexed_rows = enumerate(rows)
+        while True:
+            batch = list(itertools.islice(indexed_rows, chunk_size))
+            if not batch:
+                break
+
+            chunk = []
+            self._references = self._fetch_references([row for _, row in batch])
+            try:
+                for index, row in batch:
+                    try:
+                        chunk.append((index, self._column_values(self._build(**row))))
+                    except (ValueError, TypeError, PermissionError) as e:
+                        result.add_failure(index, e)
+            finally:
+                self._references = None
+
+            if chunk:
+                self._insert_chunk(chunk, result)
+
+        result.failures.sort()
+        if result.created:
+            self._audit("create", count=result.created)
+        return result
+
+    def _referenced_ids(self, rows: List[dict]) -> dict:
+        """
+        List the IDs of the records referenced by rows passed to ``create_many``.
+        Subclasses whose ``_build`` looks records up override it.
+
+        Args:
+            rows (List[dict]): Rows of a chunk.
+
+        Returns:
+            dict: IDs to load, by model.
+        """
+        return {}
+
+    def _fetch_references(self, rows: List[dict]) -> dict:
+        """
+        Load the records referenced by a chunk of rows, with one ``IN`` query per model.
+
+        Args:
+            rows (List[dict]): Rows of a chunk.
+
+        Returns:
+            dict: Records by ID, by model.
+        """
+        references = {}
+        for model, ids in self._referenced_ids(rows).items():
+            ids = {id_ for id_ in ids if id_ is not None}
+            records = self._session.scalars(sqlalchemy.select(model).where(model.id.in_(ids))) if ids else []
+            references[model] = {record.id: record for record in records}
+        return references
+
+    def _reference(self, model: type, id_: int):
+        """
+        Look up a record referenced by a new one: in the records loaded for the current
+        ``create_many`` chunk, or else by primary key (see ``cached_get``).
+
+        Args:
+            model (type): Model of the referenced record.
+            id_ (int): Primary key of the referenced record.
+
+        Returns:
+            The record, or None if it does not exist.
+        """
+        if self._references is not None and model in self._references:
+            return self._references[model].get(id_)
+        return cached_get(self._session, model, id_)
+
+    def _build(self, **values):
+        """
+        Build a new, validated instance of the managed model. Subclasses override it
+        with the validation and permission rules of their ``create`` method.
+
+        Args:
+            **values: Fields of the new record.
+
+        Returns:
+            model: The unsaved instance.
+        """
+        return self._model(**values)
+
+    def _column_values(self, obj) -> dict:
+        """
+        Extract the column values set on an unsaved instance, leaving out the unset ones
+        so that the column defaults apply.
+        """
+        mapper = sqlalchemy.inspect(self._model)
+        return {
+            attribute.key: obj.__dict__[attribute.key]
+            for attribute in mapper.column_attrs
+            if obj.__dict__.get(attribute.key) is not None
+        }
+
+    def _insert_chunk(self, chunk: list, result: BulkCreateResult):
+        """
+        Insert a chunk of rows with one batched statement, falling back to row-by-row
+        inserts (one savepoint each) when the database rejects the chunk.
+
+        Args:
+            chunk (list): ``(index, column values)`` pairs.
+            result (BulkCreateResult): Result to update.
+        """
+        request = sqlalchemy.insert(self._model)
+        try:
+            with self._session.begin_nested():
+                self._session.execute(request, [values for _, values in chunk])
+            result.created += len(chunk)
+        except (IntegrityError, DataError):
+            for index, values in chunk:
+                try:
+                    with self._session.begin_nested():
+                        self._session.execute(request, [values])
+                    result.created += 1
+                except (IntegrityError, DataError) as e:
+                    result.add_failure(index, e.orig)
+        self._session.commit()
+
     def get_all(self):
         """
         Retrieve all records of the managed model.
@@ -69,39 +257,264 @@ class BaseManager(ABC):
         request = sqlalchemy.select(self._model)
         return self._session.scalars(request).all()
 
-    def get(self, where_clause):
+    def get(self, where_clause, order_by: list = None):
         """
         Retrieve records matching a given condition.
 
         Args:
             where_clause: SQLAlchemy-compatible filter condition.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses.
 
         Returns:
             List[model]: Matching records.
         """
         request = sqlalchemy.select(self._model).where(where_clause)
+        if order_by:
+            request = request.order_by(*order_by)
+        return self._session.scalars(request).all()
+
+    def _select_after(self, where_clause=None, after: int = None, columns: list = None, order_by: list = None):
+        """
+        Build a SELECT of the managed model (or of some of its columns) ordered by ID
+        (or by ``order_by``, then ID), optionally filtered and starting after a given ID (keyset).
+
+        Raises:
+            ValueError: If ``after`` is combined with another order than the ID.
+        """
+        if order_by and after is not None:
+            raise ValueError("--after ne peut être utilisé qu'avec le tri par ID.")
+        request = sqlalchemy.select(*(columns or [self._model])).order_by(*(order_by or []), self._model.id)
+        if where_clause is not None:
+            request = request.where(where_clause)
+        if after is not None:
+            request = request.where(self._model.id > after)
+        return request
+
+    def get_columns(self, fields: List[str] = None) -> list:
+        """
+        Map field names of the model's ``HEADERS`` to labeled SQL expressions.
+
+        Args:
+            fields (List[str]): Field names, defaults to all of ``HEADERS``.
+
+        Returns:
+            list: SQL expressions, labeled with the field names.
+
+        Raises:
+            ValueError: If a field is not in ``HEADERS``.
+        """
+        return [filters.field_expression(self._model, name).label(name) for name in fields or self._model.HEADERS]
+
+    def get_page(self, where_clause=None, limit: int = DEFAULT_PAGE_SIZE, after: int = None):
+        """
+        Retrieve one page of records, ordered by ID.
+
+        Pages are delimited by the last ID of the previous page (keyset pagination), so
+        fetching a page costs the same whatever its position, unlike an OFFSET.
+
+        Args:
+            where_clause: Optional SQLAlchemy-compatible filter condition.
+            limit (int): Maximum number of records in the page.
+            after (int): ID of the last record of the previous page (None for the first page).
+
+        Returns:
+            List[model]: At most ``limit`` records with an ID greater than ``after``.
+        """
+        request = self._select_after(where_clause, after).limit(limit)
         return self._session.scalars(request).all()
 
-    def update(self, where_clause, **values):
+    def iter_all(self, where_clause=None, after: int = None, batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Stream the records, ordered by ID, without loading the whole table in memory.
+
+        Rows are fetched ``batch_size`` at a time through a server-side cursor (``yield_per``),
+        so the first records are available right away and memory use stays constant.
+        The session must stay open while iterating.
+
+        Args:
+            where_clause: Optional SQLAlchemy-compatible filter condition.
+            after (int): Only stream records with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip.
+
+        Returns:
+            Iterable[model]: The matching records.
+        """
+        request = self._select_after(where_clause, after).execution_options(yield_per=batch_size)
+        return self._session.scalars(request)
+
+    def get_rows(
+        self,
+        where_clause=None,
+        fields: List[str] = None,
+        limit: int = None,
+        after: int = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        order_by: list = None,
+    ) -> Iterable[sqlalchemy.Row]:
+        """
+        Read-only query returning lightweight rows with only the requested columns, ordered by ID.
+
+        No ORM instance is built (no identity map, no relationship), which makes large
+        listings much cheaper than ``get_all``. Each row is a named tuple whose fields are
+        ``fields`` (``HEADERS`` by default, in which case it matches ``to_list()``).
+
+        Args:
+            where_clause: Optional SQLAlchemy-compatible filter condition.
+            fields (List[str]): Field names taken from ``HEADERS``.
+            limit (int): Maximum number of rows (one keyset page), None to stream every row.
+            after (int): Only return rows with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip when streaming.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses, applied before the ID.
+
+        Returns:
+            Iterable[Row]: The rows; streamed through a server-side cursor when ``limit`` is None.
+        """
+        request = self._select_after(where_clause, after, columns=self.get_columns(fields), order_by=order_by)
+        if limit is not None:
+            return self._session.execute(request.limit(limit)).all()
+        return self._session.execute(request.execution_options(yield_per=batch_size))
+
+    def update(self, where_clause, **values) -> int:
         """
         Update records matching a condition with new values.
 
         Args:
             where_clause: SQLAlchemy-compatible filter condition.
             **values: Fields and their new values.
+
+        Returns:
+            int: Number of updated records.
         """
-        self._session.execute(sqlalchemy.update(self._model).where(where_clause).values(**values))
-        self._session.commit()
+        return self.scoped_update(where_clause, None, **values)
 
-    def delete(self, where_clause):
+    def delete(self, where_clause) -> int:
         """
         Delete records that match a given condition.
 
         Args:
             where_clause: SQLAlchemy-compatible filter condition.
+
+        Returns:
+            int: Number of deleted records.
+        """
+        return self.scoped_delete(where_clause, None)
+
+    def scoped_update(self, where_clause, scope, **values) -> int:
         """
-        self._session.execute(sqlalchemy.delete(self._model).where(where_clause))
+        Update the records matching a condition, restricted to an ownership scope, and
+        invalidate their cached copies (see ``RecordCache``).
+
+        Args:
+            where_clause: SQLAlchemy-compatible filter condition.
+            scope: SQLAlchemy condition selecting the records the user may modify (None for all).
+            **values: Fields and their new values.
+
+        Returns:
+            int: Number of updated records.
+
+        Raises:
+            PermissionError: If some targeted IDs do not exist or are outside the scope.
+        """
+        count = self._execute_in_scope(sqlalchemy.update(self._model).values(**values), where_clause, scope)
+        get_record_cache().invalidate(self._model, audit.ids_from_clause(self._model, where_clause))
+        self._audit("update", where_clause, count, fields=sorted(values))
+        return count
+
+    def scoped_delete(self, where_clause, scope) -> int:
+        """
+        Delete the records matching a condition, restricted to an ownership scope, and
+        empty the record cache.
+
+        Args:
+            where_clause: SQLAlchemy-compatible filter condition.
+            scope: SQLAlchemy condition selecting the records the user may delete (None for all).
+
+        Returns:
+            int: Number of deleted records.
+
+        Raises:
+            PermissionError: If some targeted IDs do not exist or are outside the scope.
+        """
+        count = self._execute_in_scope(sqlalchemy.delete(self._model), where_clause, scope)
+        # The deletion cascades to the records referencing these ones: every entry is dropped.
+        get_record_cache().clear()
+        self._audit("delete", where_clause, count)
+        return count
+
+    def _audit(self, action: str, where_clause=None, count: int = None, ids: List[int] = None, **details):
+        """
+        Record a write in the audit log, without waiting for it to be written.
+
+        The author is the principal already resolved by the permission checks of the
+        session, and the IDs come from the object or the ``Model.id`` condition in hand:
+        the audit never queries the database.
+
+        Args:
+            action (str): ``create``, ``update`` or ``delete``.
+            where_clause: Condition of an update or a deletion.
+            count (int): Number of modified records.
+            ids (List[int]): IDs of the modified records, when known.
+            **details: Other fields of the entry.
+        """
+        if ids is None and where_clause is not None:
+            ids = audit.ids_from_clause(self._model, where_clause)
+            if ids is None:
+                details["where"] = audit.describe_clause(where_clause)
+        context = self._session.info.get(SECURITY_CONTEXT_KEY)
+        user_id = context.user_id if context is not None else None
+        audit.record(action, self._model.__tablename__, user_id=user_id, ids=ids, count=count, **details)
+
+    def ownership_scope(self, user: User):
+        """
+        Build the SQL condition selecting the records a user is allowed to modify.
+
+        Subclasses override it to express their row-level permissions.
+
+        Args:
+            user (User): The authenticated user.
+
+        Returns:
+            SQLAlchemy condition, or None when the user may modify every record.
+        """
+        return None
+
+    def _execute_in_scope(self, request, where_clause, scope) -> int:
+        """
+        Execute an UPDATE or DELETE statement with the ownership scope added to its WHERE clause.
+
+        The permission check is done by the database, in the statement itself: records
+        outside the scope are left unchanged. When the condition targets IDs
+        (``Model.id == value`` or ``Model.id.in_(values)``), a statement affecting fewer
+        records than targeted IDs is rolled back and refused.
+
+        Args:
+            request: ``sqlalchemy.update`` or ``sqlalchemy.delete`` statement on the model.
+            where_clause: SQLAlchemy-compatible filter condition.
+            scope: SQLAlchemy ownership condition, or None.
+
+        Returns:
+            int: Number of affected records.
+
+        Raises:
+            PermissionError: If some targeted IDs do not exist or are outside the scope.
+        """
+        if scope is None:
+            result = self._session.execute(request.where(where_clause))
+            self._session.commit()
+            return result.rowcount
+
+        result = self._session.execute(request.where(where_clause, scope))
+        ids = audit.ids_from_clause(self._model, where_clause)
+        targeted = len(set(ids)) if ids is not None else result.rowcount
+        if result.rowcount < targeted:
+            self._session.rollback()
+            raise PermissionError(
+                f"Permission denied: {targeted - result.rowcount} of the {targeted} targeted record(s)"
+                " do not exist or are not assigned to you."
+            )
+
         self._session.commit()
+        return result.rowcount
 
     @abstractmethod
     def resolve_cascade(self, objects: List[object]) -> List[CascadeDetails]:
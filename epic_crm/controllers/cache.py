@@ -0,0 +1,264 @@
+import enum
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List
+
+import sqlalchemy
+from sqlalchemy.orm import Session, attributes, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from controllers import config
+from models.types import Money
+
+
+CACHE_SIZE = 1024
+CACHE_TTL = 60.0
+
+# Never copied to the cache (and to its file): loaded from the database when read.
+EXCLUDED_COLUMNS = ("hashed_password",)
+
+
+class RecordCache:
+    """
+    Read-through cache of the records looked up by primary key (``session.get``).
+
+    Records are kept in an in-process LRU and, optionally, in a SQLite file shared by
+    the CLI invocations of the machine. Entries expire after ``ttl`` seconds and are
+    invalidated by the writes of the managers (see ``BaseManager.scoped_update``);
+    writes made by other processes are only seen once the entries of this process expire.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE, ttl: float = CACHE_TTL, path: str = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            size (int): Maximum number of records kept in memory.
+            ttl (float): Lifetime of an entry in seconds; 0 disables the cache.
+            path (str): SQLite file of the shared tier, None to keep the records in memory only.
+        """
+        self.size = size
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+
+    @property
+    def enabled(self) -> bool:
+        """
+        bool: Whether the lookups are cached.
+        """
+        return self.ttl > 0 and self.size > 0
+
+    def get(self, session: Session, model: type, id_: int):
+        """
+        Return a record by primary key, from the session, the cache or the database.
+
+        A cached record is attached to the session without a query; its relationships and
+        excluded columns are loaded from the database when they are accessed.
+
+        Args:
+            session (Session): Session the record is attached to.
+            model (type): SQLAlchemy model.
+            id_ (int): Primary key of the record.
+
+        Returns:
+            The record, or None if it does not exist.
+        """
+        if not self.enabled or id_ is None or identity_key(model, id_) in session.identity_map:
+            return session.get(model, id_)
+
+        key = self._key(model, id_)
+        values = self._memory_get(key)
+        if values is not None:
+            self.hits += 1
+            return self._attach(session, model, values)
+        values = self._disk_get(model, key)
+        if values is not None:
+            self.disk_hits += 1
+            self._memory_set(key, values)
+            return self._attach(session, model, values)
+
+        self.misses += 1
+        obj = session.get(model, id_)
+        if obj is not None:
+            values = {
+                column.key: getattr(obj, column.key)
+                for column in sqlalchemy.inspect(model).column_attrs
+                if column.key not in EXCLUDED_COLUMNS
+            }
+            self._memory_set(key, values)
+            self._disk_set(model, key, values)
+        return obj
+
+    def invalidate(self, model: type, ids: List[int] = None):
+        """
+        Forget the cached records of a model.
+
+        Args:
+            model (type): SQLAlchemy model.
+            ids (List[int]): Primary keys of the records, None for every record of the model.
+        """
+        if ids is None:
+            prefix = f"{model.__tablename__}:"
+            with self._lock:
+                for key in [key for key in self._entries if key.startswith(prefix)]:
+                    del self._entries[key]
+            self._disk_execute("DELETE FROM records WHERE key LIKE ?", (prefix + "%",))
+            return
+        keys = [self._key(model, id_) for id_ in ids]
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        self._disk_execute("DELETE FROM records WHERE key = ?", [(key,) for key in keys], many=True)
+
+    def clear(self):
+        """
+        Forget every cached record, e.g. after a deletion which cascades to other tables.
+        """
+        with self._lock:
+            self._entries.clear()
+        self._disk_execute("DELETE FROM records")
+
+    def stats(self) -> dict:
+        """
+        Return the hit and miss counters of the process.
+
+        Returns:
+            dict: ``hits`` (memory), ``disk_hits``, ``misses`` and the number of records in memory.
+        """
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _key(self, model: type, id_: int) -> str:
+        return f"{model.__tablename__}:{id_}"
+
+    def _attach(self, session: Session, model: type, values: dict):
+        obj = sqlalchemy.inspect(model).class_manager.new_instance()
+        for key, value in values.items():
+            # Committed values: the record is clean, merging it does not mark it modified.
+            attributes.set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return session.merge(obj, load=False)
+
+    def _memory_get(self, key: str) -> dict:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, values = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return values
+
+    def _memory_set(self, key: str, values: dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def _connection(self):
+        if self._disk is None:
+            self._disk = sqlite3.connect(self.path, timeout=1, check_same_thread=False, isolation_level=None)
+            self._disk.execute("CREATE TABLE IF NOT EXISTS records (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+        return self._disk
+
+    def _disk_execute(self, statement: str, parameters=(), many: bool = False):
+        if self.path is None:
+            return None
+        # The shared tier is best effort: a locked or unreadable file is a cache miss.
+        try:
+            with self._lock:
+                connection = self._connection()
+                if many:
+                    connection.executemany(statement, parameters)
+                    return None
+                return connection.execute(statement, parameters).fetchone()
+        except sqlite3.Error:
+            return None
+
+    def _disk_get(self, model: type, key: str) -> dict:
+        row = self._disk_execute("SELECT value FROM records WHERE key = ? AND expires > ?", (key, time.time()))
+        return _decode(model, json.loads(row[0])) if row is not None else None
+
+    def _disk_set(self, model: type, key: str, values: dict):
+        self._disk_execute(
+            "INSERT OR REPLACE INTO records (key, value, expires) VALUES (?, ?, ?)",
+            (key, json.dumps(_encode(values)), time.time() + self.ttl),
+        )
+
+
+def _encode(values: dict) -> dict:
+    """
+    Convert the values of a record to JSON (enums by name, dates in ISO format, decimals as strings).
+    """
+    return {key: _encode_value(value) for key, value in values.items()}
+
+
+def _encode_value(value):
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _decode(model: type, values: dict) -> dict:
+    """
+    Convert the JSON values of a record back to the Python types of its columns.
+    """
+    decoded = dict(values)
+    for column in sqlalchemy.inspect(model).columns:
+        value = decoded.get(column.key)
+        if value is None:
+            continue
+        if isinstance(column.type, sqlalchemy.Enum) and column.type.enum_class is not None:
+            decoded[column.key] = column.type.enum_class[value]
+        elif isinstance(column.type, sqlalchemy.DateTime):
+            decoded[column.key] = datetime.fromisoformat(value)
+        elif isinstance(value, str) and isinstance(column.type, Money):
+            decoded[column.key] = Decimal(value)
+    return decoded
+
+
+_record_cache = None
+_record_cache_lock = threading.Lock()
+
+
+def get_record_cache() -> RecordCache:
+    """
+    Return the record cache of the process, created on first use from the settings
+    (``CACHE_SIZE``, ``CACHE_TTL``, ``CACHE_FILE``).
+
+    Returns:
+        RecordCache: The cache.
+    """
+    global _record_cache
+    with _record_cache_lock:
+        if _record_cache is None:
+            _record_cache = RecordCache(
+                size=config.get_int("CACHE_SIZE", CACHE_SIZE),
+                ttl=config.get_float("CACHE_TTL", CACHE_TTL),
+                path=config.get_str("CACHE_FILE"),
+            )
+    return _record_cache
+
+
+def cached_get(session: Session, model: type, id_: int):
+    """
+    Look a record up by primary key through the record cache of the process (see ``RecordCache.get``).
+    """
+    return get_record_cache().get(session, model, id_)
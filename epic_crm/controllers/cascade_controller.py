@@ -9,6 +9,27 @@ from models.events import Event
 from tabulate import tabulate
 
 
+# Maximum number of IDs in a single ``IN (...)`` clause.
+IN_CLAUSE_CHUNK_SIZE = 1000
+
+
+def object_ids(objects: List[Any]) -> List[int]:
+    """
+    Return the sorted, distinct IDs of a list of ORM objects, ignoring None values.
+    """
+    return sorted({obj.id for obj in objects if obj is not None})
+
+
+def unique_records(records: List[Any]) -> List[Any]:
+    """
+    Remove the records listed more than once (same ID), keeping the first occurrence.
+    """
+    unique = {}
+    for record in records:
+        unique.setdefault(record.id, record)
+    return list(unique.values())
+
+
 class CascadeDetails:
     """
     Data object storing details about entities affected by a deletion cascade.
@@ -53,6 +74,42 @@ class CascadeDetails:
         return self.__str__()
 
 
+class CascadeCount:
+    """
+    Number of records of one table affected by a deletion cascade.
+
+    Only the count is computed; the records themselves are loaded on demand, one page
+    at a time, with ``CascadeResolver.get_cascade_page``.
+    """
+
+    def __init__(self, title: str, model: type, where_clause, count: int) -> None:
+        """
+        Initialize a CascadeCount object.
+
+        Args:
+            title (str): The title describing the category of objects (e.g. 'CLIENTS').
+            model (type): SQLAlchemy model of the affected records.
+            where_clause: SQLAlchemy condition selecting the affected records.
+            count (int): Number of affected records.
+        """
+        self.title = title
+        self.model = model
+        self.where_clause = where_clause
+        self.count = count
+
+    def __str__(self):
+        """
+        Return the title and the count, e.g. ``CONTRACTS : 2,340``.
+        """
+        return f"{self.title} : {self.count:,}"
+
+    def __repr__(self) -> str:
+        """
+        Return the string representation of the object for debugging.
+        """
+        return self.__str__()
+
+
 class CascadeResolver:
     """
     Handles the logic for retrieving related objects affected by deletions (cascade dependencies),
@@ -68,6 +125,27 @@ class CascadeResolver:
         """
         self.session = session
 
+    def _select_in(self, model: type, column, ids: List[int]) -> List[Any]:
+        """
+        Retrieve the records of a model whose column value is in a list of IDs.
+
+        One ``IN`` query is issued per chunk of ``IN_CLAUSE_CHUNK_SIZE`` IDs, whatever the
+        number of parent objects.
+
+        Args:
+            model (type): SQLAlchemy model to query.
+            column: Column of the model compared to the IDs.
+            ids (List[int]): IDs of the parent objects.
+
+        Returns:
+            List[Any]: Matching records, without duplicates.
+        """
+        records = []
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            records.extend(self.session.scalars(sqlalchemy.select(model).where(column.in_(chunk))).all())
+        return unique_records(records)
+
     def _retreive_clients_from_users(self, users: List[User]) -> List[Client]:
         """
         Retrieve all clients associated with the given users.
@@ -78,15 +156,7 @@ class CascadeResolver:
         Returns:
             List[Client]: List of clients linked to those users.
         """
-
-        clients = []
-        for user in users:
-            if user is None:
-                continue
-            clients.extend(
-                self.session.scalars(sqlalchemy.select(Client).where(Client.sales_contact_id == user.id)).all()
-            )
-        return clients
+        return self._select_in(Client, Client.sales_contact_id, object_ids(users))
 
     def _retreive_contracts_from_users(self, users: List[User]) -> List[Contract]:
         """
@@ -98,14 +168,7 @@ class CascadeResolver:
         Returns:
             List[Contract]: List of associated contracts.
         """
-        contracts = []
-        for user in users:
-            if user is None:
-                continue
-            contracts.extend(
-                self.session.scalars(sqlalchemy.select(Contract).where(Contract.sales_contact_id == user.id)).all()
-            )
-        return contracts
+        return self._select_in(Contract, Contract.sales_contact_id, object_ids(users))
 
     def _retreive_events_from_user(self, users: List[User]) -> List[Event]:
         """
@@ -117,14 +180,7 @@ class CascadeResolver:
         Returns:
             List[Event]: List of associated events.
         """
-        events = []
-        for user in users:
-            if user is None:
-                continue
-            events.extend(
-                self.session.scalars(sqlalchemy.select(Event).where(Event.support_contact_id == user.id)).all()
-            )
-        return events
+        return self._select_in(Event, Event.support_contact_id, object_ids(users))
 
     def _retreive_contracts_from_clients(self, clients: List[Client]) -> List[Contract]:
         """
@@ -136,14 +192,7 @@ class CascadeResolver:
         Returns:
             List[Contract]: List of associated contracts.
         """
-        contracts = []
-        for client in clients:
-            if client is None:
-                continue
-            contracts.extend(
-                self.session.scalars(sqlalchemy.select(Contract).where(Contract.client_id == client.id)).all()
-            )
-        return contracts
+        return self._select_in(Contract, Contract.client_id, object_ids(clients))
 
     def _retreive_events_from_contracts(self, contracts: List[Contract]) -> List[Event]:
         """
@@ -155,12 +204,7 @@ class CascadeResolver:
         Returns:
             List[Event]: List of associated events.
         """
-        events = []
-        for contract in contracts:
-            if contract is None:
-                continue
-            events.extend(self.session.scalars(sqlalchemy.select(Event).where(Event.contract_id == contract.id)).all())
-        return events
+        return self._select_in(Event, Event.contract_id, object_ids(contracts))
 
     def resolve_user_cascade(self, users: List[User]) -> List[CascadeDetails]:
         """
@@ -170,8 +214,14 @@ class CascadeResolver:
             List[CascadeDetails]: Cascade details including clients, contracts, and events.
         """
         clients = self._retreive_clients_from_users(users)
-        contracts = self._retreive_contracts_from_users(users) + self._retreive_contracts_from_clients(clients)
-        events = self._retreive_events_from_user(users) + self._retreive_events_from_contracts(contracts)
+        # A contract can be reached through its sales contact and its client, an event
+        # through its support contact and its contract: each one is listed once.
+        contracts = unique_records(
+            self._retreive_contracts_from_users(users) + self._retreive_contracts_from_clients(clients)
+        )
+        events = unique_records(
+            self._retreive_events_from_user(users) + self._retreive_events_from_contracts(contracts)
+        )
         return [
             CascadeDetails(
                 title="userS",
@@ -230,3 +280,123 @@ class CascadeResolver:
                 objects=events,
             ),
         ]
+
+    def _count_cascade(self, entries: List[tuple]) -> List[CascadeCount]:
+        """
+        Count the records affected by a cascade with ``COUNT(*)`` aggregates, in a single query.
+
+        Args:
+            entries (List[tuple]): ``(title, model, where_clause)`` of each affected table.
+
+        Returns:
+            List[CascadeCount]: One count per table, in the order of ``entries``.
+        """
+        counts = [
+            sqlalchemy.select(sqlalchemy.func.count()).select_from(model).where(where_clause).scalar_subquery()
+            for _, model, where_clause in entries
+        ]
+        row = self.session.execute(sqlalchemy.select(*counts)).one()
+        return [
+            CascadeCount(title=title, model=model, where_clause=where_clause, count=count)
+            for (title, model, where_clause), count in zip(entries, row)
+        ]
+
+    def summarize_user_cascade(self, where_clause) -> List[CascadeCount]:
+        """
+        Count the entities that would be affected by the deletion of the users matching a condition,
+        without loading any of them.
+
+        Args:
+            where_clause: SQLAlchemy condition selecting the users.
+
+        Returns:
+            List[CascadeCount]: Counts of users, clients, contracts and events.
+        """
+        user_ids = sqlalchemy.select(User.id).where(where_clause)
+        client_ids = sqlalchemy.select(Client.id).where(Client.sales_contact_id.in_(user_ids))
+        contracts_clause = sqlalchemy.or_(Contract.sales_contact_id.in_(user_ids), Contract.client_id.in_(client_ids))
+        contract_ids = sqlalchemy.select(Contract.id).where(contracts_clause)
+        return self._count_cascade(
+            [
+                ("USERS", User, where_clause),
+                ("CLIENTS", Client, Client.sales_contact_id.in_(user_ids)),
+                ("CONTRACTS", Contract, contracts_clause),
+                (
+                    "EVENTS",
+                    Event,
+                    sqlalchemy.or_(Event.support_contact_id.in_(user_ids), Event.contract_id.in_(contract_ids)),
+                ),
+            ]
+        )
+
+    def summarize_clients_cascade(self, where_clause) -> List[CascadeCount]:
+        """
+        Count the entities that would be affected by the deletion of the clients matching a condition,
+        without loading any of them.
+
+        Args:
+            where_clause: SQLAlchemy condition selecting the clients.
+
+        Returns:
+            List[CascadeCount]: Counts of clients, contracts and events.
+        """
+        client_ids = sqlalchemy.select(Client.id).where(where_clause)
+        contract_ids = sqlalchemy.select(Contract.id).where(Contract.client_id.in_(client_ids))
+        return self._count_cascade(
+            [
+                ("CLIENTS", Client, where_clause),
+                ("CONTRACTS", Contract, Contract.client_id.in_(client_ids)),
+                ("EVENTS", Event, Event.contract_id.in_(contract_ids)),
+            ]
+        )
+
+    def summarize_contracts_cascade(self, where_clause) -> List[CascadeCount]:
+        """
+        Count the entities that would be affected by the deletion of the contracts matching a condition,
+        without loading any of them.
+
+        Args:
+            where_clause: SQLAlchemy condition selecting the contracts.
+
+        Returns:
+            List[CascadeCount]: Counts of contracts and events.
+        """
+        contract_ids = sqlalchemy.select(Contract.id).where(where_clause)
+        return self._count_cascade(
+            [
+                ("CONTRACTS", Contract, where_clause),
+                ("EVENTS", Event, Event.contract_id.in_(contract_ids)),
+            ]
+        )
+
+    def summarize_events_cascade(self, where_clause) -> List[CascadeCount]:
+        """
+        Count the events matching a condition, without loading them.
+
+        Args:
+            where_clause: SQLAlchemy condition selecting the events.
+
+        Returns:
+            List[CascadeCount]: Count of events.
+        """
+        return self._count_cascade([("EVENTS", Event, where_clause)])
+
+    def get_cascade_page(self, cascade_count: CascadeCount, limit: int = 50, after: int = None) -> CascadeDetails:
+        """
+        Load one page of the records counted by a cascade summary, ordered by ID.
+
+        Args:
+            cascade_count (CascadeCount): Entry of a cascade summary.
+            limit (int): Maximum number of records in the page.
+            after (int): ID of the last record of the previous page (None for the first page).
+
+        Returns:
+            CascadeDetails: The records of the page, ready to be displayed.
+        """
+        model = cascade_count.model
+        request = sqlalchemy.select(model).where(cascade_count.where_clause).order_by(model.id).limit(limit)
+        if after is not None:
+            request = request.where(model.id > after)
+        return CascadeDetails(
+            title=cascade_count.title, headers=model.HEADERS, objects=self.session.scalars(request).all()
+        )
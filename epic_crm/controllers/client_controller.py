@@ -1,10 +1,16 @@
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-from typing import List
-from controllers.authentication import get_current_user_token_payload
+from typing import Iterable, List
 from controllers.permissions import permission_required
-from controllers.base_controller import BaseManager
-from controllers.cascade_controller import CascadeDetails
-from models.users import Department
+from controllers.base_controller import (
+    BaseManager,
+    BulkCreateResult,
+    CREATE_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    STREAM_BATCH_SIZE,
+)
+from controllers.cascade_controller import CascadeCount, CascadeDetails
+from models.users import Department, User
 from models.clients import Client
 
 
@@ -40,30 +46,49 @@ class ClientsManager(BaseManager):
         Returns:
             Client: The newly created client instance.
         """
-        client = Client(
+        return super().create(self._build(email=email, full_name=full_name, phone=phone, enterprise=enterprise))
+
+    @permission_required(roles=[Department.SALES])
+    def create_many(self, rows: Iterable[dict], chunk_size: int = CREATE_CHUNK_SIZE) -> BulkCreateResult:
+        """
+        Create many clients associated with the currently authenticated sales user.
+
+        Args:
+            rows (Iterable[dict]): ``email``, ``full_name``, ``phone`` and ``enterprise`` of each client.
+            chunk_size (int): Number of clients inserted and committed together.
+
+        Returns:
+            BulkCreateResult: Number of created clients and failed rows.
+        """
+        return super().create_many(rows, chunk_size=chunk_size)
+
+    def _build(self, email: str, full_name: str, phone: str, enterprise: str) -> Client:
+        """
+        Build a new client assigned to the currently authenticated sales user.
+        """
+        return Client(
             full_name=full_name,
             email=email,
             phone=phone,
             enterprise=enterprise,
-            sales_contact_id=get_current_user_token_payload()["user_id"],
+            sales_contact_id=self.get_authenticated_user().id,
         )
 
-        return super().create(client)
-
-    @permission_required(roles=Department)
-    def get(self, where_clause) -> List[Client]:
+    @permission_required(roles=Department, read_only=True)
+    def get(self, where_clause, order_by: list = None) -> List[Client]:
         """
         Retrieve all clients matching the provided condition.
 
         Args:
             where_clause: SQLAlchemy condition used to filter clients.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses.
 
         Returns:
             List[Client]: List of matching client records.
         """
-        return super().get(where_clause)
+        return super().get(where_clause, order_by=order_by)
 
-    @permission_required(roles=Department)
+    @permission_required(roles=Department, read_only=True)
     def get_all(self) -> List[Client]:
         """
         Retrieve all client records.
@@ -73,7 +98,65 @@ class ClientsManager(BaseManager):
         """
         return super().get_all()
 
-    @permission_required([Department.SALES])
+    @permission_required(roles=Department, read_only=True)
+    def get_page(self, where_clause=None, limit: int = DEFAULT_PAGE_SIZE, after: int = None) -> List[Client]:
+        """
+        Retrieve one page of clients, ordered by ID.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter clients.
+            limit (int): Maximum number of clients in the page.
+            after (int): ID of the last client of the previous page.
+
+        Returns:
+            List[Client]: The clients of the page.
+        """
+        return super().get_page(where_clause, limit=limit, after=after)
+
+    @permission_required(roles=Department, read_only=True)
+    def iter_all(self, where_clause=None, after: int = None, batch_size: int = STREAM_BATCH_SIZE) -> Iterable[Client]:
+        """
+        Stream clients ordered by ID, in constant memory.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter clients.
+            after (int): Only stream clients with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip.
+
+        Returns:
+            Iterable[Client]: The matching clients.
+        """
+        return super().iter_all(where_clause, after=after, batch_size=batch_size)
+
+    @permission_required(roles=Department, read_only=True)
+    def get_rows(
+        self,
+        where_clause=None,
+        fields: List[str] = None,
+        limit: int = None,
+        after: int = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        order_by: list = None,
+    ) -> Iterable[Row]:
+        """
+        Read-only listing of clients returning lightweight rows with only the requested fields.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter clients.
+            fields (List[str]): Field names taken from ``Client.HEADERS`` (all by default).
+            limit (int): Maximum number of rows, None to stream every row.
+            after (int): Only return clients with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip when streaming.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses, applied before the ID.
+
+        Returns:
+            Iterable[Row]: The rows, ordered by ID.
+        """
+        return super().get_rows(
+            where_clause, fields=fields, limit=limit, after=after, batch_size=batch_size, order_by=order_by
+        )
+
+    @permission_required([Department.SALES], read_only=True)
     def get_my_clients(self) -> List[Client]:
         """
         Retrieve all clients assigned to the currently authenticated sales user.
@@ -84,6 +167,21 @@ class ClientsManager(BaseManager):
         user = self.get_authenticated_user()
         return self.get(Client.sales_contact_id == user.id)
 
+    @permission_required([Department.SALES], read_only=True)
+    def get_my_client_rows(self, fields: List[str] = None) -> Iterable[Row]:
+        """
+        Stream the clients assigned to the currently authenticated sales user as lightweight
+        rows (see ``get_rows``).
+
+        Args:
+            fields (List[str]): Field names taken from ``Client.HEADERS`` (all by default).
+
+        Returns:
+            Iterable[Row]: The rows, ordered by ID.
+        """
+        user = self.get_authenticated_user()
+        return self.get_rows(Client.sales_contact_id == user.id, fields=fields)
+
     @permission_required(roles=[Department.SALES])
     def update(self, where_clause, **values):
         """
@@ -100,16 +198,7 @@ class ClientsManager(BaseManager):
         Raises:
             PermissionError: If the user attempts to update a client not assigned to them.
         """
-
-        user = self.get_authenticated_user()
-
-        if user.role == Department.SALES:
-            clients = self.get(where_clause)
-            for client in clients:
-                if client.sales_contact_id != user.id:
-                    raise PermissionError("Permission denied: not your client.")
-
-        return super().update(where_clause, **values)
+        return self.scoped_update(where_clause, self.ownership_scope(self.get_authenticated_user()), **values)
 
     @permission_required(roles=[Department.SALES])
     def delete(self, where_clause):
@@ -124,6 +213,20 @@ class ClientsManager(BaseManager):
         """
         return super().delete(where_clause)
 
+    def ownership_scope(self, user: User):
+        """
+        Build the SQL condition selecting the clients a user is allowed to modify.
+
+        Args:
+            user (User): The authenticated user.
+
+        Returns:
+            SQLAlchemy condition restricting sales users to their own clients, None for other roles.
+        """
+        if user.role == Department.SALES:
+            return Client.sales_contact_id == user.id
+        return None
+
     def filter_by_name(self, name_contains: str):
         """
         Retrieve clients whose full name contains the given string.
@@ -136,6 +239,20 @@ class ClientsManager(BaseManager):
         """
         return self.get(Client.full_name.contains(name_contains))
 
+    def filter_rows_by_name(self, name_contains: str, fields: List[str] = None) -> Iterable[Row]:
+        """
+        Stream the clients whose full name contains the given string as lightweight rows
+        (see ``get_rows``).
+
+        Args:
+            name_contains (str): Substring to match within client names.
+            fields (List[str]): Field names taken from ``Client.HEADERS`` (all by default).
+
+        Returns:
+            Iterable[Row]: The rows, ordered by ID.
+        """
+        return self.get_rows(Client.full_name.contains(name_contains), fields=fields)
+
     def resolve_cascade(self, clients: List[Client]) -> List[CascadeDetails]:
         """
         Retrieve cascading dependencies related to the provided clients, such as linked contracts or events.
@@ -147,3 +264,16 @@ class ClientsManager(BaseManager):
             List[CascadeDetails]: Details about the related records for cascade handling.
         """
         return self.cascade_resolver.resolve_clients_cascade(clients=clients)
+
+    @permission_required(roles=Department, read_only=True)
+    def count_cascade(self, where_clause) -> List[CascadeCount]:
+        """
+        Count the records that deleting the clients matching a condition would remove, without loading them.
+
+        Args:
+            where_clause: SQLAlchemy condition selecting the clients.
+
+        Returns:
+            List[CascadeCount]: Number of affected records per table.
+        """
+        return self.cascade_resolver.summarize_clients_cascade(where_clause)
@@ -0,0 +1,90 @@
+import os
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def get_str(name: str, default: str = None) -> str:
+    """
+    Read a string setting from the environment (``.env`` included).
+
+    Args:
+        name (str): Name of the environment variable.
+        default (str): Value returned when the variable is not set or empty.
+
+    Returns:
+        str: The configured value, or ``default``.
+    """
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value
+
+
+def get_int(name: str, default: int = None) -> int:
+    """
+    Read an integer setting from the environment.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (int): Value returned when the variable is not set.
+
+    Returns:
+        int: The configured value, or ``default``.
+
+    Raises:
+        ValueError: If the variable is set but is not a valid integer.
+    """
+    value = get_str(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Configuration invalide : {name} doit être un entier (reçu '{value}').")
+
+
+def get_float(name: str, default: float = None) -> float:
+    """
+    Read a float setting from the environment.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (float): Value returned when the variable is not set.
+
+    Returns:
+        float: The configured value, or ``default``.
+
+    Raises:
+        ValueError: If the variable is set but is not a valid number.
+    """
+    value = get_str(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Configuration invalide : {name} doit être un nombre (reçu '{value}').")
+
+
+def get_bool(name: str, default: bool = False) -> bool:
+    """
+    Read a boolean setting from the environment.
+
+    ``1``, ``true``, ``yes`` and ``on`` (case-insensitive) are considered true,
+    any other value is considered false.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (bool): Value returned when the variable is not set.
+
+    Returns:
+        bool: The configured value, or ``default``.
+    """
+    value = get_str(name)
+    if value is None:
+        return default
+    return value.strip().lower() in TRUE_VALUES
@@ -1,11 +1,70 @@
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from sqlalchemy import Row, and_, bindparam, case, func, or_, select, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Iterable, List
+from controllers.cache import get_record_cache
 from controllers.permissions import permission_required
-from controllers.base_controller import BaseManager
-from controllers.cascade_controller import CascadeDetails
-from models.users import Department
+from controllers.base_controller import (
+    BaseManager,
+    BulkCreateResult,
+    CREATE_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    STREAM_BATCH_SIZE,
+)
+from controllers.cascade_controller import CascadeCount, CascadeDetails
+from models.users import Department, User
 from models.clients import Client
 from models.contracts import Contract
+from models.types import CENT
+
+
+PAYMENT_CHUNK_SIZE = 1000
+
+# Fields the contract totals can be grouped by.
+TOTALS_GROUP_FIELDS = ("client_id", "sales_contact_id", "is_signed")
+
+# Ageing buckets of the receivables: (field, age of the contracts in days, first and last included).
+# The last bucket has no upper bound and also holds the contracts without creation date.
+AGEING_BUCKETS = (("days_0_30", 0, 30), ("days_31_60", 31, 60), ("days_61_90", 61, 90), ("days_over_90", 91, None))
+
+# Pays a contract only if the payment does not exceed what remains to be paid.
+PAY_CONTRACT = (
+    update(Contract)
+    .where(Contract.id == bindparam("contract_id"), Contract.to_be_paid >= bindparam("amount"))
+    .values(to_be_paid=Contract.to_be_paid - bindparam("amount"))
+)
+
+
+class BulkPaymentResult:
+    """
+    Outcome of a batch of payments: number of recorded payments and rejected ones.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty result.
+        """
+        self.recorded = 0
+        self.failures = []
+
+    def add_failure(self, index: int, error: Exception):
+        """
+        Record a payment that was not applied.
+
+        Args:
+            index (int): Position of the payment in the input (starting at 0).
+            error (Exception): Reason of the rejection.
+        """
+        self.failures.append((index, str(error)))
+
+    def __str__(self) -> str:
+        """
+        Return a summary of the batch, with one line per rejected payment.
+        """
+        lines = [f"{self.recorded} paiement(s) enregistré(s), {len(self.failures)} en échec."]
+        lines.extend(f"  ligne {index + 1} : {error}" for index, error in self.failures)
+        return "\n".join(lines)
 
 
 class ContractsManager(BaseManager):
@@ -34,42 +93,73 @@ class ContractsManager(BaseManager):
         Returns:
             Contract: The newly created contract instance.
 
+        Raises:
+            ValueError: If the client is not found.
+            PermissionError: If the current user is not the assigned sales contact.
+        """
+        return super().create(
+            self._build(client_id=client_id, total_amount=total_amount, to_be_paid=to_be_paid, is_signed=is_signed)
+        )
+
+    @permission_required(roles=[Department.ACCOUNTING, Department.SALES])
+    def create_many(self, rows: Iterable[dict], chunk_size: int = CREATE_CHUNK_SIZE) -> BulkCreateResult:
+        """
+        Create many contracts, each one checked as in ``create``.
+
+        Args:
+            rows (Iterable[dict]): ``client_id``, ``total_amount``, ``to_be_paid`` and ``is_signed`` of each contract.
+            chunk_size (int): Number of contracts inserted and committed together.
+
+        Returns:
+            BulkCreateResult: Number of created contracts and failed rows.
+        """
+        return super().create_many(rows, chunk_size=chunk_size)
+
+    def _referenced_ids(self, rows: List[dict]) -> dict:
+        """
+        List the clients of the new contracts, loaded once per chunk by ``create_many``.
+        """
+        return {Client: {row.get("client_id") for row in rows}}
+
+    def _build(self, client_id: int, total_amount: float, to_be_paid: int, is_signed: bool) -> Contract:
+        """
+        Build a new contract after checking that its client is assigned to the current user.
+
         Raises:
             ValueError: If the client is not found.
             PermissionError: If the current user is not the assigned sales contact.
         """
         user = self.get_authenticated_user()
 
-        client = self._session.get(Client, client_id)
+        client = self._reference(Client, client_id)
         if not client:
             raise ValueError("Client non trouvé.")
         if client.sales_contact_id != user.id:
             raise PermissionError("Ce client ne vous est pas assigné.")
 
-        return super().create(
-            Contract(
-                client_id=client_id,
-                sales_contact_id=client.sales_contact_id,
-                total_amount=total_amount,
-                to_be_paid=to_be_paid,
-                is_signed=is_signed,
-            )
+        return Contract(
+            client_id=client_id,
+            sales_contact_id=client.sales_contact_id,
+            total_amount=total_amount,
+            to_be_paid=to_be_paid,
+            is_signed=is_signed,
         )
 
-    @permission_required(roles=Department)
-    def get(self, where_clause) -> List[Contract]:
+    @permission_required(roles=Department, read_only=True)
+    def get(self, where_clause, order_by: list = None) -> List[Contract]:
         """
         Retrieve all contracts matching the given condition.
 
         Args:
             where_clause: SQLAlchemy condition to filter contracts.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses.
 
         Returns:
             List[Contract]: List of contracts matching the condition.
         """
-        return super().get(where_clause)
+        return super().get(where_clause, order_by=order_by)
 
-    @permission_required(roles=Department)
+    @permission_required(roles=Department, read_only=True)
     def get_all(self) -> List[Contract]:
         """
         Retrieve all contracts from the database.
@@ -79,7 +169,65 @@ class ContractsManager(BaseManager):
         """
         return super().get_all()
 
-    @permission_required(roles=[Department.ACCOUNTING, Department.SALES])
+    @permission_required(roles=Department, read_only=True)
+    def get_page(self, where_clause=None, limit: int = DEFAULT_PAGE_SIZE, after: int = None) -> List[Contract]:
+        """
+        Retrieve one page of contracts, ordered by ID.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter contracts.
+            limit (int): Maximum number of contracts in the page.
+            after (int): ID of the last contract of the previous page.
+
+        Returns:
+            List[Contract]: The contracts of the page.
+        """
+        return super().get_page(where_clause, limit=limit, after=after)
+
+    @permission_required(roles=Department, read_only=True)
+    def iter_all(self, where_clause=None, after: int = None, batch_size: int = STREAM_BATCH_SIZE) -> Iterable[Contract]:
+        """
+        Stream contracts ordered by ID, in constant memory.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter contracts.
+            after (int): Only stream contracts with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip.
+
+        Returns:
+            Iterable[Contract]: The matching contracts.
+        """
+        return super().iter_all(where_clause, after=after, batch_size=batch_size)
+
+    @permission_required(roles=Department, read_only=True)
+    def get_rows(
+        self,
+        where_clause=None,
+        fields: List[str] = None,
+        limit: int = None,
+        after: int = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        order_by: list = None,
+    ) -> Iterable[Row]:
+        """
+        Read-only listing of contracts returning lightweight rows with only the requested fields.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter contracts.
+            fields (List[str]): Field names taken from ``Contract.HEADERS`` (all by default).
+            limit (int): Maximum number of rows, None to stream every row.
+            after (int): Only return contracts with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip when streaming.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses, applied before the ID.
+
+        Returns:
+            Iterable[Row]: The rows, ordered by ID.
+        """
+        return super().get_rows(
+            where_clause, fields=fields, limit=limit, after=after, batch_size=batch_size, order_by=order_by
+        )
+
+    @permission_required(roles=[Department.ACCOUNTING, Department.SALES], read_only=True)
     def get_unsigned_contracts(self):
         """
         Retrieve all contracts that are not signed.
@@ -89,7 +237,7 @@ class ContractsManager(BaseManager):
         """
         return self.get(Contract.is_signed is False)
 
-    @permission_required(roles=[Department.ACCOUNTING, Department.SALES])
+    @permission_required(roles=[Department.ACCOUNTING, Department.SALES], read_only=True)
     def get_unpaid_contracts(self):
         """
         Retrieve all contracts with remaining payments due.
@@ -99,6 +247,91 @@ class ContractsManager(BaseManager):
         """
         return self.get(Contract.to_be_paid > 0)
 
+    @permission_required(roles=[Department.ACCOUNTING, Department.SALES], read_only=True)
+    def get_totals(self, where_clause=None, group_by: str = None) -> List[Row]:
+        """
+        Sum the amounts of the contracts in the database, optionally per group.
+
+        Amounts are stored in cents: the sums computed by ``SUM`` are exact, and only one
+        row per group is read.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter contracts.
+            group_by (str): One of ``TOTALS_GROUP_FIELDS``, None for a single total.
+
+        Returns:
+            List[Row]: Rows with the group field (when grouped), ``contracts`` (number of
+            contracts), ``total_amount`` and ``to_be_paid``, ordered by group.
+
+        Raises:
+            ValueError: If the contracts cannot be grouped by ``group_by``.
+        """
+        if group_by is not None and group_by not in TOTALS_GROUP_FIELDS:
+            raise ValueError(f"Regroupement impossible par {group_by} : {', '.join(TOTALS_GROUP_FIELDS)}.")
+        columns = [
+            func.count(Contract.id).label("contracts"),
+            func.coalesce(func.sum(Contract.total_amount), 0).label("total_amount"),
+            func.coalesce(func.sum(Contract.to_be_paid), 0).label("to_be_paid"),
+        ]
+        request = select(*columns)
+        if group_by is not None:
+            group = getattr(Contract, group_by)
+            request = select(group, *columns).group_by(group).order_by(group)
+        if where_clause is not None:
+            request = request.where(where_clause)
+        return self._session.execute(request).all()
+
+    @permission_required(roles=[Department.ACCOUNTING], read_only=True)
+    def get_receivables(self, group_by: str = None, as_of: datetime = None) -> List[Row]:
+        """
+        Sum the amounts remaining to be paid, optionally per group, split by age of the contracts.
+
+        The whole report is one aggregate query: the contracts are assigned to the
+        ``AGEING_BUCKETS`` by ``CASE`` expressions on their creation date, summed by the
+        database, and only one row per group is read. Only ACCOUNTING users can read it.
+
+        Args:
+            group_by (str): One of ``TOTALS_GROUP_FIELDS``, None for a single total.
+            as_of (datetime): Date the ages are computed at, defaults to the current time
+                of the database (the clock the creation dates are written with).
+
+        Returns:
+            List[Row]: Rows of the unpaid contracts with the group field (when grouped),
+            ``contracts`` (number of unpaid contracts), ``to_be_paid`` and one field per
+            ageing bucket, ordered by group.
+
+        Raises:
+            ValueError: If the contracts cannot be grouped by ``group_by``.
+        """
+        if group_by is not None and group_by not in TOTALS_GROUP_FIELDS:
+            raise ValueError(f"Regroupement impossible par {group_by} : {', '.join(TOTALS_GROUP_FIELDS)}.")
+        if as_of is None:
+            as_of = self._session.scalar(select(func.now()))
+
+        columns = [
+            func.count(Contract.id).label("contracts"),
+            func.coalesce(func.sum(Contract.to_be_paid), 0).label("to_be_paid"),
+        ]
+        for field, first_day, last_day in AGEING_BUCKETS:
+            # Created at least ``first_day`` days ago (the first bucket also takes the contracts
+            # dated after ``as_of``) and less than ``last_day + 1`` days ago.
+            conditions = []
+            if first_day:
+                conditions.append(Contract.creation_date <= as_of - timedelta(days=first_day))
+            if last_day is not None:
+                conditions.append(Contract.creation_date > as_of - timedelta(days=last_day + 1))
+            condition = and_(*conditions)
+            if last_day is None:
+                condition = or_(condition, Contract.creation_date.is_(None))
+            amount = case((condition, Contract.to_be_paid), else_=0)
+            columns.append(func.coalesce(func.sum(amount), 0).label(field))
+
+        request = select(*columns).where(Contract.to_be_paid > 0)
+        if group_by is not None:
+            group = getattr(Contract, group_by)
+            request = request.add_columns(group).group_by(group).order_by(group)
+        return self._session.execute(request).all()
+
     @permission_required(roles=[Department.ACCOUNTING, Department.SALES])
     def update(self, where_clause, **values):
         """
@@ -114,13 +347,7 @@ class ContractsManager(BaseManager):
         Raises:
             PermissionError: If the sales user tries to modify a contract not assigned to them.
         """
-        user = self.get_authenticated_user()
-        if user.role == Department.SALES:
-            accessed_contracts = self.get(where_clause)
-            for contract in accessed_contracts:
-                if contract.sales_contact_id != user.id:
-                    raise PermissionError("Permission denied: not responsible for this contract.")
-        return super().update(where_clause, **values)
+        return self.scoped_update(where_clause, self.ownership_scope(self.get_authenticated_user()), **values)
 
     @permission_required(roles=[Department.ACCOUNTING, Department.SALES])
     def delete(self, where_clause):
@@ -136,13 +363,127 @@ class ContractsManager(BaseManager):
         Raises:
             PermissionError: If the sales user tries to delete a contract not assigned to them.
         """
-        user = self.get_authenticated_user()
+        return self.scoped_delete(where_clause, self.ownership_scope(self.get_authenticated_user()))
+
+    @permission_required(roles=[Department.ACCOUNTING])
+    def record_payment(self, contract_id: int, amount: Decimal):
+        """
+        Subtract a payment from the amount remaining to be paid on a contract.
+
+        The balance is updated by the database in one conditional ``UPDATE``: concurrent
+        payments cannot overwrite each other, and a payment exceeding the balance is
+        rejected. Only ACCOUNTING users are allowed to record payments.
+
+        Args:
+            contract_id (int): ID of the paid contract.
+            amount (Decimal): Amount of the payment, in euros.
+
+        Raises:
+            ValueError: If the amount is less than one cent, the contract does not exist or the
+                payment exceeds the amount remaining to be paid.
+        """
+        self._check_payment(amount)
+        # Core statement, as in _apply_payments: no ORM synchronization of the session.
+        result = self._session.connection().execute(PAY_CONTRACT, {"contract_id": contract_id, "amount": amount})
+        if result.rowcount != 1:
+            raise ValueError(self._rejection(contract_id, amount))
+        self._session.commit()
+        self._paid([contract_id], amount=str(amount))
+
+    @permission_required(roles=[Department.ACCOUNTING])
+    def record_payments(self, payments: Iterable[tuple], chunk_size: int = PAYMENT_CHUNK_SIZE) -> BulkPaymentResult:
+        """
+        Record many payments (e.g. a bank statement) with batched conditional ``UPDATE`` statements.
+
+        Each chunk is applied with one ``executemany`` in a savepoint. When a payment of the
+        chunk is rejected (unknown contract, overpayment), the chunk is rolled back and its
+        payments are applied one by one to report the rejected ones and keep the others.
+        Payments are applied in order: several payments of one contract add up.
+
+        Args:
+            payments (Iterable[tuple]): ``(contract ID, amount)`` pairs.
+            chunk_size (int): Number of payments applied and committed together.
+
+        Returns:
+            BulkPaymentResult: Number of recorded payments and rejected ones.
+        """
+        result = BulkPaymentResult()
+        chunk = []
+        for index, (contract_id, amount) in enumerate(payments):
+            try:
+                self._check_payment(amount)
+            except ValueError as e:
+                result.add_failure(index, e)
+                continue
+            chunk.append((index, {"contract_id": contract_id, "amount": amount}))
+            if len(chunk) >= chunk_size:
+                self._apply_payments(chunk, result)
+                chunk = []
+        if chunk:
+            self._apply_payments(chunk, result)
+        return result
+
+    def _apply_payments(self, chunk: list, result: BulkPaymentResult):
+        """
+        Apply a chunk of payments with one batched statement, falling back to one
+        statement per payment when some of them are rejected (or when the driver does
+        not count the rows updated by a batch).
+        """
+        # Core statements on the connection of the savepoint: the ORM would read a list of
+        # parameters as a bulk update by primary key.
+        applied = None
+        if self._session.get_bind().dialect.supports_sane_multi_rowcount:
+            with self._session.begin_nested() as savepoint:
+                applied = self._session.connection().execute(PAY_CONTRACT, [values for _, values in chunk]).rowcount
+                if applied != len(chunk):
+                    savepoint.rollback()
+        if applied == len(chunk):
+            result.recorded += applied
+            paid = [values["contract_id"] for _, values in chunk]
+        else:
+            paid = []
+            for index, values in chunk:
+                # A rejected payment updates no row: nothing to roll back.
+                if self._session.connection().execute(PAY_CONTRACT, values).rowcount == 1:
+                    result.recorded += 1
+                    paid.append(values["contract_id"])
+                else:
+                    result.add_failure(index, ValueError(self._rejection(values["contract_id"], values["amount"])))
+        self._session.commit()
+        if paid:
+            self._paid(paid)
+
+    def _check_payment(self, amount: Decimal):
+        # Amounts are stored in cents: a payment rounding to 0 cents would change nothing.
+        if amount is None or Decimal(str(amount)).quantize(CENT, rounding=ROUND_HALF_UP) <= 0:
+            raise ValueError(f"Montant invalide : {amount} (il doit être d'au moins 0.01€).")
+
+    def _rejection(self, contract_id: int, amount: Decimal) -> str:
+        """
+        Explain why a payment was not applied (only queried when it was rejected).
+        """
+        remaining = self._session.scalar(select(Contract.to_be_paid).where(Contract.id == contract_id))
+        if remaining is None:
+            return f"Contrat {contract_id} introuvable."
+        return f"Paiement de {amount} supérieur au reste à payer du contrat {contract_id} ({remaining})."
+
+    def _paid(self, contract_ids: List[int], **details):
+        get_record_cache().invalidate(Contract, sorted(set(contract_ids)))
+        self._audit("update", ids=contract_ids, count=len(contract_ids), fields=["to_be_paid"], payment=True, **details)
+
+    def ownership_scope(self, user: User):
+        """
+        Build the SQL condition selecting the contracts a user is allowed to modify.
+
+        Args:
+            user (User): The authenticated user.
+
+        Returns:
+            SQLAlchemy condition restricting sales users to their own contracts, None for other roles.
+        """
         if user.role == Department.SALES:
-            accessed_contracts = self.get(where_clause)
-            for contract in accessed_contracts:
-                if contract.sales_contact_id != user.id:
-                    raise PermissionError("Permission denied: not responsible for this contract.")
-        return super().delete(where_clause)
+            return Contract.sales_contact_id == user.id
+        return None
 
     def resolve_cascade(self, contracts: List[Contract]) -> List[CascadeDetails]:
         """
@@ -155,3 +496,16 @@ class ContractsManager(BaseManager):
             List[CascadeDetails]: List of cascade-related dependencies (e.g., related events, clients).
         """
         return self.cascade_resolver.resolve_contracts_cascade(contracts=contracts)
+
+    @permission_required(roles=Department, read_only=True)
+    def count_cascade(self, where_clause) -> List[CascadeCount]:
+        """
+        Count the records that deleting the contracts matching a condition would remove, without loading them.
+
+        Args:
+            where_clause: SQLAlchemy condition selecting the contracts.
+
+        Returns:
+            List[CascadeCount]: Number of affected records per table.
+        """
+        return self.cascade_resolver.summarize_contracts_cascade(where_clause)
@@ -1,9 +1,17 @@
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from controllers.cache import cached_get
 from controllers.permissions import permission_required
-from controllers.base_controller import BaseManager
-from controllers.cascade_controller import CascadeDetails
+from controllers.base_controller import (
+    BaseManager,
+    BulkCreateResult,
+    CREATE_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    STREAM_BATCH_SIZE,
+)
+from controllers.cascade_controller import CascadeCount, CascadeDetails
 from controllers import utils
 from models.users import Department, User
 from models.contracts import Contract
@@ -62,14 +70,68 @@ class EventsManager(BaseManager):
             ValueError: If contract or support user is invalid.
             PermissionError: If the contract is not assigned to the current user.
         """
+        return super().create(
+            self._build(
+                event_name=event_name,
+                start_date=start_date,
+                end_date=end_date,
+                location=location,
+                attendees=attendees,
+                notes=notes,
+                contract_id=contract_id,
+                support_contact_id=support_contact_id,
+            )
+        )
+
+    @permission_required([Department.SALES])
+    def create_many(self, rows: Iterable[dict], chunk_size: int = CREATE_CHUNK_SIZE) -> BulkCreateResult:
+        """
+        Create many events, each one validated as in ``create``.
 
+        Args:
+            rows (Iterable[dict]): Arguments of ``create`` for each event.
+            chunk_size (int): Number of events inserted and committed together.
+
+        Returns:
+            BulkCreateResult: Number of created events and failed rows.
+        """
+        return super().create_many(rows, chunk_size=chunk_size)
+
+    def _referenced_ids(self, rows: List[dict]) -> dict:
+        """
+        List the contracts and support contacts of the new events, loaded once per chunk
+        by ``create_many``.
+        """
+        return {
+            Contract: {row.get("contract_id") for row in rows},
+            User: {row.get("support_contact_id") for row in rows},
+        }
+
+    def _build(
+        self,
+        event_name: str,
+        start_date: datetime,
+        end_date: datetime,
+        location: str,
+        attendees: int,
+        notes: str,
+        contract_id: int,
+        support_contact_id: Optional[int] = None,
+    ) -> Event:
+        """
+        Build a new event after validating its contract and support contact.
+
+        Raises:
+            ValueError: If contract or support user is invalid.
+            PermissionError: If the contract is not assigned to the current user.
+        """
         if support_contact_id is not None:
-            support_user = self._session.get(User, support_contact_id)
+            support_user = self._reference(User, support_contact_id)
             if not support_user:
                 raise ValueError("Support user not found.")
             utils.check_user_role(support_user, Department.SUPPORT)
 
-        contract = self._session.get(Contract, contract_id)
+        contract = self._reference(Contract, contract_id)
         if not contract or not contract.is_signed:
             raise ValueError("Contract must exist and be signed.")
 
@@ -79,34 +141,33 @@ class EventsManager(BaseManager):
         if contract.sales_contact_id != user.id:
             raise PermissionError("Permission denied: not your contract.")
 
-        return super().create(
-            Event(
-                event_name=event_name,
-                start_date=start_date,
-                end_date=end_date,
-                location=location,
-                attendees=attendees,
-                notes=notes,
-                contract_id=contract_id,
-                support_contact_id=support_contact_id,
-                client_id=client_id,
-            )
+        return Event(
+            event_name=event_name,
+            start_date=start_date,
+            end_date=end_date,
+            location=location,
+            attendees=attendees,
+            notes=notes,
+            contract_id=contract_id,
+            support_contact_id=support_contact_id,
+            client_id=client_id,
         )
 
-    @permission_required(roles=Department)
-    def get(self, where_clause) -> List[Event]:
+    @permission_required(roles=Department, read_only=True)
+    def get(self, where_clause, order_by: list = None) -> List[Event]:
         """
         Retrieve a list of events matching a specific condition.
 
         Args:
             where_clause: SQLAlchemy where clause for filtering.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses.
 
         Returns:
             List[Event]: A list of matching event instances.
         """
-        return super().get(where_clause)
+        return super().get(where_clause, order_by=order_by)
 
-    @permission_required(roles=Department)
+    @permission_required(roles=Department, read_only=True)
     def get_all(self) -> List[Event]:
         """
         Retrieve all events in the system.
@@ -116,7 +177,65 @@ class EventsManager(BaseManager):
         """
         return super().get_all()
 
-    @permission_required([Department.SUPPORT])
+    @permission_required(roles=Department, read_only=True)
+    def get_page(self, where_clause=None, limit: int = DEFAULT_PAGE_SIZE, after: int = None) -> List[Event]:
+        """
+        Retrieve one page of events, ordered by ID.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter events.
+            limit (int): Maximum number of events in the page.
+            after (int): ID of the last event of the previous page.
+
+        Returns:
+            List[Event]: The events of the page.
+        """
+        return super().get_page(where_clause, limit=limit, after=after)
+
+    @permission_required(roles=Department, read_only=True)
+    def iter_all(self, where_clause=None, after: int = None, batch_size: int = STREAM_BATCH_SIZE) -> Iterable[Event]:
+        """
+        Stream events ordered by ID, in constant memory.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter events.
+            after (int): Only stream events with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip.
+
+        Returns:
+            Iterable[Event]: The matching events.
+        """
+        return super().iter_all(where_clause, after=after, batch_size=batch_size)
+
+    @permission_required(roles=Department, read_only=True)
+    def get_rows(
+        self,
+        where_clause=None,
+        fields: List[str] = None,
+        limit: int = None,
+        after: int = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        order_by: list = None,
+    ) -> Iterable[Row]:
+        """
+        Read-only listing of events returning lightweight rows with only the requested fields.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter events.
+            fields (List[str]): Field names taken from ``Event.HEADERS`` (all by default).
+            limit (int): Maximum number of rows, None to stream every row.
+            after (int): Only return events with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip when streaming.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses, applied before the ID.
+
+        Returns:
+            Iterable[Row]: The rows, ordered by ID.
+        """
+        return super().get_rows(
+            where_clause, fields=fields, limit=limit, after=after, batch_size=batch_size, order_by=order_by
+        )
+
+    @permission_required([Department.SUPPORT], read_only=True)
     def get_my_events(self) -> List[Event]:
         """
         Retrieve all events assigned to the currently authenticated support user.
@@ -127,6 +246,21 @@ class EventsManager(BaseManager):
         user = self.get_authenticated_user()
         return self.get(Event.support_contact_id == user.id)
 
+    @permission_required([Department.SUPPORT], read_only=True)
+    def get_my_event_rows(self, fields: List[str] = None) -> Iterable[Row]:
+        """
+        Stream the events assigned to the currently authenticated support user as
+        lightweight rows (see ``get_rows``).
+
+        Args:
+            fields (List[str]): Field names taken from ``Event.HEADERS`` (all by default).
+
+        Returns:
+            Iterable[Row]: The rows, ordered by ID.
+        """
+        user = self.get_authenticated_user()
+        return self.get_rows(Event.support_contact_id == user.id, fields=fields)
+
     def get_unassigned_support_events(self) -> List[Event]:
         """
         Retrieve all events that currently have no support contact assigned.
@@ -136,6 +270,18 @@ class EventsManager(BaseManager):
         """
         return self.get(Event.support_contact_id.is_(None))
 
+    def get_unassigned_event_rows(self, fields: List[str] = None) -> Iterable[Row]:
+        """
+        Stream the events without a support contact as lightweight rows (see ``get_rows``).
+
+        Args:
+            fields (List[str]): Field names taken from ``Event.HEADERS`` (all by default).
+
+        Returns:
+            Iterable[Row]: The rows, ordered by ID.
+        """
+        return self.get_rows(Event.support_contact_id.is_(None), fields=fields)
+
     @permission_required([Department.ACCOUNTING, Department.SUPPORT])
     def update(self, where_clause, **values):
         """
@@ -150,26 +296,18 @@ class EventsManager(BaseManager):
             **values: Fields to update.
 
         Returns:
-            None
+            int: Number of updated events.
 
         Raises:
             PermissionError: If SUPPORT user tries to update an event not assigned to them.
             ValueError: If new support contact is invalid.
         """
 
-        user = self.get_authenticated_user()
-        accessed_objects = self.get(where_clause)
-
-        if user.role == Department.SUPPORT:
-            for event in accessed_objects:
-                if event.support_contact_id != user.id:
-                    raise PermissionError(f"Permission denied. Not authorized to update event {event.id}")
-
         if "support_contact_id" in values:
-            support_contact = self._session.get(User, values["support_contact_id"])
+            support_contact = cached_get(self._session, User, values["support_contact_id"])
             utils.check_user_role(support_contact, Department.SUPPORT)
 
-        return super().update(where_clause, **values)
+        return self.scoped_update(where_clause, self.ownership_scope(self.get_authenticated_user()), **values)
 
     @permission_required([Department.ACCOUNTING, Department.SUPPORT])
     def delete(self, where_clause):
@@ -183,22 +321,27 @@ class EventsManager(BaseManager):
             where_clause: SQLAlchemy where clause to filter deletions.
 
         Returns:
-            None
+            int: Number of deleted events.
 
         Raises:
             PermissionError: If SUPPORT user tries to delete events not assigned to them.
         """
 
-        user = self.get_authenticated_user()
-        accessed_objects = self.get(where_clause)
+        return self.scoped_delete(where_clause, self.ownership_scope(self.get_authenticated_user()))
 
-        # check that support employee own the accessed events
-        if user.role == Department.SUPPORT:
-            for event in accessed_objects:
-                if event.support_contact_id != user.id:
-                    raise PermissionError(f"Permission denied. Not authorized to update event {event.id}")
+    def ownership_scope(self, user: User):
+        """
+        Build the SQL condition selecting the events a user is allowed to modify.
 
-        return super().delete(where_clause)
+        Args:
+            user (User): The authenticated user.
+
+        Returns:
+            SQLAlchemy condition restricting support users to their assigned events, None for other roles.
+        """
+        if user.role == Department.SUPPORT:
+            return Event.support_contact_id == user.id
+        return None
 
     def resolve_cascade(self, events: List[Event]) -> List[CascadeDetails]:
         """
@@ -211,3 +354,16 @@ class EventsManager(BaseManager):
             List[CascadeDetails]: A list containing cascade detail objects for the given events.
         """
         return [CascadeDetails(title="EVENTS", headers=Event.HEADERS, objects=events)]
+
+    @permission_required(roles=Department, read_only=True)
+    def count_cascade(self, where_clause) -> List[CascadeCount]:
+        """
+        Count the records that deleting the events matching a condition would remove, without loading them.
+
+        Args:
+            where_clause: SQLAlchemy condition selecting the events.
+
+        Returns:
+            List[CascadeCount]: Number of affected records per table.
+        """
+        return self.cascade_resolver.summarize_events_cascade(where_clause)
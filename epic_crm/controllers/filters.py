@@ -0,0 +1,183 @@
+import re
+import enum
+import sqlalchemy
+from datetime import datetime
+from typing import List
+
+
+# Longest operators first, so that "<=" is not read as "<".
+OPERATORS = ("!=", "<=", ">=", "=", "<", ">", "~")
+
+CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*(" + "|".join(re.escape(op) for op in OPERATORS) + r")\s*(.*?)\s*$")
+
+TRUE_WORDS = ("1", "true", "yes", "oui", "on")
+FALSE_WORDS = ("0", "false", "no", "non", "off")
+
+
+def field_expression(model: type, name: str):
+    """
+    Return the SQL expression of a field, refusing the fields that are not in the model's ``HEADERS``.
+
+    Args:
+        model (type): SQLAlchemy model.
+        name (str): Field name.
+
+    Returns:
+        SQL expression of the field (column or hybrid property).
+
+    Raises:
+        ValueError: If the field is not in ``HEADERS``.
+    """
+    if name not in model.HEADERS:
+        raise ValueError(f"Champ inconnu : {name}. Champs disponibles : {', '.join(model.HEADERS)}.")
+    return getattr(model, name)
+
+
+def convert_value(expression, raw: str):
+    """
+    Convert a value typed on the command line to the Python type of a column.
+
+    Args:
+        expression: SQL expression of the field.
+        raw (str): Value as typed.
+
+    Returns:
+        The converted value.
+
+    Raises:
+        ValueError: If the value does not match the type of the field.
+    """
+    python_type = expression.type.python_type
+    try:
+        if python_type is bool:
+            if raw.lower() in TRUE_WORDS:
+                return True
+            if raw.lower() in FALSE_WORDS:
+                return False
+            raise ValueError(raw)
+        if issubclass(python_type, enum.Enum):
+            return python_type[raw.upper()]
+        if python_type is datetime:
+            return datetime.fromisoformat(raw)
+        return python_type(raw)
+    except (ValueError, KeyError, ArithmeticError):
+        raise ValueError(f"Valeur invalide pour {expression.key} : '{raw}'.")
+
+
+def parse_condition(model: type, condition: str):
+    """
+    Compile one condition ``<field> <operator> <value>`` into a SQLAlchemy clause.
+
+    Operators are ``=``, ``!=``, ``<``, ``<=``, ``>``, ``>=`` and ``~`` (contains).
+    ``= null`` and ``!= null`` test for missing values.
+
+    Args:
+        model (type): SQLAlchemy model.
+        condition (str): Condition, e.g. ``to_be_paid>0`` or ``full_name~dupont``.
+
+    Returns:
+        SQLAlchemy clause.
+
+    Raises:
+        ValueError: If the field, the operator or the value is invalid.
+    """
+    match = CONDITION_PATTERN.match(condition)
+    if not match:
+        raise ValueError(
+            f"Condition invalide : '{condition}'. Format attendu : <champ><opérateur><valeur>, "
+            f"opérateurs : {' '.join(OPERATORS)}."
+        )
+    name, operator, raw = match.groups()
+    expression = field_expression(model, name)
+
+    if raw.lower() == "null" and operator in ("=", "!="):
+        return expression.is_(None) if operator == "=" else expression.is_not(None)
+    if operator == "~":
+        return expression.contains(raw, autoescape=True)
+
+    value = convert_value(expression, raw)
+    return {
+        "=": lambda: expression == value,
+        "!=": lambda: expression != value,
+        "<": lambda: expression < value,
+        "<=": lambda: expression <= value,
+        ">": lambda: expression > value,
+        ">=": lambda: expression >= value,
+    }[operator]()
+
+
+def parse_conditions(model: type, conditions: List[str]):
+    """
+    Compile several conditions, all of which must be met.
+
+    Args:
+        model (type): SQLAlchemy model.
+        conditions (List[str]): Conditions (see ``parse_condition``).
+
+    Returns:
+        SQLAlchemy clause, or None when there is no condition.
+    """
+    clauses = [parse_condition(model, condition) for condition in conditions or ()]
+    if not clauses:
+        return None
+    return sqlalchemy.and_(*clauses)
+
+
+def parse_order_by(model: type, specification: str) -> list:
+    """
+    Compile a sort specification: comma-separated fields, prefixed by ``-`` for a descending order.
+
+    Args:
+        model (type): SQLAlchemy model.
+        specification (str): Sort specification, e.g. ``-start_date,event_name``.
+
+    Returns:
+        list: SQLAlchemy ORDER BY clauses (empty when there is no specification).
+    """
+    order_by = []
+    for name in (specification or "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name.startswith("-"):
+            order_by.append(field_expression(model, name[1:].strip()).desc())
+        else:
+            order_by.append(field_expression(model, name).asc())
+    return order_by
+
+
+def parse_fields(model: type, specification: str) -> List[str]:
+    """
+    Validate a comma-separated list of fields.
+
+    Args:
+        model (type): SQLAlchemy model.
+        specification (str): Fields, e.g. ``id,email``.
+
+    Returns:
+        List[str]: The field names, or None when there is no specification.
+    """
+    fields = [name.strip() for name in (specification or "").split(",") if name.strip()]
+    for name in fields:
+        field_expression(model, name)
+    return fields or None
+
+
+def parse_query(model: type, where: List[str] = None, order_by: str = None, fields: str = None) -> tuple:
+    """
+    Compile the ``--where``, ``--order-by`` and ``--fields`` options of the list commands.
+
+    Args:
+        model (type): SQLAlchemy model.
+        where (List[str]): Conditions, all of which must be met.
+        order_by (str): Sort specification.
+        fields (str): Fields to return.
+
+    Returns:
+        tuple: ``(where_clause, order_by, fields)`` for ``BaseManager.get`` / ``get_rows``
+        (None for the missing options).
+
+    Raises:
+        ValueError: If a field, an operator or a value is invalid.
+    """
+    return parse_conditions(model, where), parse_order_by(model, order_by) or None, parse_fields(model, fields)
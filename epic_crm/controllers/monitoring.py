@@ -0,0 +1,44 @@
+from controllers import config
+
+
+_sentry_sdk = None
+
+
+def get_sentry():
+    """
+    Return the ``sentry_sdk`` module, initializing the Sentry client on first use.
+
+    Importing and initializing Sentry is deferred until an event is actually
+    reported, so it does not slow down the CLI startup.
+
+    Returns:
+        module: The initialized ``sentry_sdk`` module.
+    """
+    global _sentry_sdk
+    if _sentry_sdk is None:
+        import sentry_sdk
+
+        sentry_sdk.init(dsn=config.get_str("SENTRY_KEY"))
+        _sentry_sdk = sentry_sdk
+    return _sentry_sdk
+
+
+def capture_exception(error: Exception):
+    """
+    Report an exception to Sentry.
+
+    Args:
+        error (Exception): The exception to report.
+    """
+    return get_sentry().capture_exception(error)
+
+
+def capture_message(message: str, **kwargs):
+    """
+    Report a message to Sentry.
+
+    Args:
+        message (str): The message to report.
+        **kwargs: Extra arguments forwarded to ``sentry_sdk.capture_message``.
+    """
+    return get_sentry().capture_message(message, **kwargs)
@@ -1,22 +1,187 @@
+import time
 from sqlalchemy.orm import Session
 from typing import List
 
-from controllers.authentication import get_current_user_token_payload
+from controllers import config
+from controllers.cache import cached_get, get_record_cache
+from controllers.authentication import get_current_user_token_payload, is_token_revoked, token_file_signature
 from models.users import User, Department
 from controllers.database_controller import SessionLocal
 
 
-def resolve_permission(roles: List[Department], function, *args, **kwargs):
+SECURITY_CONTEXT_KEY = "security_context"
+# Trust the role claim of the token for the read-only checks (see SecurityContext.has_role).
+TRUST_ROLE_CLAIM = config.get_bool("TRUST_ROLE_CLAIM", False)
+
+
+def trusted_role_claim(payload: dict) -> Department:
+    """
+    Return the role claimed by a token when it can be trusted for a read-only check.
+
+    The claim is signed, and the token is not trusted when its user was demoted or
+    deleted after it was issued (see ``revoke_tokens``).
+
+    Args:
+        payload (dict): Decoded payload of the token.
+
+    Returns:
+        Department: The claimed role, or None when ``TRUST_ROLE_CLAIM`` is disabled or the
+        claim must be checked against the database.
+    """
+    if not TRUST_ROLE_CLAIM or payload.get("role") not in Department.__members__ or is_token_revoked(payload):
+        return None
+    return Department[payload["role"]]
+
+
+class SecurityContext:
+    """
+    Principal of the current command, resolved once and shared by every permission check
+    and manager working with the same session.
+
+    The token is only read again when the token file changes (new login) or when it
+    expires, and the ``User`` row is loaded with a single query through the session of
+    the managers. A context shared by several sessions (shell) loads the user again for
+    the first write check of each session, so role changes and deletions are seen.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """
+        Initialize an unresolved security context.
+
+        Args:
+            session (Session): SQLAlchemy session used to load the principal.
+        """
+        self.session = session
+        self._payload = None
+        self._token_signature = None
+        self._user = None
+        self._user_session = None
+        self._user_cached = False
+        self._user_merged = False
+        self.user_id = None
+        self.role = None
+
+    @property
+    def payload(self) -> dict:
+        """
+        dict: JWT payload of the current user, read from the token on first access,
+        whenever the token file is replaced and once it has expired (which raises).
+        """
+        signature = token_file_signature()
+        expired = self._payload is not None and self._payload.get("exp", float("inf")) <= time.time()
+        if self._payload is None or signature != self._token_signature or expired:
+            self._payload = get_current_user_token_payload()
+            self._token_signature = signature
+        return self._payload
+
+    def get_user(self, cached: bool = False) -> User:
+        """
+        Return the authenticated user, loading it on first call (or after a new login).
+
+        Args:
+            cached (bool): Accept the user from the record cache or from a previous session
+                (read-only checks). Such a user is loaded again from the database for the
+                other checks.
+
+        Returns:
+            User: The authenticated user, or None if it does not exist.
+        """
+        user_id = self.payload["user_id"]
+        # A user served by the cache or resolved by a previous session may be outdated.
+        outdated = self._user_cached or self._user_merged or self._user_session is not self.session
+        if self._user is None or self.user_id != user_id or (outdated and not cached):
+            if cached:
+                self._user = cached_get(self.session, User, user_id)
+            elif self._user is not None and self.user_id == user_id:
+                self._user = self.session.get(User, user_id, populate_existing=True)
+            else:
+                self._user = self.session.get(User, user_id)
+            self._user_cached = cached and get_record_cache().enabled
+            self._user_merged = False
+            self.user_id = user_id
+            self.role = self._user.role if self._user is not None else None
+        elif self._user_session is not self.session:
+            # Principal resolved by a previous session of a long-lived process (shell):
+            # attached again without a query for the read-only checks.
+            self._user = self.session.merge(self._user, load=False)
+            self._user_merged = True
+        self._user_session = self.session
+        return self._user
+
+    def bind(self, session: Session):
+        """
+        Share the context with a new session, so that long-lived processes (the shell)
+        resolve the principal once for all their commands.
+
+        Args:
+            session (Session): The new session of the managers.
+        """
+        self.session = session
+        session.info[SECURITY_CONTEXT_KEY] = self
+
+    def has_role(self, roles: List[Department], read_only: bool = False) -> bool:
+        """
+        Tell whether the authenticated user belongs to one of the given departments.
+
+        Args:
+            roles (List[Department]): Authorized departments.
+            read_only (bool): The check guards a read: the role claim of the token is used
+                without loading the user when it can be trusted (see ``trusted_role_claim``),
+                otherwise the user may come from the record cache.
+
+        Returns:
+            bool: False if the user does not exist or its role is not in ``roles``.
+        """
+        if read_only and self._user is None:
+            claimed_role = trusted_role_claim(self.payload)
+            if claimed_role is not None:
+                return claimed_role in roles
+        return self.get_user(cached=read_only) is not None and self.role in roles
+
+
+def get_security_context(session: Session) -> SecurityContext:
+    """
+    Return the security context attached to a session, creating it if needed.
+
+    Managers of a command share their session, hence the resolved principal.
+
+    Args:
+        session (Session): SQLAlchemy session of the command.
+
+    Returns:
+        SecurityContext: The context of the session.
+    """
+    context = session.info.get(SECURITY_CONTEXT_KEY)
+    if context is None:
+        context = SecurityContext(session)
+        session.info[SECURITY_CONTEXT_KEY] = context
+    return context
+
+
+def clear_security_context(session: Session):
+    """
+    Forget the principal resolved for a session (e.g. after a login in a long-lived session).
+
+    Args:
+        session (Session): SQLAlchemy session of the command.
+    """
+    session.info.pop(SECURITY_CONTEXT_KEY, None)
+
+
+def resolve_permission(roles: List[Department], function, *args, read_only: bool = False, **kwargs):
     """
     Execute a function if the currently authenticated user has a role included in the allowed list.
 
-    This function fetches the user from the database using their JWT payload and verifies
-    their role against the allowed `roles`. If the check passes, the target function is called.
+    When the function is a manager method, the principal is resolved once through the
+    security context of the manager's session and reused by nested calls. Otherwise the
+    user is fetched with a new session from its JWT payload. If the check passes, the target function is called.
+    Read-only checks may trust the role claim of the token instead (``TRUST_ROLE_CLAIM``).
 
     Args:
         roles (List[Department]): List of authorized departments.
         function (Callable): The function to execute if permission is granted.
         *args: Positional arguments to pass to the target function.
+        read_only (bool): The function only reads data.
         **kwargs: Keyword arguments to pass to the target function.
 
     Returns:
@@ -26,7 +191,21 @@ def resolve_permission(roles: List[Department], function, *args, **kwargs):
         PermissionError: If the user is not found or their role is not in the allowed list.
     """
     REJECT_MESSAGE = f"Permission denied. Please login as [{' | '.join(role.name for role in roles)}]"
-    user_id = get_current_user_token_payload()["user_id"]
+
+    manager_session = getattr(args[0], "_session", None) if args else None
+    if manager_session is not None:
+        if not get_security_context(manager_session).has_role(roles, read_only=read_only):
+            raise PermissionError(REJECT_MESSAGE)
+        return function(*args, **kwargs)
+
+    payload = get_current_user_token_payload()
+    claimed_role = trusted_role_claim(payload) if read_only else None
+    if claimed_role is not None:
+        if claimed_role not in roles:
+            raise PermissionError(REJECT_MESSAGE)
+        return function(*args, **kwargs)
+
+    user_id = payload["user_id"]
     session: Session = SessionLocal()
     try:
         user = session.get(User, user_id)
@@ -37,7 +216,7 @@ def resolve_permission(roles: List[Department], function, *args, **kwargs):
         session.close()
 
 
-def permission_required(roles: List[Department]):
+def permission_required(roles: List[Department], read_only: bool = False):
     """
     Decorator that restricts function execution to users with specific roles.
 
@@ -51,6 +230,8 @@ def permission_required(roles: List[Department]):
 
     Args:
         roles (List[Department]): A list of `Department` enums authorized to call the function.
+        read_only (bool): The function does not write: its check may trust the role claim of
+            the token (``TRUST_ROLE_CLAIM``). Writes always check the role stored in the database.
 
     Returns:
         Callable: Wrapped function with access control.
@@ -61,7 +242,7 @@ def permission_required(roles: List[Department]):
 
     def decorator(function):
         def wrapper(*args, **kwargs):
-            return resolve_permission(roles, function, *args, **kwargs)
+            return resolve_permission(roles, function, *args, read_only=read_only, **kwargs)
 
         return wrapper
 
@@ -0,0 +1,294 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from controllers.authentication import hash_password
+from models.clients import Client
+from models.contracts import Contract
+from models.events import Event
+from models.users import Department, User
+
+
+SEED_CHUNK_SIZE = 5000
+SEED_WORKERS = 4
+SEED_PASSWORD = "password"
+SEED_EMAIL_DOMAIN = "seed.epic-events.test"
+
+# Departments of the seeded users, in rotation: 40 % sales, 40 % support, 20 % accounting.
+ROLE_ROTATION = (Department.SALES, Department.SUPPORT, Department.SALES, Department.SUPPORT, Department.ACCOUNTING)
+SIGNED_PERCENT = 70
+UNPAID_RATE = 0.4
+UNASSIGNED_EVENT_RATE = 0.2
+
+FIRST_NAMES = ("Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Gabrielle", "Hugo", "Inès", "Julien")
+LAST_NAMES = ("Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy", "Moreau")
+CITIES = ("Paris", "Lyon", "Marseille", "Bordeaux", "Lille", "Nantes", "Toulouse", "Nice", "Rennes", "Strasbourg")
+START_DATE = datetime(2024, 1, 1)
+
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _mix(seed: int, value: int) -> int:
+    """
+    Hash an integer with a seed (SplitMix64 finalizer): a stable pseudo-random number
+    for a row, independent of the chunk and of the order the chunks are generated in.
+    """
+    x = (seed * 0x9E3779B97F4A7C15 + value) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+class SeedReport:
+    """
+    Number of rows inserted in each table and the time it took.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty report.
+        """
+        self.tables = {}
+
+    def add(self, table: str, rows: int, seconds: float):
+        """
+        Record the insertion of the rows of a table.
+
+        Args:
+            table (str): Name of the table.
+            rows (int): Number of inserted rows.
+            seconds (float): Duration of the insertion.
+        """
+        self.tables[table] = (rows, seconds)
+
+    @property
+    def rows(self) -> int:
+        """
+        int: Total number of inserted rows.
+        """
+        return sum(rows for rows, _ in self.tables.values())
+
+    @property
+    def seconds(self) -> float:
+        """
+        float: Total duration of the insertions.
+        """
+        return sum(seconds for _, seconds in self.tables.values())
+
+    def __str__(self) -> str:
+        """
+        Return one line per table and a total line, with the rows per second.
+        """
+        lines = [
+            f"{table} : {rows} ligne(s) en {seconds:.2f} s ({rows / seconds if seconds else 0:,.0f} lignes/s)"
+            for table, (rows, seconds) in self.tables.items()
+        ]
+        rate = self.rows / self.seconds if self.seconds else 0
+        lines.append(f"Total : {self.rows} ligne(s) en {self.seconds:.2f} s ({rate:,.0f} lignes/s)")
+        return "\n".join(lines)
+
+
+class DatasetSeeder:
+    """
+    Generate a synthetic dataset and write it with multi-row INSERT statements.
+
+    The data only depends on the seed and on the state of the database before the
+    run: the IDs are given explicitly, after the highest existing ID of each table,
+    and every email and phone number is derived from its row's ID, so they never
+    collide. The relations (sales contact of a client, client of a contract, signed
+    contracts) are computed from the row numbers, so the chunks of a table can be
+    generated and inserted in parallel, each in its own transaction. The seeded users
+    share one bcrypt hash of ``password`` (computed once, so only its salt differs between runs).
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        seed: int = 0,
+        chunk_size: int = SEED_CHUNK_SIZE,
+        workers: int = None,
+        password: str = SEED_PASSWORD,
+    ) -> None:
+        """
+        Initialize the seeder.
+
+        Args:
+            engine (Engine): Engine of the seeded database.
+            seed (int): Seed of the generated data.
+            chunk_size (int): Number of rows inserted per statement and transaction.
+            workers (int): Number of chunks inserted in parallel, each on its own pooled
+                connection. Defaults to 1 on SQLite (one writer at a time), ``SEED_WORKERS`` otherwise.
+            password (str): Password of every seeded user.
+        """
+        self.engine = engine
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.workers = workers or (1 if engine.dialect.name == "sqlite" else SEED_WORKERS)
+        self.password = password
+        self.sales_ids = []
+        self.support_ids = []
+        self._signed_contracts = []
+        self._first_ids = {}
+        self._clients = 0
+
+    def run(self, users: int = 0, clients: int = 0, contracts: int = 0, events: int = 0) -> SeedReport:
+        """
+        Insert the users, then the clients, contracts and events.
+
+        The clients are assigned to the sales users (existing and seeded), the contracts
+        to the seeded clients and the events to the signed seeded contracts.
+
+        Args:
+            users (int): Number of users, spread over the departments (``ROLE_ROTATION``).
+            clients (int): Number of clients.
+            contracts (int): Number of contracts.
+            events (int): Number of events.
+
+        Returns:
+            SeedReport: Rows inserted per table, with their duration.
+
+        Raises:
+            ValueError: If the requested rows cannot be linked (no sales user for the
+                clients, no seeded client for the contracts, no signed contract for the events).
+        """
+        with self.engine.connect() as connection:
+            for model in (User, Client, Contract, Event):
+                self._first_ids[model] = connection.execute(select(func.coalesce(func.max(model.id), 0))).scalar() + 1
+
+        report = SeedReport()
+        hashed_password = hash_password(self.password) if users else None
+        self._insert(report, User, users, lambda first, stop: self._user_rows(first, stop, hashed_password))
+
+        with self.engine.connect() as connection:
+            self.sales_ids = self._user_ids(connection, Department.SALES)
+            self.support_ids = self._user_ids(connection, Department.SUPPORT)
+        if clients and not self.sales_ids:
+            raise ValueError("Aucun commercial en base : impossible d'attribuer les clients (augmentez --users).")
+        if contracts and not clients:
+            raise ValueError("Les contrats sont rattachés aux clients générés : --clients doit être positif.")
+        self._clients = clients
+        self._insert(report, Client, clients, self._client_rows)
+
+        self._signed_contracts = [n for n in range(contracts) if self._is_signed(n)]
+        if events and not self._signed_contracts:
+            raise ValueError("Les événements sont rattachés aux contrats signés générés : aucun contrat signé.")
+        self._insert(report, Contract, contracts, self._contract_rows)
+        self._insert(report, Event, events, self._event_rows)
+        return report
+
+    def _insert(self, report: SeedReport, model: type, count: int, build_rows: Callable[[int, int], List[dict]]):
+        """
+        Generate and insert the rows of a table, by chunks, in parallel.
+        """
+        if not count:
+            return
+
+        def insert_chunk(first: int) -> int:
+            rows = build_rows(first, min(first + self.chunk_size, count))
+            with self.engine.begin() as connection:
+                connection.execute(insert(model), rows)
+            return len(rows)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            inserted = sum(executor.map(insert_chunk, range(0, count, self.chunk_size)))
+        report.add(model.__tablename__, inserted, time.perf_counter() - start)
+
+    def _user_ids(self, connection, role: Department) -> List[int]:
+        return list(connection.execute(select(User.id).where(User.role == role).order_by(User.id)).scalars())
+
+    def _random(self, model: type, first: int) -> random.Random:
+        # One generator per chunk: the rows do not depend on the order the chunks run in.
+        return random.Random(f"{self.seed}:{model.__tablename__}:{first}")
+
+    def _client_sales_id(self, client: int) -> int:
+        return self.sales_ids[_mix(self.seed + 1, client) % len(self.sales_ids)]
+
+    def _contract_client(self, contract: int) -> int:
+        return _mix(self.seed + 2, contract) % self._clients
+
+    def _is_signed(self, contract: int) -> bool:
+        return _mix(self.seed + 3, contract) % 100 < SIGNED_PERCENT
+
+    def _user_rows(self, first: int, stop: int, hashed_password: str) -> List[dict]:
+        rng = self._random(User, first)
+        rows = []
+        for n in range(first, stop):
+            id_ = self._first_ids[User] + n
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows.append(
+                {
+                    "id": id_,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "email": f"user{id_}@{SEED_EMAIL_DOMAIN}",
+                    "hashed_password": hashed_password,
+                    "role": ROLE_ROTATION[n % len(ROLE_ROTATION)],
+                }
+            )
+        return rows
+
+    def _client_rows(self, first: int, stop: int) -> List[dict]:
+        rng = self._random(Client, first)
+        rows = []
+        for n in range(first, stop):
+            id_ = self._first_ids[Client] + n
+            rows.append(
+                {
+                    "id": id_,
+                    "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    "email": f"client{id_}@{SEED_EMAIL_DOMAIN}",
+                    # 15 characters at most: the size of the column.
+                    "phone": f"+999{id_:011d}",
+                    "enterprise": f"{rng.choice(LAST_NAMES)} {rng.choice(CITIES)} {rng.randrange(1000)}",
+                    "sales_contact_id": self._client_sales_id(n),
+                }
+            )
+        return rows
+
+    def _contract_rows(self, first: int, stop: int) -> List[dict]:
+        rng = self._random(Contract, first)
+        rows = []
+        for n in range(first, stop):
+            client = self._contract_client(n)
+            total_amount = round(rng.uniform(1000, 50000), 2)
+            unpaid = rng.random() < UNPAID_RATE
+            rows.append(
+                {
+                    "id": self._first_ids[Contract] + n,
+                    "client_id": self._first_ids[Client] + client,
+                    "sales_contact_id": self._client_sales_id(client),
+                    "total_amount": total_amount,
+                    "to_be_paid": round(total_amount * rng.uniform(0.1, 1), 2) if unpaid else 0,
+                    "is_signed": self._is_signed(n),
+                }
+            )
+        return rows
+
+    def _event_rows(self, first: int, stop: int) -> List[dict]:
+        rng = self._random(Event, first)
+        rows = []
+        for n in range(first, stop):
+            contract = rng.choice(self._signed_contracts)
+            start_date = START_DATE + timedelta(minutes=15 * rng.randrange(4 * 24 * 730))
+            assigned = self.support_ids and rng.random() >= UNASSIGNED_EVENT_RATE
+            rows.append(
+                {
+                    "id": self._first_ids[Event] + n,
+                    "event_name": f"Événement {self._first_ids[Event] + n}",
+                    "start_date": start_date,
+                    "end_date": start_date + timedelta(hours=rng.randrange(2, 73)),
+                    "location": rng.choice(CITIES),
+                    "attendees": rng.randrange(10, 500),
+                    "notes": "",
+                    "contract_id": self._first_ids[Contract] + contract,
+                    "client_id": self._first_ids[Client] + self._contract_client(contract),
+                    "support_contact_id": rng.choice(self.support_ids) if assigned else None,
+                }
+            )
+        return rows
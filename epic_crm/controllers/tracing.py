@@ -0,0 +1,143 @@
+import json
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# A statement shape executed at least this many times in one command is an N+1 suspect.
+N_PLUS_ONE_THRESHOLD = 3
+
+# Expanded IN lists and multi-row VALUES differ only by their number of parameters.
+_PARAMETER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a SQL statement so that the executions differing only by their parameters
+    (including the length of an ``IN`` list) have the same shape.
+
+    Args:
+        statement (str): SQL statement, as sent to the driver.
+
+    Returns:
+        str: The statement on one line, with parameter lists collapsed to ``(?)``.
+    """
+    return _PARAMETER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """
+    Return the nearest-rank percentile of some values (0 when there is none).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(rank / 100 * len(ordered)) - 1, 0)]
+
+
+class QueryTrace:
+    """
+    Statistics of the SQL statements executed by every engine while the trace is started.
+
+    Rows are the number reported by the driver (affected rows, and fetched rows for
+    drivers which buffer SELECT results such as PyMySQL; SQLite does not report them).
+    """
+
+    def __init__(self, n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD) -> None:
+        """
+        Initialize an empty trace.
+
+        Args:
+            n_plus_one_threshold (int): Executions of one shape reported as an N+1 suspect.
+        """
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.durations = []
+        self.rows = 0
+        self.shapes = Counter()
+        self.shape_durations = defaultdict(float)
+        self._starts = {}
+
+    def start(self):
+        """
+        Start listening to the statements of every engine.
+        """
+        event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def stop(self):
+        """
+        Stop listening to the statements.
+        """
+        event.remove(Engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, connection, cursor, statement, parameters, context, executemany):
+        self._starts[id(cursor)] = time.perf_counter()
+
+    def _after_cursor_execute(self, connection, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - self._starts.pop(id(cursor), time.perf_counter())
+        shape = statement_shape(statement)
+        self.durations.append(duration)
+        self.shapes[shape] += 1
+        self.shape_durations[shape] += duration
+        if cursor.rowcount is not None and cursor.rowcount > 0:
+            self.rows += cursor.rowcount
+
+    @property
+    def n_plus_one(self) -> List[tuple]:
+        """
+        List[tuple]: ``(shape, executions)`` of the shapes repeated at least
+        ``n_plus_one_threshold`` times, most repeated first.
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= self.n_plus_one_threshold]
+
+    def to_dict(self, command: str = None) -> dict:
+        """
+        Export the trace, e.g. to compare the statements of a command between versions.
+
+        Args:
+            command (str): The traced command line.
+
+        Returns:
+            dict: JSON-serializable statistics (durations in milliseconds).
+        """
+        return {
+            "command": command,
+            "statements": len(self.durations),
+            "total_ms": round(sum(self.durations) * 1000, 3),
+            "p95_ms": round(percentile(self.durations, 95) * 1000, 3),
+            "rows": self.rows,
+            "shapes": [
+                {"statement": shape, "count": count, "total_ms": round(self.shape_durations[shape] * 1000, 3)}
+                for shape, count in self.shapes.most_common()
+            ],
+            "n_plus_one": [{"statement": shape, "count": count} for shape, count in self.n_plus_one],
+        }
+
+    def summary(self) -> List[str]:
+        """
+        Return the human-readable report of the trace, one line per item.
+        """
+        lines = [
+            f"SQL : {len(self.durations)} requête(s), {sum(self.durations) * 1000:.1f} ms au total, "
+            f"p95 {percentile(self.durations, 95) * 1000:.1f} ms, {self.rows} ligne(s)"
+        ]
+        lines.extend(f"N+1 suspect ({count}×) : {shape}" for shape, count in self.n_plus_one)
+        return lines
+
+    def export(self, path: str, command: str = None):
+        """
+        Write the trace as a JSON file.
+
+        Args:
+            path (str): Path of the file (overwritten).
+            command (str): The traced command line.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(command), file, ensure_ascii=False, indent=2)
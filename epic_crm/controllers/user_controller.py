@@ -1,16 +1,19 @@
-import sqlalchemy
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
-from typing import List
-from sentry_sdk import capture_message
+from typing import Iterable, List
 
-from controllers.authentication import hash_password, get_current_user_token_payload
-from controllers.base_controller import BaseManager
+from controllers.authentication import hash_password, hash_passwords, revoke_tokens
+from controllers.base_controller import BaseManager, BulkCreateResult, CREATE_CHUNK_SIZE, STREAM_BATCH_SIZE
 from controllers.permissions import permission_required
-from controllers.cascade_controller import CascadeDetails
-from controllers import utils
+from controllers.cascade_controller import CascadeCount, CascadeDetails
+from controllers import audit, utils
 from models.users import Department, User
 
 
+def _has_password(row: dict) -> bool:
+    return isinstance(row.get("password"), str)
+
+
 class UserManager(BaseManager):
     """
     Manage the access to the ``User`` table.
@@ -28,7 +31,7 @@ class UserManager(BaseManager):
         """
         super().__init__(session=session, model=User)
 
-    @permission_required(roles=Department)
+    @permission_required(roles=Department, read_only=True)
     def get(self, *args, **kwargs):
         """
         Retrieve users matching a given condition.
@@ -40,7 +43,7 @@ class UserManager(BaseManager):
         """
         return super().get(*args, **kwargs)
 
-    @permission_required(roles=[Department.ACCOUNTING])
+    @permission_required(roles=[Department.ACCOUNTING], read_only=True)
     def get_all(self):
         """
         Retrieve all users in the database.
@@ -52,6 +55,34 @@ class UserManager(BaseManager):
         """
         return super().get_all()
 
+    @permission_required(roles=[Department.ACCOUNTING], read_only=True)
+    def get_rows(
+        self,
+        where_clause=None,
+        fields: List[str] = None,
+        limit: int = None,
+        after: int = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        order_by: list = None,
+    ) -> Iterable[Row]:
+        """
+        Read-only listing of users returning lightweight rows with only the requested fields.
+
+        Args:
+            where_clause: Optional SQLAlchemy condition to filter users.
+            fields (List[str]): Field names taken from ``User.HEADERS`` (all by default).
+            limit (int): Maximum number of rows, None to stream every row.
+            after (int): Only return users with an ID greater than this one.
+            batch_size (int): Number of rows fetched per round trip when streaming.
+            order_by (list): Optional SQLAlchemy ORDER BY clauses, applied before the ID.
+
+        Returns:
+            Iterable[Row]: The rows, ordered by ID.
+        """
+        return super().get_rows(
+            where_clause, fields=fields, limit=limit, after=after, batch_size=batch_size, order_by=order_by
+        )
+
     def _create_admin_raw(self, firstname, lastname, email, password):
         """
         Create an initial admin (ACCOUNTING) user without requiring authentication.
@@ -91,34 +122,63 @@ class UserManager(BaseManager):
         Returns:
             User: The created user instance.
         """
-        new_user = User(
+        new_user = self._build(firstname=firstname, lastname=lastname, email=email, password=password, role=role)
+
+        return super().create(new_user)
+
+    @permission_required(roles=[Department.ACCOUNTING])
+    def create_many(
+        self, rows: Iterable[dict], chunk_size: int = CREATE_CHUNK_SIZE, workers: int = None
+    ) -> BulkCreateResult:
+        """
+        Create many users with batched inserts.
+
+        Only ACCOUNTING users are allowed to perform this operation. The passwords are
+        hashed beforehand, in parallel (see ``hash_passwords``).
+
+        Args:
+            rows (Iterable[dict]): ``firstname``, ``lastname``, ``email``, ``password`` and ``role`` of each user.
+            chunk_size (int): Number of users inserted and committed together.
+            workers (int): Number of processes hashing the passwords, defaults to the available cores.
+
+        Returns:
+            BulkCreateResult: Number of created users and failed rows.
+        """
+        rows = list(rows)
+        # Rows without a valid password are left to _build, which reports them.
+        hashed = iter(hash_passwords([row["password"] for row in rows if _has_password(row)], workers=workers))
+        rows = [dict(row, hashed_password=next(hashed)) if _has_password(row) else row for row in rows]
+        return super().create_many(rows, chunk_size=chunk_size)
+
+    def _build(
+        self, firstname: str, lastname: str, email: str, password: str, role: Department, hashed_password: str = None
+    ) -> User:
+        """
+        Build a new user, hashing the password unless its hash is given.
+        """
+        return User(
             first_name=firstname,
             last_name=lastname,
             email=email,
-            hashed_password=hash_password(password),
+            hashed_password=hashed_password or hash_password(password),
             role=role,
         )
 
-        created_user = super().create(new_user)
-
-        if created_user is not None:
-            capture_message(
-                message=f"user {get_current_user_token_payload()["user_id"]} : created user {created_user.id}",
-            )
-
-        return created_user
-
     @permission_required(roles=[Department.ACCOUNTING])
     def update(self, where_clause, **values):
         """
         Update user attributes based on a filter.
 
         If email or password is provided, it is validated or hashed respectively.
-        An update audit is captured via `sentry_sdk.capture_message`.
+        The update is audited by ``BaseManager`` with the IDs of the condition. When the
+        role changes, the tokens of the users are revoked first (see ``revoke_tokens``).
 
         Args:
             where_clause: SQLAlchemy clause for filtering users.
             **values: Dictionary of fields to update.
+
+        Returns:
+            int: Number of updated users.
         """
 
         if "email" in values:
@@ -128,29 +188,34 @@ class UserManager(BaseManager):
             password = values.pop("password")
             values["hashed_password"] = hash_password(password)
 
-        super().update(where_clause, **values)
-
-        request = sqlalchemy.select(User).where(where_clause)
-        updated_users = list(self._session.scalars(request))
-
-        if updated_users is not None:
-            capture_message(
-                message=f"user {get_current_user_token_payload()["user_id"]}"
-                f" : updated users : {[user.id for user in updated_users]}",
-            )
+        if "role" in values:
+            self._revoke_tokens(where_clause)
+        return super().update(where_clause, **values)
 
     @permission_required(roles=[Department.ACCOUNTING])
     def delete(self, where_clause):
         """
         Delete one or more users matching the provided condition.
 
-        Only ACCOUNTING users can perform this operation.
+        Only ACCOUNTING users can perform this operation. The tokens of the users are
+        revoked first (see ``revoke_tokens``).
 
         Args:
             where_clause: SQLAlchemy clause to filter users for deletion.
         """
+        self._revoke_tokens(where_clause)
         return super().delete(where_clause)
 
+    def _revoke_tokens(self, where_clause):
+        """
+        Revoke the tokens of the users matching a condition, whose role claim is about to
+        become outdated. Revoking before the write errs on the safe side if it fails.
+        """
+        user_ids = audit.ids_from_clause(User, where_clause)
+        if user_ids is None:
+            user_ids = self._session.execute(select(User.id).where(where_clause)).scalars().all()
+        revoke_tokens(user_ids)
+
     def resolve_cascade(self, users: List[User]) -> List[CascadeDetails]:
         """
         Resolve and return all cascade-deletable objects related to the given users.
@@ -164,3 +229,16 @@ class UserManager(BaseManager):
             List[CascadeDetails]: Structured details of deletable dependencies.
         """
         return self.cascade_resolver.resolve_user_cascade(users=users)
+
+    @permission_required(roles=Department, read_only=True)
+    def count_cascade(self, where_clause) -> List[CascadeCount]:
+        """
+        Count the records that deleting the users matching a condition would remove, without loading them.
+
+        Args:
+            where_clause: SQLAlchemy condition selecting the users.
+
+        Returns:
+            List[CascadeCount]: Number of affected records per table.
+        """
+        return self.cascade_resolver.summarize_user_cascade(where_clause)
@@ -1,8 +1,14 @@
 import re
+from contextlib import contextmanager
+from contextvars import ContextVar
 from models.users import User, Department
 from controllers.database_controller import SessionLocal
 
 
+# Session factory used by get_manager instead of SessionLocal (see use_session_factory).
+_session_factory = ContextVar("session_factory", default=None)
+
+
 def validate_email(email: str):
     """
     Validate the format of an email address using a basic regular expression.
@@ -41,7 +47,8 @@ def get_manager(manager_class):
     """
     Instantiate a manager and return it along with a new SQLAlchemy session.
 
-    This is typically used in CLI views to manage context.
+    This is typically used in CLI views to manage context. The session comes from
+    ``SessionLocal``, or from the factory installed by ``use_session_factory``.
 
     Args:
         manager_class (type): The class of the manager to instantiate.
@@ -49,5 +56,23 @@ def get_manager(manager_class):
     Returns:
         Tuple[BaseManager, Session]: A tuple containing the manager instance and its associated session.
     """
-    session = SessionLocal()
+    session = (_session_factory.get() or SessionLocal)()
     return manager_class(session), session
+
+
+@contextmanager
+def use_session_factory(factory):
+    """
+    Make ``get_manager`` open its sessions with another factory while the block runs.
+
+    Used by the processes running several commands (the shell) to share state between
+    the sessions of their commands.
+
+    Args:
+        factory (Callable[[], Session]): Returns a new session.
+    """
+    token = _session_factory.set(factory)
+    try:
+        yield
+    finally:
+        _session_factory.reset(token)
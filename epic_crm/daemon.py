@@ -0,0 +1,302 @@
+import getpass
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import traceback
+
+from controllers import config
+
+
+# Commands never forwarded: the daemon management and the commands reading the terminal
+# or the standard input themselves.
+LOCAL_COMMANDS = ("daemon", "shell", "run-batch")
+
+# Settings read once by the daemon (database, revocation list, cache, audit log): a client
+# configured differently must not have its commands run against the daemon's configuration.
+FORWARDED_SETTINGS = (
+    "DATABASE_URL",
+    "DATABASE_HOST",
+    "DATABASE_PORT",
+    "DATABASE_NAME",
+    "REVOCATION_FILE",
+    "CACHE_TTL",
+    "AUDIT_FILE",
+)
+
+
+def get_socket_path() -> str:
+    """
+    Return the path of the daemon's Unix socket (``EPIC_CRM_SOCKET``, or a per-user file
+    in the temporary directory).
+    """
+    default = os.path.join(tempfile.gettempdir(), f"epic_crm-{getattr(os, 'getuid', lambda: 0)()}.sock")
+    return config.get_str("EPIC_CRM_SOCKET", default)
+
+
+def send_request(request: dict, socket_path: str = None, timeout: float = None) -> dict:
+    """
+    Send a JSON request to the daemon and return its JSON response.
+
+    Args:
+        request (dict): The request to send.
+        socket_path (str): Socket path, defaults to ``get_socket_path()``.
+        timeout (float): Socket timeout in seconds (None waits indefinitely).
+
+    Returns:
+        dict: The daemon's response.
+
+    Raises:
+        OSError: If the daemon is not reachable.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path or get_socket_path())
+        return _exchange(client, request)
+
+
+def get_settings() -> dict:
+    """
+    Return the values of ``FORWARDED_SETTINGS`` in this process (None when not set).
+    """
+    return {name: config.get_str(name) for name in FORWARDED_SETTINGS}
+
+
+def _exchange(client: socket.socket, request: dict) -> dict:
+    """
+    Write one newline-terminated JSON message on a connected socket and read the answer.
+    """
+    with client.makefile("rwb") as stream:
+        _write_message(stream, request)
+        return _read_message(stream)
+
+
+def _write_message(stream, message: dict):
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
+
+
+def _read_message(stream) -> dict:
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connexion fermée par le démon.")
+    return json.loads(line)
+
+
+def forward_to_daemon(args) -> int:
+    """
+    Run a CLI command through the daemon when it is running.
+
+    The current directory (where ``.token`` lives), the terminal settings and the
+    ``FORWARDED_SETTINGS`` are sent along; the daemon refuses the command when those
+    settings differ from its own, and it then runs locally. The prompts of the command
+    are answered from this process (``input`` / ``getpass``, as click does), so the
+    result is the same as a local execution.
+
+    Args:
+        args (List[str]): The CLI arguments (without the program name).
+
+    Returns:
+        int: The exit code of the command, or None when the command must run locally
+        (daemon not running, disabled or configured differently, or one of ``LOCAL_COMMANDS``).
+    """
+    if not hasattr(socket, "AF_UNIX") or config.get_bool("EPIC_CRM_NO_DAEMON") or (args and args[0] in LOCAL_COMMANDS):
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(get_socket_path())
+    except OSError:
+        client.close()
+        return None
+
+    with client, client.makefile("rwb") as stream:
+        _write_message(
+            stream,
+            {
+                "command": "run",
+                "argv": list(args),
+                "cwd": os.getcwd(),
+                "color": sys.stdout.isatty(),
+                "columns": shutil.get_terminal_size().columns,
+                "settings": get_settings(),
+            },
+        )
+        while True:
+            message = _read_message(stream)
+            if message["type"] == "refused":
+                return None
+
+            sys.stdout.write(message.get("output", ""))
+            sys.stdout.flush()
+            sys.stderr.write(message.get("error", ""))
+            sys.stderr.flush()
+
+            if message["type"] == "result":
+                return message["exit_code"]
+
+            try:
+                prompt = getpass.getpass if message["hidden"] else input
+                _write_message(stream, {"answer": prompt(message["text"])})
+            except (EOFError, KeyboardInterrupt):
+                _write_message(stream, {"eof": True})
+
+
+class _OutputBuffer:
+    """
+    Captured standard and error outputs of a command, handed to the client in chunks.
+    """
+
+    def __init__(self, output, error) -> None:
+        self.buffers = {"output": output, "error": error}
+        self.sent = {"output": 0, "error": 0}
+
+    def pop(self) -> dict:
+        """
+        Return the output and error written since the previous call.
+        """
+        sys.stdout.flush()
+        sys.stderr.flush()
+        chunks = {}
+        for name, buffer in self.buffers.items():
+            data = buffer.getvalue()[self.sent[name]:]
+            self.sent[name] += len(data)
+            chunks[name] = data.decode(errors="replace")
+        return chunks
+
+
+class _RemotePrompt:
+    """
+    Prompt function used by click inside the daemon: the question is sent to the client,
+    which answers from its own terminal or standard input.
+    """
+
+    def __init__(self, stream, output: _OutputBuffer, hidden: bool) -> None:
+        self.stream = stream
+        self.output = output
+        self.hidden = hidden
+
+    def __call__(self, text: str = "") -> str:
+        _write_message(self.stream, {"type": "prompt", "text": text, "hidden": self.hidden, **self.output.pop()})
+        answer = _read_message(self.stream)
+        if answer.get("eof"):
+            raise EOFError()
+        return answer["answer"]
+
+
+def execute(stream, argv, cwd: str, color: bool = False, columns: int = 80) -> int:
+    """
+    Execute a CLI command in the daemon process, relaying its output and prompts to the client.
+
+    Args:
+        stream: Binary stream of the client connection.
+        argv (List[str]): The CLI arguments.
+        cwd (str): Working directory of the client.
+        color (bool): Keep the ANSI color codes in the output.
+        columns (int): Width of the client's terminal.
+
+    Returns:
+        int: The exit code of the command.
+    """
+    from click import formatting, termui
+    from click.testing import CliRunner
+    from main import run
+
+    os.chdir(cwd)
+    exit_code = 0
+    with CliRunner(mix_stderr=False).isolation(color=color) as (output_buffer, error_buffer):
+        output = _OutputBuffer(output_buffer, error_buffer)
+        formatting.FORCED_WIDTH = columns
+        termui.visible_prompt_func = _RemotePrompt(stream, output, hidden=False)
+        termui.hidden_prompt_func = _RemotePrompt(stream, output, hidden=True)
+        try:
+            run(argv)
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                sys.stderr.write(f"{e.code}\n")
+                exit_code = 1
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        _write_message(stream, {"type": "result", "exit_code": exit_code, **output.pop()})
+    return exit_code
+
+
+def warm_up():
+    """
+    Load every command module, configure the ORM mappers and open a first pooled connection,
+    so that the first forwarded command does not pay for them.
+    """
+    from sqlalchemy import text
+    from sqlalchemy.orm import configure_mappers
+    from controllers.database_controller import get_engine
+    from main import cli
+
+    for name in cli.list_commands(None):
+        cli.get_command(None, name)
+    configure_mappers()
+    with get_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def serve(socket_path: str = None):
+    """
+    Run the daemon: accept requests on the Unix socket until a ``shutdown`` request.
+
+    Requests are processed one at a time, which keeps the working directory switch
+    and the captured output of each command isolated. ``run`` requests whose
+    ``FORWARDED_SETTINGS`` differ from the daemon's are refused.
+
+    Args:
+        socket_path (str): Socket path, defaults to ``get_socket_path()``.
+    """
+    socket_path = socket_path or get_socket_path()
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    warm_up()
+    settings = get_settings()
+    served = 0
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        while True:
+            connection, _ = server.accept()
+            try:
+                with connection, connection.makefile("rwb") as stream:
+                    request = _read_message(stream)
+                    command = request.get("command")
+
+                    if command == "run" and request.get("settings") != settings:
+                        _write_message(stream, {"type": "refused", "settings": settings})
+                    elif command == "run":
+                        execute(
+                            stream,
+                            request["argv"],
+                            request["cwd"],
+                            color=request.get("color", False),
+                            columns=request.get("columns", 80),
+                        )
+                        served += 1
+                    elif command == "ping":
+                        _write_message(stream, {"pid": os.getpid(), "served": served})
+                    elif command == "shutdown":
+                        _write_message(stream, {"stopped": True})
+                        break
+                    else:
+                        _write_message(stream, {"error": f"Commande inconnue : {command}"})
+            except (OSError, ValueError):
+                # The client went away or sent an invalid message: serve the next one.
+                continue
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
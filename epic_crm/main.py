@@ -1,60 +1,117 @@
 import click
-from controllers.database_controller import engine
-from sentry_sdk import capture_exception
-from models.base import Base
-from views.user_view import create_user_cmd, login, current_user, logout, list_users
-from views.client_view import client
-from views.contract_view import contract
-from views.event_view import event
-from views.admin_view import create_admin, reset_db, delete_users
-
-
-@click.group()
-def cli():
+import sys
+from views.lazy_group import LazyGroup
+
+
+# name -> "module:command". Modules are only imported when their command runs; --help
+# reads the short help of the commands from their docstrings.
+COMMANDS = {
+    "create-user": "views.user_view:create_user_cmd",
+    "import-users": "views.user_view:import_users",
+    "login": "views.user_view:login",
+    "logout": "views.token_view:logout",
+    "current-user": "views.user_view:current_user",
+    "list-users": "views.user_view:list_users",
+    "client": "views.client_view:client",
+    "contract": "views.contract_view:contract",
+    "event": "views.event_view:event",
+    "report": "views.report_view:report",
+    "init-db": "views.admin_view:init_db",
+    "reset-db": "views.admin_view:reset_db",
+    "add-indexes": "views.admin_view:add_indexes",
+    "migrate-money": "views.admin_view:migrate_money",
+    "delete-users": "views.admin_view:delete_users",
+    "create-admin": "views.admin_view:create_admin",
+    "seed": "views.admin_view:seed",
+    "daemon": "views.daemon_view:daemon",
+    "shell": "views.shell_view:shell",
+    "run-batch": "views.batch_view:run_batch",
+}
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
+@click.option(
+    "--trace", is_flag=True, envvar="EPIC_CRM_TRACE", help="Report the SQL statements of the command on stderr."
+)
+@click.option(
+    "--trace-json",
+    type=click.Path(dir_okay=False, writable=True),
+    envvar="EPIC_CRM_TRACE_JSON",
+    help="Also export the SQL trace to this JSON file.",
+)
+@click.pass_context
+def cli(ctx, trace, trace_json):
     """
     CLI tool for Epic Events CRM.
 
     Allows user and admin operations such as authentication, client management,
     contract handling, event scheduling, and database operations.
     """
-    pass
-
+    if trace or trace_json:
+        start_trace(ctx, trace_json)
 
-cli.add_command(create_user_cmd, name="create-user")
-cli.add_command(login)
-cli.add_command(logout)
-cli.add_command(current_user)
-cli.add_command(list_users)
-cli.add_command(client)
-cli.add_command(contract)
-cli.add_command(event)
-cli.add_command(reset_db)
-cli.add_command(delete_users)
-cli.add_command(create_admin)
 
-
-@cli.command()
-def init_db():
+def start_trace(ctx, json_path: str = None):
     """
-    Initialize the MySQL database schema.
+    Trace the SQL statements of the command, and report them when it ends.
 
-    This command creates all tables defined in the SQLAlchemy models.
+    Args:
+        ctx (click.Context): Context of the CLI group.
+        json_path (str): Optional file receiving the trace as JSON.
     """
-    Base.metadata.create_all(bind=engine)
-    click.echo("Base de données MySQL initialisée avec succès.")
+    from controllers.tracing import QueryTrace
 
+    command = " ".join(ctx.meta.get("command_line", []))
+    query_trace = QueryTrace()
+    query_trace.start()
 
-if __name__ == "__main__":
+    def report():
+        from controllers.cache import get_record_cache
+
+        query_trace.stop()
+        for line in query_trace.summary():
+            click.secho(line, fg="cyan", err=True)
+        stats = get_record_cache().stats()
+        if stats["hits"] or stats["disk_hits"] or stats["misses"]:
+            hits = f"{stats['hits']} hit(s) en mémoire, {stats['disk_hits']} sur disque"
+            click.secho(f"Cache : {hits}, {stats['misses']} miss(es)", fg="cyan", err=True)
+        if json_path:
+            query_trace.export(json_path, command=command)
+
+    ctx.call_on_close(report)
+
+
+def run(args=None):
+    """
+    Run the CLI in the current process, with the error handling of the entry point.
+
+    Args:
+        args (List[str]): CLI arguments, defaults to ``sys.argv[1:]``.
+    """
     try:
-        cli()
+        cli(args, prog_name="main.py")
 
     except PermissionError as e:
         click.secho(f"Permission error: {e}", fg="red")
+        sys.exit(1)
 
     except ValueError as e:
         click.secho(f"Input error: {e}", fg="red")
+        sys.exit(1)
 
     except Exception as e:
+        from controllers.monitoring import capture_exception
+
         capture_exception(e)
         click.secho(f"Unexpected error occurred: {e}", fg="red")
         raise e
+
+
+if __name__ == "__main__":
+    from daemon import forward_to_daemon
+
+    exit_code = forward_to_daemon(sys.argv[1:])
+    if exit_code is None:
+        run()
+    else:
+        sys.exit(exit_code)
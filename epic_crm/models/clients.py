@@ -6,6 +6,7 @@ from sqlalchemy import (
     String,
     DateTime,
     ForeignKey,
+    Index,
 )
 
 from .base import Base
@@ -34,10 +35,14 @@ class Client(Base):
     Constants:
         HEADERS (Tuple[str]): List of field names used for tabular export.
 
+    Indexes:
+        ix_clients_sales_contact_id: clients of a sales contact (``get_my_clients``, cascades).
+
     Methods:
         to_list(): Returns the client’s information as a tuple of values, for tabular display or export.
     """
     __tablename__ = "clients"
+    __table_args__ = (Index("ix_clients_sales_contact_id", "sales_contact_id"),)
 
     id = Column(
         Integer,
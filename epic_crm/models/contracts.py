@@ -1,13 +1,14 @@
 from .base import Base
+from .types import Money
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy import (
     Column,
     Integer,
-    Float,
     DateTime,
     Boolean,
     ForeignKey,
+    Index,
 )
 
 
@@ -21,8 +22,8 @@ class Contract(Base):
 
     Attributes:
         id (int): Primary key, auto-incremented.
-        total_amount (float): Total value of the contract in euros.
-        to_be_paid (float): Remaining amount to be paid.
+        total_amount (Decimal): Total value of the contract in euros (stored in cents).
+        to_be_paid (Decimal): Remaining amount to be paid (stored in cents).
         creation_date (datetime): Timestamp of when the contract was created (automatically set).
         last_update (datetime): Timestamp of last update (automatically set on modification).
         is_signed (bool): Indicates whether the contract has been signed.
@@ -38,17 +39,29 @@ class Contract(Base):
     Constants:
         HEADERS (Tuple[str]): List of field names used for tabular export.
 
+    Indexes:
+        ix_contracts_client_id: contracts of a client (cascades).
+        ix_contracts_sales_contact_id_is_signed: contracts of a sales contact, optionally by signature status.
+        ix_contracts_is_signed: unsigned contracts (``get_unsigned_contracts``).
+        ix_contracts_to_be_paid: unpaid contracts (``get_unpaid_contracts``).
+
     Methods:
         to_list(): Returns the contract’s data as a tuple, suitable for tabular display or export.
     """
 
     __tablename__ = "contracts"
+    __table_args__ = (
+        Index("ix_contracts_client_id", "client_id"),
+        Index("ix_contracts_sales_contact_id_is_signed", "sales_contact_id", "is_signed"),
+        Index("ix_contracts_is_signed", "is_signed"),
+        Index("ix_contracts_to_be_paid", "to_be_paid"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
-    total_amount = Column(Float(precision=2))
+    total_amount = Column(Money)
 
-    to_be_paid = Column(Float(precision=2))
+    to_be_paid = Column(Money)
 
     creation_date = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -6,6 +6,7 @@ from sqlalchemy import (
     String,
     DateTime,
     ForeignKey,
+    Index,
 )
 
 
@@ -39,11 +40,22 @@ class Event(Base):
     Constants:
         HEADERS (Tuple[str]): Tuple of field names used for tabular export.
 
+    Indexes:
+        ix_events_contract_id: events of a contract (cascades).
+        ix_events_support_contact_id_start_date: events of a support contact, or unassigned ones
+            (``support_contact_id IS NULL``), in date order.
+        ix_events_start_date: events in a date range.
+
     Methods:
         to_list(): Returns the event’s data as a tuple, suitable for tabular display or export.
     """
 
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_contract_id", "contract_id"),
+        Index("ix_events_support_contact_id_start_date", "support_contact_id", "start_date"),
+        Index("ix_events_start_date", "start_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -0,0 +1,53 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import BigInteger
+from sqlalchemy.sql import operators
+from sqlalchemy.types import TypeDecorator
+
+
+CENT = Decimal("0.01")
+
+
+class Money(TypeDecorator):
+    """
+    Amount in euros, stored as an integer number of cents.
+
+    Values are exchanged as ``Decimal`` with two decimal places: sums and comparisons
+    are exact in every database (``SUM`` of an integer column), unlike floating-point
+    columns. Values bound to a query (float, int, str or ``Decimal``) are rounded to the cent.
+    In expressions, sums, differences and products or quotients by a number are amounts
+    too; write the amount first (``Contract.total_amount * 2``, not ``2 * ...``).
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    class comparator_factory(TypeDecorator.Comparator, BigInteger.Comparator):
+        def _adapt_expression(self, op, other_comparator):
+            # Sums, differences and amounts scaled by a number are amounts (in cents) too.
+            scaled = op in (operators.mul, operators.truediv) and not isinstance(other_comparator.type, Money)
+            if op in (operators.add, operators.sub) or scaled:
+                return op, self.type
+            return super()._adapt_expression(op, other_comparator)
+
+    @property
+    def python_type(self) -> type:
+        return Decimal
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # str() first: a float is converted to the decimal number it was written as.
+        return int((Decimal(str(value)) / CENT).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return (Decimal(value) * CENT).quantize(CENT)
+
+    def coerce_compared_value(self, op, value):
+        # Amounts added to or compared with a money column are in euros too; factors and
+        # divisors are plain numbers.
+        if operators.is_comparison(op) or op in (operators.add, operators.sub):
+            return self
+        return self.impl.coerce_compared_value(op, value)
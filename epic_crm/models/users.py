@@ -1,3 +1,4 @@
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy import Enum, Column, Integer, String
 import enum
@@ -60,10 +61,14 @@ class User(Base):
 
     HEADERS = ["id", "email", "full_name", "role"]
 
-    @property
+    @hybrid_property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
+    @full_name.expression
+    def full_name(cls):
+        return cls.first_name + " " + cls.last_name
+
     def to_list(self):
         return (
             self.id,
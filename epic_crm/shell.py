@@ -0,0 +1,256 @@
+import click
+import cmd
+import shlex
+from itertools import chain
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from controllers.authentication import token_file_signature
+from controllers.client_controller import ClientsManager
+from controllers.contract_controller import ContractsManager
+from controllers.database_controller import SessionLocal
+from controllers.event_controller import EventsManager
+from controllers.permissions import get_security_context
+from controllers.user_controller import UserManager
+from controllers.utils import use_session_factory
+from models.clients import Client
+from models.contracts import Contract
+from models.events import Event
+from models.users import User
+
+
+# ID options completed by the shell -> (model, manager listing its IDs).
+ID_OPTIONS = {
+    "--client-id": (Client, ClientsManager),
+    "--contract-id": (Contract, ContractsManager),
+    "--event-id": (Event, EventsManager),
+    "--support-id": (User, UserManager),
+}
+
+SHELL_COMMANDS = ("exit", "quit", "help")
+
+
+class IdIndex:
+    """
+    IDs of the records, loaded on the first completion of a model and kept until the
+    shell writes to its table (or another user logs in).
+    """
+
+    def __init__(self, session_factory) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            session_factory (Callable[[], Session]): Opens the sessions used to load the IDs.
+        """
+        self.session_factory = session_factory
+        self._ids = {}
+        self._token_signature = token_file_signature()
+
+    def get(self, model: type, manager_class: type) -> List[str]:
+        """
+        Return the IDs of a model, as strings, loading them if needed.
+
+        The IDs are read through the manager's ``get_rows``, so the permissions of the
+        authenticated user apply: nothing is completed when they are not met.
+
+        Args:
+            model (type): SQLAlchemy model.
+            manager_class (type): Manager of the model.
+
+        Returns:
+            List[str]: The IDs, sorted.
+        """
+        signature = token_file_signature()
+        if signature != self._token_signature:
+            self.invalidate()
+            self._token_signature = signature
+        if model not in self._ids:
+            session = self.session_factory()
+            try:
+                self._ids[model] = [str(row.id) for row in manager_class(session).get_rows(fields=["id"])]
+            except (PermissionError, ValueError):
+                return []
+            finally:
+                session.close()
+        return self._ids[model]
+
+    def invalidate(self, *models: type):
+        """
+        Forget the IDs of some models (all of them when none is given).
+        """
+        if not models:
+            self._ids.clear()
+        for model in models:
+            self._ids.pop(model, None)
+
+
+class CrmShell(cmd.Cmd):
+    """
+    Interactive shell running the CLI commands in a single process.
+
+    The engine and its connection pool, the loaded modules and the principal of the
+    security context stay alive between commands; IDs are completed with the tab key.
+    """
+
+    intro = "Epic Events CRM – tapez 'help' pour la liste des commandes, 'exit' pour quitter."
+    prompt = "epic-crm> "
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.security_context = None
+        self.ids = IdIndex(self.open_session)
+
+    def open_session(self) -> Session:
+        """
+        Open the session of a command, sharing the shell's security context and
+        invalidating the ID index when the command writes.
+
+        Returns:
+            Session: The new session.
+        """
+        session = SessionLocal()
+        if self.security_context is None:
+            self.security_context = get_security_context(session)
+        else:
+            self.security_context.bind(session)
+        event.listen(session, "after_flush", self._after_flush)
+        event.listen(session, "do_orm_execute", self._on_execute)
+        return session
+
+    def _after_flush(self, session: Session, flush_context):
+        self.ids.invalidate(*{type(obj) for obj in chain(session.new, session.deleted)})
+
+    def _on_execute(self, orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            mapper = orm_execute_state.bind_mapper
+            self.ids.invalidate(*([mapper.class_] if mapper is not None else []))
+
+    def authenticate(self):
+        """
+        Greet the authenticated user, or run ``login`` when there is no valid token.
+        """
+        session = self.open_session()
+        try:
+            user = self.security_context.get_user()
+        except ValueError:
+            user = None
+        try:
+            if user is not None:
+                click.secho(f"Connecté en tant que {user.full_name} ({user.role.name})", fg="green")
+        finally:
+            session.close()
+        if user is None:
+            self.run_command(["login"])
+
+    def run_command(self, argv: List[str]) -> int:
+        """
+        Run a CLI command in the shell's process.
+
+        Args:
+            argv (List[str]): The CLI arguments.
+
+        Returns:
+            int: The exit code of the command.
+        """
+        from main import run
+
+        try:
+            run(argv)
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            # Already reported by run(): the shell stays open.
+            return 1
+        return 0
+
+    def preloop(self):
+        try:
+            import readline
+
+            # Options such as --client-id must be completed as a single word.
+            readline.set_completer_delims(" \t\n")
+        except ImportError:
+            pass
+
+    def emptyline(self):
+        # Do not repeat the previous command.
+        return False
+
+    def default(self, line: str):
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            click.secho(f"Input error: {e}", fg="red")
+            return False
+        self.run_command(argv)
+        return False
+
+    def do_help(self, arg: str):
+        """
+        Display the help of the CLI, or of a command.
+        """
+        self.run_command(shlex.split(arg) + ["--help"])
+
+    def do_exit(self, arg: str):
+        """
+        Leave the shell.
+        """
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg: str):
+        click.echo()
+        return True
+
+    def completenames(self, text: str, *ignored) -> List[str]:
+        from main import cli
+
+        return [name for name in chain(cli.list_commands(None), SHELL_COMMANDS) if name.startswith(text)]
+
+    def completedefault(self, text: str, line: str, begidx: int, endidx: int) -> List[str]:
+        from main import cli
+
+        try:
+            words = shlex.split(line[:begidx])
+        except ValueError:
+            return []
+
+        previous = words[-1] if words else ""
+        if previous in ID_OPTIONS:
+            return [id_ for id_ in self.ids.get(*ID_OPTIONS[previous]) if id_.startswith(text)]
+        option, separator, value = text.partition("=")
+        if separator and option in ID_OPTIONS:
+            return [f"{option}={id_}" for id_ in self.ids.get(*ID_OPTIONS[option]) if id_.startswith(value)]
+
+        command = cli
+        for word in words[1:] if words and words[0] == "help" else words:
+            if not isinstance(command, click.Group) or word.startswith("-"):
+                break
+            command = command.get_command(None, word)
+            if command is None:
+                return []
+        if isinstance(command, click.Group):
+            names = command.list_commands(None)
+        else:
+            names = [name for param in command.params for name in param.opts if name.startswith("--")]
+        return [name for name in names if name.startswith(text)]
+
+    def complete_help(self, text: str, line: str, begidx: int, endidx: int) -> List[str]:
+        return self.completedefault(text, line, begidx, endidx)
+
+
+def run_shell():
+    """
+    Warm up the process, authenticate once and run the shell until ``exit``.
+    """
+    from daemon import warm_up
+
+    warm_up()
+    shell = CrmShell()
+    with use_session_factory(shell.open_session):
+        shell.authenticate()
+        shell.cmdloop()
@@ -1,4 +1,5 @@
 import os
+from datetime import datetime
 import pytest
 from controllers import permissions
 from controllers.user_controller import UserManager
@@ -115,8 +116,8 @@ def test_full_flow(test_db_session, setup_database, patch_permission_sessionloca
         contract_id=contract.id,
         support_contact_id=support_user.id,
         attendees=15,
-        start_date="2025-09-01",
-        end_date="2025-09-02",
+        start_date=datetime(2025, 9, 1),
+        end_date=datetime(2025, 9, 2),
         location="Nice",
         notes="Réunion initiale du projet",
     )
@@ -0,0 +1,79 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+from sqlalchemy import event
+
+from controllers import audit
+from controllers.user_controller import UserManager
+from models.users import User, Department
+
+
+def read_entries(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_audit_log_writes_batches_in_background(tmp_path):
+    path = tmp_path / "audit.log"
+    log = audit.AuditLog(str(path), buffer_size=2, batch_size=10, flush_interval=0.05)
+
+    for id_ in range(5):
+        log.record("delete", "clients", user_id=1, ids=[id_], count=1)
+    log.flush()
+
+    assert [entry["ids"] for entry in read_entries(path)] == [[0], [1], [2], [3], [4]]
+    log.record("update", "events", user_id=2, count=3, where="events.location = 'Lyon'")
+    log.close()
+    assert read_entries(path)[-1]["where"] == "events.location = 'Lyon'"
+
+
+def test_audit_log_forwards_a_sample_to_sentry(tmp_path):
+    log = audit.AuditLog(str(tmp_path / "audit.log"), flush_interval=0.05, sentry_sample_rate=1.0)
+
+    with patch("controllers.monitoring.capture_message") as mock_capture:
+        log.record("create", "users", user_id=1, ids=[7], count=1)
+        log.close()
+
+    mock_capture.assert_called_once_with(message="user 1 : create users : [7]")
+
+
+def test_audit_writer_survives_errors(tmp_path):
+    path = tmp_path / "audit.log"
+    log = audit.AuditLog(str(path), buffer_size=2, flush_interval=0.05, sentry_sample_rate=1.0)
+
+    with patch("controllers.monitoring.capture_exception") as mock_report:
+        with patch.object(log, "_forward", side_effect=RuntimeError("setup")):
+            log.record("create", "users", user_id=1, ids=[1], count=1)
+            log.flush()
+        log.record("update", "contracts", user_id=1, ids=[2], count=1, amount=Decimal("10.50"))
+        log.close()
+
+    mock_report.assert_called_once()
+    assert [entry["ids"] for entry in read_entries(path)] == [[1], [2]]
+    assert read_entries(path)[-1]["amount"] == "10.50"
+
+
+def test_ids_from_clause():
+    assert audit.ids_from_clause(User, User.id == 4) == [4]
+    assert audit.ids_from_clause(User, User.id.in_([1, 2])) == [1, 2]
+    assert audit.ids_from_clause(User, User.email == "a@b.c") is None
+
+
+def test_user_update_is_audited_without_select(test_db_session, setup_database, monkeypatch):
+    accounting = User(
+        first_name="Au", last_name="Dit", email="audit@epic.com", hashed_password="h", role=Department.ACCOUNTING
+    )
+    test_db_session.add(accounting)
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": accounting.id})
+    manager = UserManager(test_db_session)
+
+    statements = []
+    event.listen(test_db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with patch("controllers.base_controller.audit.record") as mock_record:
+        assert manager.update(User.id.in_([accounting.id]), first_name="Audit") == 1
+
+    assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+    mock_record.assert_called_once_with(
+        "update", "users", user_id=accounting.id, ids=[accounting.id], count=1, fields=["first_name"]
+    )
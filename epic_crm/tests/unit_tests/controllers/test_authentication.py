@@ -6,6 +6,10 @@ from unittest.mock import patch, MagicMock
 
 from controllers.authentication import (
     hash_password,
+    hash_passwords,
+    is_token_revoked,
+    password_rounds,
+    revoke_tokens,
     verify_password,
     create_access_token,
     decode_token,
@@ -70,6 +74,43 @@ def test_authenticate_user_success(monkeypatch):
     assert payload["user_id"] == 1
 
 
+def test_authenticate_user_rehashes_with_configured_cost(monkeypatch):
+    fake_user = User(id=1, email="test@example.com", hashed_password=hash_password("password123", rounds=4))
+    fake_user.role = Department.SALES
+    mock_session = MagicMock()
+    mock_session.query().filter_by().first.return_value = fake_user
+    monkeypatch.setattr("controllers.authentication.SessionLocal", lambda: mock_session)
+    monkeypatch.setattr("controllers.authentication.BCRYPT_ROUNDS", 5)
+
+    success, _ = authenticate_user("test@example.com", "password123")
+
+    assert success is True
+    assert password_rounds(fake_user.hashed_password) == 5
+    assert verify_password("password123", fake_user.hashed_password)
+    mock_session.commit.assert_called_once()
+
+
+def test_hash_passwords_keeps_order(monkeypatch):
+    monkeypatch.setattr("controllers.authentication.BCRYPT_ROUNDS", 4)
+
+    hashed = hash_passwords(["first", "second"], workers=1)
+
+    assert [password_rounds(h) for h in hashed] == [4, 4]
+    assert verify_password("second", hashed[1])
+    assert password_rounds("not a hash") is None
+
+
+def test_revoke_tokens_only_revokes_older_tokens(monkeypatch, tmp_path):
+    monkeypatch.setattr("controllers.authentication.REVOCATION_FILE", str(tmp_path / ".revoked"))
+
+    revoke_tokens([7])
+
+    assert is_token_revoked({"user_id": 7, "iat": 0})
+    assert is_token_revoked({"user_id": 7})
+    assert not is_token_revoked({"user_id": 7, "iat": 2**40})
+    assert not is_token_revoked({"user_id": 8, "iat": 0})
+
+
 def test_authenticate_user_failure(monkeypatch):
     mock_session = MagicMock()
     mock_session.query().filter_by().first.return_value = None
@@ -1,5 +1,6 @@
+import pytest
 from controllers.base_controller import BaseManager
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, Integer, event, select
 from models.base import Base
 
 
@@ -47,3 +48,45 @@ def test_delete_object(dummy_session):
     manager = FakeManager(session=dummy_session, model=FakeModel)
     manager.delete(FakeModel.id == 1)
     assert len(dummy_session.updated) == 1
+
+
+def test_scoped_write_runs_one_statement(test_db_session, savepoint_session, setup_database):
+    test_db_session.add_all([FakeModel(id=id_) for id_ in range(1, 6)])
+    test_db_session.flush()
+    statements = []
+    event.listen(test_db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    manager = FakeManager(session=test_db_session, model=FakeModel)
+    assert manager.scoped_delete(FakeModel.id.in_([1, 2]), FakeModel.id < 3) == 2
+    assert [statement.split()[0] for statement in statements] == ["DELETE"]
+
+    # The test data survives the rollback of a refusal in a savepoint session.
+    statements.clear()
+    manager = FakeManager(session=savepoint_session, model=FakeModel)
+    with pytest.raises(PermissionError, match="1 of the 2 targeted"):
+        manager.scoped_delete(FakeModel.id.in_([3, 4]), FakeModel.id < 4)
+    assert [statement.split()[0] for statement in statements] == ["SAVEPOINT", "DELETE", "ROLLBACK"]
+    assert test_db_session.scalars(select(FakeModel.id).order_by(FakeModel.id)).all() == [3, 4, 5]
+
+
+def test_keyset_pages(test_db_session, setup_database):
+    test_db_session.add_all([FakeModel(id=id_) for id_ in range(1, 8)])
+    test_db_session.flush()
+    manager = FakeManager(session=test_db_session, model=FakeModel)
+
+    first_page = manager.get_page(limit=3)
+    second_page = manager.get_page(limit=3, after=first_page[-1].id)
+    filtered_page = manager.get_page(FakeModel.id % 2 == 0, limit=3, after=2)
+
+    assert [obj.id for obj in first_page] == [1, 2, 3]
+    assert [obj.id for obj in second_page] == [4, 5, 6]
+    assert [obj.id for obj in filtered_page] == [4, 6]
+
+
+def test_iter_all_streams_in_batches(test_db_session, setup_database):
+    test_db_session.add_all([FakeModel(id=id_) for id_ in range(1, 8)])
+    test_db_session.flush()
+    manager = FakeManager(session=test_db_session, model=FakeModel)
+
+    assert [obj.id for obj in manager.iter_all(batch_size=2)] == list(range(1, 8))
+    assert [obj.id for obj in manager.iter_all(after=5, batch_size=2)] == [6, 7]
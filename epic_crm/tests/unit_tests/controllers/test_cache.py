@@ -0,0 +1,108 @@
+import pytest
+from decimal import Decimal
+from sqlalchemy import event
+
+from controllers.cache import RecordCache
+from controllers.client_controller import ClientsManager
+from models.clients import Client
+from models.contracts import Contract
+from models.users import Department, User
+
+
+@pytest.fixture
+def sales_client(test_db_session, setup_database):
+    sales = User(first_name="Cache", last_name="Sales", email="cache@test.com", hashed_password="pwd")
+    sales.role = Department.SALES
+    test_db_session.add(sales)
+    test_db_session.flush()
+    client = Client(full_name="Cached", email="cached@test.com", phone="0600000042", sales_contact_id=sales.id)
+    test_db_session.add(client)
+    test_db_session.commit()
+    ids = sales.id, client.id
+    test_db_session.expunge_all()
+    return ids
+
+
+def count_statements(session):
+    statements = []
+
+    @event.listens_for(session.connection(), "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+def test_cache_serves_lookups_without_query(test_db_session, sales_client):
+    sales_id, _ = sales_client
+    cache = RecordCache(size=10, ttl=60)
+    statements = count_statements(test_db_session)
+
+    assert cache.get(test_db_session, User, sales_id).email == "cache@test.com"
+    test_db_session.expunge_all()
+    user = cache.get(test_db_session, User, sales_id)
+
+    assert user.role == Department.SALES
+    assert len(statements) == 1
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 1, "size": 1}
+    # Excluded from the cache, loaded when read.
+    assert user.hashed_password == "pwd"
+    assert len(statements) == 2
+
+
+def test_disk_tier_is_shared_between_caches(test_db_session, sales_client, tmp_path):
+    sales_id, _ = sales_client
+    RecordCache(ttl=60, path=str(tmp_path / "cache.db")).get(test_db_session, User, sales_id)
+    test_db_session.expunge_all()
+
+    other = RecordCache(ttl=60, path=str(tmp_path / "cache.db"))
+    user = other.get(test_db_session, User, sales_id)
+
+    assert other.disk_hits == 1 and other.misses == 0
+    assert user.role == Department.SALES
+
+
+def test_disk_tier_keeps_exact_amounts(test_db_session, sales_client, tmp_path):
+    sales_id, client_id = sales_client
+    contract = Contract(client_id=client_id, sales_contact_id=sales_id, total_amount="10.10", to_be_paid=0.2)
+    test_db_session.add(contract)
+    test_db_session.commit()
+    test_db_session.expunge_all()
+    RecordCache(ttl=60, path=str(tmp_path / "cache.db")).get(test_db_session, Contract, contract.id)
+    test_db_session.expunge_all()
+
+    cached = RecordCache(ttl=60, path=str(tmp_path / "cache.db")).get(test_db_session, Contract, contract.id)
+
+    assert (cached.total_amount, cached.to_be_paid) == (Decimal("10.10"), Decimal("0.20"))
+
+
+def test_cache_entries_expire_and_are_evicted(test_db_session, sales_client, monkeypatch):
+    sales_id, client_id = sales_client
+    now = [100.0]
+    monkeypatch.setattr("controllers.cache.time.monotonic", lambda: now[0])
+    cache = RecordCache(size=1, ttl=5)
+
+    cache.get(test_db_session, User, sales_id)
+    cache.get(test_db_session, Client, client_id)
+    test_db_session.expunge_all()
+    cache.get(test_db_session, User, sales_id)
+    assert cache.misses == 3
+
+    test_db_session.expunge_all()
+    now[0] += 10
+    cache.get(test_db_session, User, sales_id)
+    assert cache.misses == 4 and cache.hits == 0
+
+
+def test_manager_writes_invalidate_cache(test_db_session, sales_client, monkeypatch):
+    _, client_id = sales_client
+    cache = RecordCache(ttl=60)
+    monkeypatch.setattr("controllers.base_controller.get_record_cache", lambda: cache)
+    cache.get(test_db_session, Client, client_id)
+    test_db_session.expunge_all()
+
+    ClientsManager(test_db_session).scoped_update(Client.id == client_id, None, enterprise="Renamed")
+    test_db_session.expunge_all()
+
+    assert cache.get(test_db_session, Client, client_id).enterprise == "Renamed"
+    assert cache.misses == 2
@@ -1,4 +1,6 @@
 import pytest
+from sqlalchemy import event
+from datetime import datetime
 from controllers.cascade_controller import CascadeResolver
 from models.users import User, Department
 from models.clients import Client
@@ -39,8 +41,8 @@ def test_resolve_user_cascade(test_db_session, setup_database):
 
     event = Event(
         event_name="Test Event",
-        start_date="2025-01-01",
-        end_date="2025-01-02",
+        start_date=datetime(2025, 1, 1),
+        end_date=datetime(2025, 1, 2),
         location="Paris",
         attendees=20,
         notes="Préparation",
@@ -74,3 +76,107 @@ def test_resolve_clients_cascade(test_db_session, setup_database):
     assert cascade
     assert any(d.title == "CONTRACTS" for d in cascade)
     assert any(d.title == "EVENTS" for d in cascade)
+
+
+def test_user_cascade_lists_each_record_once(test_db_session, setup_database):
+    user = User(first_name="A", last_name="B", email="once@sales.com", hashed_password="h", role=Department.SALES)
+    test_db_session.add(user)
+    test_db_session.flush()
+    clients = [
+        Client(
+            full_name=f"Client {i}",
+            email=f"once{i}@client.com",
+            phone=f"07000000{i:02d}",
+            enterprise="Corp",
+            sales_contact_id=user.id,
+        )
+        for i in range(3)
+    ]
+    test_db_session.add_all(clients)
+    test_db_session.flush()
+    contracts = [
+        Contract(client_id=client.id, sales_contact_id=user.id, total_amount=10, to_be_paid=0, is_signed=True)
+        for client in clients
+    ]
+    test_db_session.add_all(contracts)
+    test_db_session.flush()
+    test_db_session.add_all(
+        [
+            Event(
+                event_name="Event",
+                start_date=datetime(2025, 1, 1),
+                end_date=datetime(2025, 1, 2),
+                location="Lyon",
+                attendees=10,
+                notes="",
+                contract_id=contract.id,
+                support_contact_id=user.id,
+                client_id=contract.client_id,
+            )
+            for contract in contracts
+        ]
+    )
+    test_db_session.flush()
+
+    statements = []
+    event.listen(test_db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    cascade = {d.title: d.objects for d in CascadeResolver(test_db_session).resolve_user_cascade([user])}
+
+    assert len(cascade["CLIENTS"]) == 3
+    assert len(cascade["CONTRACTS"]) == 3
+    assert len(cascade["EVENTS"]) == 3
+    assert len(statements) == 5
+
+
+def test_summarize_user_cascade_counts_without_loading(test_db_session, setup_database):
+    user = User(first_name="C", last_name="D", email="count@sales.com", hashed_password="h", role=Department.SALES)
+    test_db_session.add(user)
+    test_db_session.flush()
+    client = Client(
+        full_name="Counted", email="counted@client.com", phone="0710000000", enterprise="Corp", sales_contact_id=user.id
+    )
+    test_db_session.add(client)
+    test_db_session.flush()
+    contracts = [
+        Contract(client_id=client.id, sales_contact_id=user.id, total_amount=10, to_be_paid=0, is_signed=True)
+        for _ in range(4)
+    ]
+    test_db_session.add_all(contracts)
+    test_db_session.flush()
+    test_db_session.add_all(
+        [
+            Event(
+                event_name="Event",
+                start_date=datetime(2025, 1, 1),
+                end_date=datetime(2025, 1, 2),
+                location="Lyon",
+                attendees=10,
+                notes="",
+                contract_id=contract.id,
+                support_contact_id=user.id,
+                client_id=client.id,
+            )
+            for contract in contracts
+        ]
+    )
+    test_db_session.commit()
+    test_db_session.expunge_all()
+
+    statements = []
+    event.listen(test_db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    resolver = CascadeResolver(test_db_session)
+    summary = resolver.summarize_user_cascade(User.id == user.id)
+
+    assert [(count.title, count.count) for count in summary] == [
+        ("USERS", 1),
+        ("CLIENTS", 1),
+        ("CONTRACTS", 4),
+        ("EVENTS", 4),
+    ]
+    assert len(statements) == 1
+    assert len(test_db_session.identity_map) == 0
+
+    first_page = resolver.get_cascade_page(summary[2], limit=3)
+    second_page = resolver.get_cascade_page(summary[2], limit=3, after=first_page.objects[-1].id)
+    assert len(first_page.objects) == 3
+    assert len(second_page.objects) == 1
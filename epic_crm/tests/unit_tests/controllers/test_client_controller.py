@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import select
 from unittest.mock import patch
 from controllers.client_controller import ClientsManager
 from models.users import Department, User
@@ -68,7 +69,6 @@ def test_get_clients_with_clause(mock_sessionlocal, dummy_session, mock_auth_sal
 
 @patch("controllers.permissions.SessionLocal")
 def test_update_own_client(mock_sessionlocal, dummy_session, mock_auth_sales, sales_user):
-    dummy_session.scalar_return_value = sales_user
     dummy_session.get_return_value = sales_user
     mock_sessionlocal.return_value = dummy_session
 
@@ -81,18 +81,32 @@ def test_update_own_client(mock_sessionlocal, dummy_session, mock_auth_sales, sa
     assert len(dummy_session.updated) == 1
 
 
-@patch("controllers.permissions.SessionLocal")
-def test_update_other_sales_client_forbidden(mock_sessionlocal, dummy_session, mock_auth_sales, sales_user):
-    dummy_session.scalar_return_value = sales_user
-    dummy_session.get_return_value = sales_user
-    mock_sessionlocal.return_value = dummy_session
-
-    client = Client(id=4, sales_contact_id=99)  # Différent de l’ID user
-    dummy_session.data = [client]
+def test_update_other_sales_client_forbidden(test_db_session, savepoint_session, setup_database, monkeypatch):
+    sales = User(email="own@epic.com", role=Department.SALES, first_name="O", last_name="W", hashed_password="pwd")
+    other = User(email="other@epic.com", role=Department.SALES, first_name="O", last_name="T", hashed_password="pwd")
+    test_db_session.add_all([sales, other])
+    test_db_session.flush()
+    own_client = Client(
+        email="mine@corp.com", full_name="Mine", phone="0611111111", enterprise="A", sales_contact_id=sales.id
+    )
+    other_client = Client(
+        email="theirs@corp.com", full_name="Theirs", phone="0622222222", enterprise="B", sales_contact_id=other.id
+    )
+    test_db_session.add_all([own_client, other_client])
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": sales.id})
 
-    manager = ClientsManager(dummy_session)
+    manager = ClientsManager(savepoint_session)
     with pytest.raises(PermissionError):
-        manager.update(Client.id == 4, phone="0609876543")
+        manager.update(Client.id.in_([own_client.id, other_client.id]), phone="0609876543")
+
+    phones = test_db_session.scalars(select(Client.phone).order_by(Client.id)).all()
+    assert phones == ["0611111111", "0622222222"]
+    assert manager.update(Client.id == own_client.id, phone="0609876543") == 1
+
+    rows = [tuple(row) for row in manager.get_my_client_rows(fields=["id", "full_name"])]
+    assert rows == [(own_client.id, "Mine")]
+    assert [row.id for row in manager.filter_rows_by_name("The")] == [other_client.id]
 
 
 @patch("controllers.permissions.SessionLocal")
@@ -108,3 +122,24 @@ def test_delete_client(mock_sessionlocal, dummy_session, mock_auth_sales, sales_
     manager.delete(Client.id == 1)
 
     assert len(dummy_session.updated) == 1
+
+
+def test_create_many_reports_failed_rows(test_db_session, setup_database, monkeypatch):
+    sales = User(email="bulk@epic.com", role=Department.SALES, first_name="B", last_name="K", hashed_password="pwd")
+    test_db_session.add(sales)
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": sales.id})
+
+    rows = [
+        {"email": "one@corp.com", "full_name": "One", "phone": "0600000001", "enterprise": "A"},
+        {"email": "two@corp.com", "full_name": "Two", "phone": "0600000002", "enterprise": "A"},
+        {"email": "one@corp.com", "full_name": "Duplicate", "phone": "0600000003", "enterprise": "A"},
+        {"email": "four@corp.com", "full_name": "Four"},
+        {"email": "five@corp.com", "full_name": "Five", "phone": "0600000005", "enterprise": "A"},
+    ]
+    result = ClientsManager(test_db_session).create_many(rows, chunk_size=2)
+
+    assert result.created == 3
+    assert [index for index, _ in result.failures] == [2, 3]
+    emails = test_db_session.scalars(select(Client.email).where(Client.sales_contact_id == sales.id)).all()
+    assert sorted(emails) == ["five@corp.com", "one@corp.com", "two@corp.com"]
@@ -1,5 +1,8 @@
 import pytest
+from decimal import Decimal
 from unittest.mock import patch
+from datetime import datetime, timedelta
+from sqlalchemy import event, select, update
 from controllers.contract_controller import ContractsManager
 from models.contracts import Contract
 from models.clients import Client
@@ -83,7 +86,6 @@ def test_get_with_clause(mock_sessionlocal, dummy_session, mock_auth_sales, sale
 @patch("controllers.permissions.SessionLocal")
 def test_update_contract(mock_sessionlocal, dummy_session, sales_user, mock_auth_sales):
     dummy_session.get_return_value = sales_user
-    dummy_session.scalar_return_value = sales_user
     mock_sessionlocal.return_value = dummy_session
 
     contract = Contract(id=3, client_id=1, sales_contact_id=2, total_amount=3000, to_be_paid=1500, is_signed=False)
@@ -96,7 +98,6 @@ def test_update_contract(mock_sessionlocal, dummy_session, sales_user, mock_auth
 @patch("controllers.permissions.SessionLocal")
 def test_delete_contract(mock_sessionlocal, dummy_session, sales_user, mock_auth_sales):
     dummy_session.get_return_value = sales_user
-    dummy_session.scalar_return_value = sales_user
     mock_sessionlocal.return_value = dummy_session
 
     contract = Contract(id=4, client_id=1, sales_contact_id=2, total_amount=1500, to_be_paid=0, is_signed=True)
@@ -104,3 +105,139 @@ def test_delete_contract(mock_sessionlocal, dummy_session, sales_user, mock_auth
     manager = ContractsManager(dummy_session)
     manager.delete(Contract.id == 4)
     assert len(dummy_session.updated) == 1
+
+
+@patch("controllers.permissions.SessionLocal")
+def test_create_many_contracts(mock_sessionlocal, dummy_session, sales_user, client_for_contract, mock_auth_sales):
+    other_client = Client(id=2, sales_contact_id=99)
+    dummy_session.data = [sales_user, client_for_contract, other_client]
+    mock_sessionlocal.return_value = dummy_session
+
+    manager = ContractsManager(dummy_session)
+    result = manager.create_many(
+        [
+            {"client_id": 1, "total_amount": 1000.0, "to_be_paid": 500, "is_signed": True},
+            {"client_id": 2, "total_amount": 2000.0, "to_be_paid": 0, "is_signed": True},
+            {"client_id": 3, "total_amount": 3000.0, "to_be_paid": 0, "is_signed": False},
+        ]
+    )
+
+    assert result.created == 1
+    assert [index for index, _ in result.failures] == [1, 2]
+    assert len(dummy_session.updated) == 1
+
+
+def test_create_many_loads_clients_once_per_chunk(test_db_session, setup_database, monkeypatch):
+    sales, other = (
+        User(email=f"{name}@epic.com", role=Department.SALES, first_name="S", last_name=name, hashed_password="p")
+        for name in ("bulk", "other")
+    )
+    test_db_session.add_all([sales, other])
+    test_db_session.flush()
+    clients = [
+        Client(full_name=f"Bulk {i}", email=f"bulk{i}@corp.com", phone=f"060000010{i}", sales_contact_id=owner.id)
+        for i, owner in enumerate([sales, sales, sales, other])
+    ]
+    test_db_session.add_all(clients)
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": sales.id})
+    client_ids = [client.id for client in clients] + [max(client.id for client in clients) + 1]
+    test_db_session.expunge_all()
+
+    statements = []
+
+    @event.listens_for(test_db_session.connection(), "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    result = ContractsManager(test_db_session).create_many(
+        [{"client_id": id_, "total_amount": 100, "to_be_paid": 100, "is_signed": False} for id_ in client_ids],
+        chunk_size=10,
+    )
+
+    assert result.created == 3
+    assert [index for index, _ in result.failures] == [3, 4]
+    client_selects = [s for s in statements if s.lstrip().startswith("SELECT") and "FROM clients" in s]
+    assert len(client_selects) == 1
+    assert " IN " in client_selects[0]
+
+
+@pytest.fixture
+def unpaid_contracts(test_db_session, setup_database, monkeypatch):
+    accounting = User(email="pay@epic.com", role=Department.ACCOUNTING, first_name="P", last_name="Y")
+    accounting.hashed_password = "p"
+    sales = User(email="paid@epic.com", role=Department.SALES, first_name="P", last_name="D", hashed_password="p")
+    test_db_session.add_all([accounting, sales])
+    test_db_session.flush()
+    client = Client(full_name="Payer", email="payer@corp.com", phone="0600000077", sales_contact_id=sales.id)
+    test_db_session.add(client)
+    test_db_session.flush()
+    contracts = [
+        Contract(client_id=client.id, sales_contact_id=sales.id, total_amount=1000, to_be_paid=500, is_signed=True),
+        Contract(client_id=client.id, sales_contact_id=sales.id, total_amount=2000, to_be_paid=300, is_signed=True),
+    ]
+    test_db_session.add_all(contracts)
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": accounting.id})
+    return [contract.id for contract in contracts]
+
+
+def remaining(session, ids):
+    return session.scalars(select(Contract.to_be_paid).where(Contract.id.in_(ids)).order_by(Contract.id)).all()
+
+
+def test_record_payment_rejects_overpayment(test_db_session, unpaid_contracts):
+    manager = ContractsManager(test_db_session)
+    manager.record_payment(unpaid_contracts[0], 200)
+
+    with pytest.raises(ValueError, match="300"):
+        manager.record_payment(unpaid_contracts[0], 301)
+    with pytest.raises(ValueError, match="introuvable"):
+        manager.record_payment(-1, 10)
+    with pytest.raises(ValueError):
+        manager.record_payment(unpaid_contracts[0], 0)
+    with pytest.raises(ValueError, match="0.01"):
+        manager.record_payment(unpaid_contracts[0], Decimal("0.004"))
+
+    assert remaining(test_db_session, unpaid_contracts) == [300, 300]
+
+
+def test_record_payments_reports_rejected_payments(test_db_session, unpaid_contracts):
+    first, second = unpaid_contracts
+    payments = [(first, 100), (second, 300), (first, 450), (-1, 5), (first, 400), (second, -1)]
+
+    result = ContractsManager(test_db_session).record_payments(payments, chunk_size=3)
+
+    assert result.recorded == 3
+    assert sorted(index for index, _ in result.failures) == [2, 3, 5]
+    assert remaining(test_db_session, unpaid_contracts) == [0, 0]
+
+
+def test_get_totals_sums_in_database(test_db_session, unpaid_contracts):
+    manager = ContractsManager(test_db_session)
+    manager.record_payment(unpaid_contracts[1], 0.1)
+    where = Contract.id.in_(unpaid_contracts)
+
+    (total,) = manager.get_totals(where)
+    by_contract = manager.get_totals(where, group_by="is_signed")
+
+    assert (total.contracts, total.total_amount, total.to_be_paid) == (2, Decimal("3000.00"), Decimal("799.90"))
+    assert [(row.is_signed, row.contracts) for row in by_contract] == [(True, 2)]
+    with pytest.raises(ValueError):
+        manager.get_totals(where, group_by="id")
+
+
+def test_get_receivables_buckets_by_age(test_db_session, unpaid_contracts):
+    first, second = unpaid_contracts
+    as_of = datetime(2025, 6, 30, 12)
+    for contract_id, age in ((first, 31), (second, 95)):
+        created = as_of - timedelta(days=age)
+        test_db_session.execute(update(Contract).where(Contract.id == contract_id).values(creation_date=created))
+    test_db_session.commit()
+    sales_id = test_db_session.get(Contract, first).sales_contact_id
+
+    rows = ContractsManager(test_db_session).get_receivables("sales_contact_id", as_of=as_of)
+    (row,) = [row for row in rows if row.sales_contact_id == sales_id]
+
+    assert (row.contracts, row.to_be_paid) == (2, Decimal("800.00"))
+    assert (row.days_0_30, row.days_31_60, row.days_61_90, row.days_over_90) == (0, 500, 0, 300)
@@ -84,7 +84,6 @@ def test_get_all_events(mock_sessionlocal, dummy_session, support_user, mock_aut
 
 @patch("controllers.permissions.SessionLocal")
 def test_update_event(mock_sessionlocal, dummy_session, support_user, mock_auth_support):
-    dummy_session.scalar_return_value = support_user
     dummy_session.get_return_value = support_user
     mock_sessionlocal.return_value = dummy_session
 
@@ -106,7 +105,6 @@ def test_update_event(mock_sessionlocal, dummy_session, support_user, mock_auth_
 
 @patch("controllers.permissions.SessionLocal")
 def test_delete_event(mock_sessionlocal, dummy_session, support_user, mock_auth_support):
-    dummy_session.scalar_return_value = support_user
     dummy_session.get_return_value = support_user
     mock_sessionlocal.return_value = dummy_session
 
@@ -0,0 +1,56 @@
+import pytest
+from decimal import Decimal
+from controllers.contract_controller import ContractsManager
+from controllers.filters import parse_condition, parse_order_by, parse_fields, parse_query
+from models.clients import Client
+from models.contracts import Contract
+from models.users import User, Department
+
+
+def test_parse_condition_converts_values():
+    assert parse_condition(Contract, "to_be_paid>=100.5").right.value == Decimal("100.5")
+    assert str(parse_condition(Contract, "is_signed=oui")) == "contracts.is_signed = true"
+    assert parse_condition(User, "role=sales").right.value == Department.SALES
+
+
+def test_parse_condition_refuses_unknown_fields_and_values():
+    with pytest.raises(ValueError, match="Champ inconnu"):
+        parse_condition(User, "hashed_password=x")
+    with pytest.raises(ValueError, match="Valeur invalide"):
+        parse_condition(Contract, "client_id=abc")
+    with pytest.raises(ValueError, match="Condition invalide"):
+        parse_condition(Contract, "client_id; DROP TABLE contracts")
+
+
+def test_parse_order_by_and_fields():
+    assert [str(clause) for clause in parse_order_by(Contract, "-to_be_paid, id")] == [
+        "contracts.to_be_paid DESC",
+        "contracts.id ASC",
+    ]
+    assert parse_fields(Contract, "id, to_be_paid") == ["id", "to_be_paid"]
+    assert parse_query(Contract) == (None, None, None)
+
+
+def test_get_rows_filters_and_sorts_in_sql(test_db_session, setup_database, monkeypatch):
+    user = User(email="dsl@epic.com", role=Department.ACCOUNTING, first_name="D", last_name="S", hashed_password="h")
+    test_db_session.add(user)
+    test_db_session.flush()
+    client = Client(email="dsl@corp.com", full_name="Dsl", phone="0630000000", enterprise="A", sales_contact_id=user.id)
+    test_db_session.add(client)
+    test_db_session.flush()
+    test_db_session.add_all(
+        [
+            Contract(client_id=client.id, sales_contact_id=user.id, total_amount=100, to_be_paid=amount, is_signed=True)
+            for amount in (0, 30, 70)
+        ]
+    )
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": user.id})
+
+    where_clause, order_by, fields = parse_query(
+        Contract, [f"client_id={client.id}", "to_be_paid>0"], "-to_be_paid", "to_be_paid"
+    )
+    rows = list(ContractsManager(test_db_session).get_rows(where_clause, fields=fields, order_by=order_by))
+
+    assert [row.to_be_paid for row in rows] == [70, 30]
+    assert rows[0]._fields == ("to_be_paid",)
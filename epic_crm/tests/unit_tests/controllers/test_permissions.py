@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock
-from controllers.permissions import resolve_permission, permission_required
+from sqlalchemy import event
+from controllers.event_controller import EventsManager
+from controllers.permissions import resolve_permission, permission_required, get_security_context
 from models.users import Department, User
 
 
@@ -82,3 +84,99 @@ def test_permission_required_decorator_denied(monkeypatch, mock_auth_support, mo
 
     with pytest.raises(PermissionError, match="Permission denied"):
         protected_func(4)
+
+
+def count_statements(connection):
+    statements = []
+
+    @event.listens_for(connection, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+def test_security_context_resolves_principal_once(monkeypatch, mock_user_sales):
+    session = MagicMock()
+    session.info = {}
+    session.get.return_value = mock_user_sales
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": 2})
+
+    context = get_security_context(session)
+
+    assert context.has_role([Department.SALES])
+    assert context.has_role(Department)
+    assert context.get_user() is mock_user_sales
+    assert get_security_context(session) is context
+    session.get.assert_called_once_with(User, 2)
+
+
+def test_security_context_follows_new_login(monkeypatch, mock_user_sales, mock_user_support):
+    session = MagicMock()
+    session.info = {}
+    session.get.side_effect = lambda model, user_id: {2: mock_user_sales, 3: mock_user_support}[user_id]
+    payload = {"user_id": 2}
+    signature = ["first-token"]
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: dict(payload))
+    monkeypatch.setattr("controllers.permissions.token_file_signature", lambda: signature[0])
+
+    context = get_security_context(session)
+    assert context.get_user() is mock_user_sales
+
+    payload["user_id"] = 3
+    signature[0] = "second-token"
+    assert context.get_user() is mock_user_support
+
+
+def test_query_count_per_command(test_db_session, setup_database, monkeypatch):
+    support = User(
+        first_name="Query", last_name="Count", email="count@test.com", hashed_password="pwd", role=Department.SUPPORT
+    )
+    test_db_session.add(support)
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": support.id})
+    test_db_session.expunge_all()
+
+    statements = count_statements(test_db_session.connection())
+    # get_my_events -> decorator -> get_authenticated_user -> get -> decorator
+    EventsManager(test_db_session).get_my_events()
+
+    assert len(statements) == 2
+    assert "FROM users" in statements[0]
+    assert "FROM events" in statements[1]
+
+
+def test_trusted_role_claim_skips_user_lookup_for_reads(monkeypatch, tmp_path):
+    session = MagicMock()
+    session.info = {}
+    session.get.return_value = None
+    payload = {"user_id": 2, "role": "SALES", "iat": 1000}
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: payload)
+    monkeypatch.setattr("controllers.permissions.TRUST_ROLE_CLAIM", True)
+    monkeypatch.setattr("controllers.authentication.REVOCATION_FILE", str(tmp_path / ".revoked"))
+
+    context = get_security_context(session)
+
+    assert context.has_role([Department.SALES], read_only=True)
+    assert not context.has_role([Department.SUPPORT], read_only=True)
+    session.get.assert_not_called()
+    # Writes check the role stored in the database (the user does not exist here).
+    assert not context.has_role([Department.SALES])
+    session.get.assert_called_once_with(User, 2)
+
+
+def test_revoked_token_falls_back_to_database(monkeypatch, tmp_path, mock_user_support):
+    from controllers.authentication import revoke_tokens
+
+    session = MagicMock()
+    session.info = {}
+    session.get.return_value = mock_user_support
+    payload = {"user_id": 3, "role": "SALES"}
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: payload)
+    monkeypatch.setattr("controllers.permissions.TRUST_ROLE_CLAIM", True)
+    monkeypatch.setattr("controllers.authentication.REVOCATION_FILE", str(tmp_path / ".revoked"))
+
+    revoke_tokens([3])
+
+    assert not get_security_context(session).has_role([Department.SALES], read_only=True)
+    session.get.assert_called_once_with(User, 3)
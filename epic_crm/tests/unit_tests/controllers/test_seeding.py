@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import func, select
+
+from controllers.database_controller import create_database_engine
+from controllers.seeding import DatasetSeeder
+from models.base import Base
+from models.clients import Client
+from models.contracts import Contract
+from models.events import Event
+from models.users import Department, User
+
+
+def seeded_engine(path, seed=0, **counts):
+    engine = create_database_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    report = DatasetSeeder(engine, seed=seed, chunk_size=7).run(**counts)
+    return engine, report
+
+
+def dump(engine):
+    # Timestamps come from the database and bcrypt salts are random.
+    ignored = ("creation_date", "last_update", "hashed_password")
+    with engine.connect() as connection:
+        return {
+            model.__tablename__: connection.execute(
+                select(*[c for c in model.__table__.c if c.name not in ignored]).order_by(model.id)
+            ).all()
+            for model in (User, Client, Contract, Event)
+        }
+
+
+def test_seed_is_deterministic_and_consistent(tmp_path):
+    counts = {"users": 10, "clients": 30, "contracts": 40, "events": 25}
+    engine, report = seeded_engine(tmp_path / "a.db", seed=42, **counts)
+    other, _ = seeded_engine(tmp_path / "b.db", seed=42, **counts)
+    different, _ = seeded_engine(tmp_path / "c.db", seed=7, **counts)
+
+    assert report.rows == 105
+    assert report.tables["events"][0] == 25
+    assert dump(engine) == dump(other)
+    assert dump(engine)["clients"] != dump(different)["clients"]
+
+    with engine.connect() as connection:
+        assert connection.execute(select(func.count(func.distinct(Client.phone)))).scalar() == 30
+        roles = dict(connection.execute(select(User.id, User.role)).all())
+        clients = dict(connection.execute(select(Client.id, Client.sales_contact_id)).all())
+        contracts = {row.id: row for row in connection.execute(select(Contract)).all()}
+        events = connection.execute(select(Event)).all()
+
+    assert {roles[sales_id] for sales_id in clients.values()} == {Department.SALES}
+    assert all(contract.sales_contact_id == clients[contract.client_id] for contract in contracts.values())
+    assert {contract.is_signed for contract in contracts.values()} == {True, False}
+    for event in events:
+        assert contracts[event.contract_id].is_signed
+        assert event.client_id == contracts[event.contract_id].client_id
+        assert event.support_contact_id is None or roles[event.support_contact_id] == Department.SUPPORT
+
+
+def test_seed_appends_after_existing_rows(tmp_path):
+    engine, _ = seeded_engine(tmp_path / "a.db", users=5, clients=3)
+    DatasetSeeder(engine, chunk_size=2).run(clients=4)
+
+    with engine.connect() as connection:
+        assert connection.execute(select(func.count(func.distinct(Client.email)))).scalar() == 7
+
+
+def test_seed_requires_sales_users(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'a.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    with pytest.raises(ValueError):
+        DatasetSeeder(engine).run(clients=1)
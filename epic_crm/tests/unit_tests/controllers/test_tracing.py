@@ -0,0 +1,49 @@
+import json
+from click.testing import CliRunner
+from sqlalchemy import select
+
+from controllers.tracing import QueryTrace, percentile, statement_shape
+from models.users import User
+
+
+def test_statement_shape_collapses_parameter_lists():
+    first = statement_shape("SELECT id FROM events\n WHERE events.contract_id IN (?, ?, ?)")
+    second = statement_shape("SELECT id FROM events WHERE events.contract_id IN (%s, %s)")
+    assert first == "SELECT id FROM events WHERE events.contract_id IN (?)"
+    assert second == "SELECT id FROM events WHERE events.contract_id IN (?)"
+
+
+def test_percentile():
+    assert percentile([], 95) == 0.0
+    assert percentile([float(value) for value in range(1, 101)], 95) == 95.0
+
+
+def test_trace_reports_repeated_statements(test_db_session, setup_database, tmp_path):
+    trace = QueryTrace()
+    trace.start()
+    try:
+        for user_id in range(1, 4):
+            test_db_session.execute(select(User.email).where(User.id == user_id)).all()
+        test_db_session.execute(select(User.id)).all()
+    finally:
+        trace.stop()
+    test_db_session.execute(select(User.id)).all()
+
+    report = trace.to_dict("list-users")
+    assert report["statements"] == 4
+    assert report["n_plus_one"] == [{"statement": report["shapes"][0]["statement"], "count": 3}]
+    assert "N+1 suspect (3×)" in trace.summary()[1]
+
+    trace.export(str(tmp_path / "trace.json"), command="list-users")
+    assert json.loads((tmp_path / "trace.json").read_text())["command"] == "list-users"
+
+
+def test_trace_option_reports_on_stderr(tmp_path, monkeypatch):
+    from main import cli
+
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner(mix_stderr=False).invoke(cli, ["--trace", "--trace-json", "trace.json", "logout"])
+
+    assert result.exit_code == 0
+    assert "SQL : 0 requête(s)" in result.stderr
+    assert json.loads((tmp_path / "trace.json").read_text())["command"] == "logout"
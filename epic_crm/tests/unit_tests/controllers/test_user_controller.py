@@ -1,3 +1,4 @@
+import pytest
 from controllers.user_controller import UserManager
 from models.users import Department, User
 from unittest.mock import patch
@@ -12,7 +13,12 @@ def test_user_creation(dummy_session):
 
 def test_user_get_all(dummy_session, mock_auth_accounting):
     user = User(
-        first_name="Jane", last_name="Doe", email="jane@doe.com", hashed_password="hash", role=Department.ACCOUNTING
+        id=1,
+        first_name="Jane",
+        last_name="Doe",
+        email="jane@doe.com",
+        hashed_password="hash",
+        role=Department.ACCOUNTING,
     )
     dummy_session.data = [user]
     manager = UserManager(dummy_session)
@@ -30,16 +36,12 @@ def test_user_get_with_clause(dummy_session, mock_auth_accounting):
     assert results == [user]
 
 
-@patch(
-    "controllers.user_controller.get_current_user_token_payload",
-    return_value={"user_id": 1, "email": "acc@test.com", "role": "ACCOUNTING"},
-)
 @patch(
     "controllers.permissions.get_current_user_token_payload",
     return_value={"user_id": 1, "email": "acc@test.com", "role": "ACCOUNTING"},
 )
-@patch("controllers.user_controller.capture_message")  # pour éviter les erreurs de Sentry
-def test_user_update(_, __, ___, dummy_session):
+@patch("controllers.base_controller.audit.record")
+def test_user_update(mock_record, _, dummy_session):
     dummy_session.data = [
         User(
             id=1,
@@ -54,9 +56,47 @@ def test_user_update(_, __, ___, dummy_session):
     manager = UserManager(dummy_session)
     manager.update(User.id == 1, email="new@mail.com")
     assert len(dummy_session.updated) == 1
+    mock_record.assert_called_once_with("update", "users", user_id=1, ids=[1], count=1, fields=["email"])
 
 
 def test_user_delete(dummy_session, mock_auth_accounting):
+    dummy_session.data = [
+        User(
+            id=1, first_name="A", last_name="C", email="acc@test.com", hashed_password="pwd", role=Department.ACCOUNTING
+        )
+    ]
     manager = UserManager(dummy_session)
     manager.delete(User.id == 1)
     assert len(dummy_session.updated) == 1
+
+
+def test_user_get_rows_projects_headers(test_db_session, setup_database, monkeypatch):
+    accounting = User(
+        first_name="Ada", last_name="Row", email="ada@rows.com", hashed_password="h", role=Department.ACCOUNTING
+    )
+    support = User(
+        first_name="Bob", last_name="Row", email="bob@rows.com", hashed_password="h", role=Department.SUPPORT
+    )
+    test_db_session.add_all([accounting, support])
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": accounting.id})
+
+    manager = UserManager(test_db_session)
+    rows = manager.get_rows(User.email.like("%@rows.com"), limit=10)
+    streamed = list(manager.get_rows(User.email.like("%@rows.com"), fields=["id", "full_name"], batch_size=1))
+
+    assert [row.full_name for row in rows] == ["Ada Row", "Bob Row"]
+    assert rows[1].role == Department.SUPPORT
+    assert rows[0]._fields == tuple(User.HEADERS)
+    assert [tuple(row) for row in streamed] == [(accounting.id, "Ada Row"), (support.id, "Bob Row")]
+
+
+def test_user_get_rows_rejects_unknown_field(dummy_session, mock_auth_accounting):
+    dummy_session.data = [
+        User(
+            id=1, first_name="A", last_name="C", email="acc@test.com", hashed_password="pwd", role=Department.ACCOUNTING
+        )
+    ]
+    manager = UserManager(dummy_session)
+    with pytest.raises(ValueError):
+        manager.get_rows(fields=["id", "hashed_password"])
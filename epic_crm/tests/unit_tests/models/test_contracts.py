@@ -1,3 +1,6 @@
+from decimal import Decimal
+from sqlalchemy import create_engine, func, select
+from models.base import Base
 from models.contracts import Contract
 
 
@@ -17,3 +20,41 @@ def test_contract_to_list():
     assert result[2] == 5000.0
     assert result[3] == 1000.0
     assert result[4] is True
+
+
+def test_amounts_are_exact():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        rows = [
+            {"id": n, "total_amount": 0.1, "to_be_paid": "0.105", "client_id": 1, "sales_contact_id": 1}
+            for n in range(1, 11)
+        ]
+        connection.execute(Contract.__table__.insert(), rows)
+        sums = select(func.sum(Contract.total_amount), func.sum(Contract.to_be_paid))
+        total, remaining = connection.execute(sums).one()
+        unpaid = connection.execute(select(func.count()).where(Contract.to_be_paid > Decimal("0.10"))).scalar()
+
+    assert total == Decimal("1.00")
+    assert remaining == Decimal("1.10")
+    assert unpaid == 10
+    assert Contract(to_be_paid=Decimal("0.00")).is_fully_paid
+
+
+def test_amounts_scaled_by_a_number():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            Contract.__table__.insert(),
+            [{"id": 1, "total_amount": "10.00", "to_be_paid": "4.00", "client_id": 1, "sales_contact_id": 1}],
+        )
+        doubled, third, remaining = connection.execute(
+            select(Contract.total_amount * 2, Contract.total_amount / 3, Contract.total_amount - Contract.to_be_paid)
+        ).one()
+        over_half = connection.execute(select(func.count()).where(Contract.to_be_paid * 2 > Decimal("7.50"))).scalar()
+
+    assert doubled == Decimal("20.00")
+    assert third == Decimal("3.33")
+    assert remaining == Decimal("6.00")
+    assert over_half == 1
@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import select
+
+import batch
+from models.clients import Client
+from models.users import User, Department
+
+
+SCRIPT = [
+    "# Nightly import\n",
+    'client create --full-name "Batch One" --email one@batch.com --phone 0650000001 --company-name A\n',
+    "\n",
+    'client create --full-name "Batch Two" --email one@batch.com --phone 0650000002 --company-name A\n',
+    'client create --full-name "Batch Three" --email three@batch.com --phone 0650000003 --company-name A\n',
+    "client create --full-name Incomplete\n",
+]
+
+
+@pytest.fixture
+def sales_user(test_db_session, setup_database, monkeypatch):
+    user = User(email="batch@epic.com", role=Department.SALES, first_name="B", last_name="A", hashed_password="h")
+    test_db_session.add(user)
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": user.id})
+    return user
+
+
+def batch_emails(test_db_session, user):
+    return sorted(test_db_session.scalars(select(Client.email).where(Client.sales_contact_id == user.id)))
+
+
+def test_parse_script_skips_comments_and_blank_lines():
+    commands = list(batch.parse_script(SCRIPT))
+
+    assert [number for number, _ in commands] == [2, 4, 5, 6]
+    assert commands[0][1][:4] == ["client", "create", "--full-name", "Batch One"]
+    with pytest.raises(ValueError, match="Ligne 1"):
+        list(batch.parse_script(['client create --full-name "Unbalanced\n']))
+
+
+def test_batch_reports_each_line_in_one_transaction(test_db_session, sales_user, capsys):
+    runner = batch.BatchRunner(test_db_session.connection(), single_transaction=True)
+    results = runner.run(batch.parse_script(SCRIPT))
+
+    assert [result.ok for result in results] == [True, False, True, False]
+    assert "[échec] ligne 4" in capsys.readouterr().err
+    assert batch_emails(test_db_session, sales_user) == ["one@batch.com", "three@batch.com"]
+
+
+def test_stop_on_error_rolls_back_the_transaction(test_db_session, sales_user):
+    runner = batch.BatchRunner(test_db_session.connection(), single_transaction=True)
+    results = runner.run(batch.parse_script(SCRIPT), stop_on_error=True)
+
+    assert len(results) == 2
+    assert batch_emails(test_db_session, sales_user) == []
+
+
+def test_batch_without_transaction_commits_each_line(test_db_session, sales_user):
+    runner = batch.BatchRunner(test_db_session.connection())
+    results = runner.run(batch.parse_script(SCRIPT[:2] + ["client list-my --format ndjson\n"]))
+
+    assert [result.ok for result in results] == [True, True]
+    assert batch_emails(test_db_session, sales_user) == ["one@batch.com"]
+
+
+def test_line_status_comes_from_exit_code(test_db_session, setup_database, monkeypatch, tmp_path):
+    accounting = User(email="acc@batch.com", role=Department.ACCOUNTING, first_name="A", last_name="C")
+    accounting.hashed_password = "h"
+    test_db_session.add(accounting)
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": accounting.id})
+    users = tmp_path / "users.csv"
+    users.write_text(
+        "firstname,lastname,email,password,role\n"
+        "Ann,One,ann@batch.com,secret,SALES\n"
+        "Ann,Two,ann@batch.com,secret,SALES\n"
+    )
+
+    runner = batch.BatchRunner(test_db_session.connection(), single_transaction=True)
+    results = runner.run(batch.parse_script([f"import-users {users}\n", "client list --where unknown=1\n"]))
+
+    # The partial import prints a red summary but succeeds; the invalid filter exits with 1.
+    assert [result.ok for result in results] == [True, False]
+    assert test_db_session.scalars(select(User.last_name).where(User.email == "ann@batch.com")).all() == ["One"]
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+
+import daemon
+
+
+MAIN_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    socket_path = str(tmp_path / "epic_crm.sock")
+    monkeypatch.setenv("EPIC_CRM_SOCKET", socket_path)
+    monkeypatch.delenv("EPIC_CRM_NO_DAEMON", raising=False)
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    env = {**os.environ, "MASTER_PASSWORD": "master"}
+    process = subprocess.Popen(
+        [sys.executable, "main.py", "daemon", "start", "--foreground"],
+        cwd=MAIN_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 20
+    while not os.path.exists(socket_path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    yield socket_path
+
+    daemon.send_request({"command": "shutdown"}, timeout=5)
+    process.wait(timeout=10)
+
+
+def test_forward_without_daemon_runs_locally(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPIC_CRM_SOCKET", str(tmp_path / "missing.sock"))
+    assert daemon.forward_to_daemon(["logout"]) is None
+
+
+def test_daemon_commands_are_never_forwarded():
+    assert daemon.forward_to_daemon(["daemon", "status"]) is None
+
+
+def test_forward_runs_command_in_client_directory(running_daemon, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".token").write_text("fake-token")
+
+    exit_code = daemon.forward_to_daemon(["logout"])
+
+    assert exit_code == 0
+    assert "Déconnecté avec succès" in capsys.readouterr().out
+    assert not (tmp_path / ".token").exists()
+
+
+def test_forward_refused_when_client_configured_differently(running_daemon, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'other.db'}")
+    (tmp_path / ".token").write_text("fake-token")
+
+    assert daemon.forward_to_daemon(["logout"]) is None
+    assert (tmp_path / ".token").exists()
+
+
+def test_forward_relays_prompts_to_client(running_daemon, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("daemon.getpass.getpass", lambda prompt: "wrong-password")
+
+    exit_code = daemon.forward_to_daemon(["reset-db"])
+
+    assert exit_code == 1
+    assert "Mot de passe incorrect. Accès refusé." in capsys.readouterr().out
+
+
+def test_forward_reports_usage_errors(running_daemon, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    exit_code = daemon.forward_to_daemon(["client", "unknown"])
+
+    assert exit_code == 2
+    assert "No such command 'unknown'" in capsys.readouterr().err
+
+
+def test_ping_reports_served_commands(running_daemon, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    daemon.forward_to_daemon(["logout"])
+
+    status = daemon.send_request({"command": "ping"}, timeout=5)
+
+    assert status["served"] == 1
@@ -0,0 +1,121 @@
+import pytest
+import time
+from sqlalchemy import event, update
+from sqlalchemy.orm import sessionmaker
+
+import shell
+from models.clients import Client
+from models.users import User, Department
+
+
+@pytest.fixture
+def crm_shell(test_db_session, monkeypatch):
+    monkeypatch.setattr(shell, "SessionLocal", sessionmaker(bind=test_db_session.connection()))
+    return shell.CrmShell()
+
+
+@pytest.fixture
+def sales_user(test_db_session, monkeypatch):
+    user = User(email="shell@epic.com", role=Department.SALES, first_name="S", last_name="H", hashed_password="h")
+    test_db_session.add(user)
+    test_db_session.commit()
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", lambda: {"user_id": user.id})
+    return user
+
+
+def test_complete_commands_and_options(crm_shell):
+    assert crm_shell.completenames("con") == ["contract"]
+    assert "update" in crm_shell.completedefault("", "client ", 7, 7)
+    assert crm_shell.completedefault("--client", "client update --client", 14, 22) == ["--client-id"]
+
+
+def test_complete_ids_cached_until_a_write(crm_shell, sales_user, test_db_session, setup_database):
+    client = Client(
+        email="first@shell.com", full_name="First", phone="0640000000", enterprise="A", sales_contact_id=sales_user.id
+    )
+    test_db_session.add(client)
+    test_db_session.commit()
+
+    line = "client update --client-id "
+    assert str(client.id) in crm_shell.completedefault("", line, len(line), len(line))
+
+    statements = []
+    event.listen(test_db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    crm_shell.completedefault("", line, len(line), len(line))
+    assert statements == []
+
+    session = crm_shell.open_session()
+    other = Client(
+        email="second@shell.com", full_name="Second", phone="0640000001", enterprise="A", sales_contact_id=sales_user.id
+    )
+    session.add(other)
+    session.flush()
+    other_id = other.id
+    session.commit()
+    session.close()
+
+    text = f"--client-id={other_id}"
+    assert crm_shell.completedefault(text, "client delete ", 14, 14) == [text]
+
+
+def test_principal_is_resolved_once_per_shell(crm_shell, sales_user, test_db_session, setup_database):
+    statements = []
+    event.listen(test_db_session.connection(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    first = crm_shell.open_session()
+    assert crm_shell.security_context.has_role([Department.SALES])
+    first.close()
+    assert len(statements) == 1
+    assert "FROM users" in statements[0]
+
+    statements.clear()
+    second = crm_shell.open_session()
+    assert crm_shell.security_context.has_role([Department.SALES], read_only=True)
+    assert crm_shell.security_context.get_user(cached=True).email == "shell@epic.com"
+    assert len(statements) == 0
+    assert not any("FROM users" in statement for statement in statements)
+
+    # The write checks of a new command load the principal again.
+    assert crm_shell.security_context.has_role([Department.SALES])
+    assert crm_shell.security_context.has_role([Department.SALES])
+    second.close()
+    assert len(statements) == 1
+    assert "FROM users" in statements[0]
+
+
+def test_write_checks_see_role_changes_between_commands(crm_shell, sales_user, test_db_session, setup_database):
+    first = crm_shell.open_session()
+    assert crm_shell.security_context.has_role([Department.SALES])
+    first.close()
+
+    test_db_session.execute(update(User).where(User.id == sales_user.id).values(role=Department.SUPPORT))
+    test_db_session.commit()
+
+    second = crm_shell.open_session()
+    assert not crm_shell.security_context.has_role([Department.SALES])
+    second.close()
+
+
+def test_expired_token_is_refused_by_the_shell(crm_shell, sales_user, monkeypatch, setup_database):
+    now = time.time()
+    monkeypatch.setattr(
+        "controllers.permissions.get_current_user_token_payload", lambda: {"user_id": sales_user.id, "exp": now + 60}
+    )
+    first = crm_shell.open_session()
+    assert crm_shell.security_context.has_role([Department.SALES])
+    first.close()
+
+    def expired():
+        raise ValueError("Token invalide ou expiré.")
+
+    monkeypatch.setattr("controllers.permissions.get_current_user_token_payload", expired)
+    monkeypatch.setattr("controllers.permissions.time.time", lambda: now + 120)
+    second = crm_shell.open_session()
+    with pytest.raises(ValueError, match="expiré"):
+        crm_shell.security_context.has_role([Department.SALES], read_only=True)
+    second.close()
+
+
+def test_run_command_keeps_the_shell_open(crm_shell, capsys):
+    assert crm_shell.run_command(["client", "--help"]) == 0
+    assert crm_shell.onecmd("client unknown-command") is False
+    assert crm_shell.onecmd("exit") is True
@@ -0,0 +1,87 @@
+import pytest
+from click.testing import CliRunner
+from unittest.mock import patch, MagicMock
+from sqlalchemy import func, select
+from epic_crm.views import admin_view
+from models.clients import Client
+from models.users import Department, User
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    monkeypatch.setattr("controllers.authentication.MASTER_PASSWORD", "master")
+    return CliRunner()
+
+
+def test_migrate_money_requires_master_password(runner):
+    with patch("epic_crm.views.admin_view.migrate_money_column") as mock_migrate:
+        result = runner.invoke(admin_view.migrate_money, input="wrong\n")
+
+        assert result.exit_code == 1
+        mock_migrate.assert_not_called()
+
+
+def test_migrate_money_asks_confirmation(runner):
+    column = MagicMock()
+    column.name = "to_be_paid"
+    column.table.name = "contracts"
+
+    with patch("epic_crm.views.admin_view.get_unmigrated_money_columns", return_value=[column]), patch(
+        "epic_crm.views.admin_view.migrate_money_column"
+    ) as mock_migrate:
+        cancelled = runner.invoke(admin_view.migrate_money, input="master\nn\n")
+        mock_migrate.assert_not_called()
+        migrated = runner.invoke(admin_view.migrate_money, input="master\ny\n")
+
+        assert "Opération annulée." in cancelled.output
+        assert "Colonne migrée : contracts.to_be_paid" in migrated.output
+        mock_migrate.assert_called_once_with(column)
+
+
+def test_add_indexes_requires_master_password(runner):
+    index = MagicMock()
+    index.name = "ix_events_start_date"
+    index.table.name = "events"
+    index.columns = [MagicMock()]
+    index.columns[0].name = "start_date"
+
+    with patch("epic_crm.views.admin_view.get_missing_indexes", return_value=[index]), patch(
+        "epic_crm.views.admin_view.create_index_online"
+    ) as mock_create:
+        refused = runner.invoke(admin_view.add_indexes, input="wrong\n")
+        mock_create.assert_not_called()
+        created = runner.invoke(admin_view.add_indexes, input="master\n")
+
+        assert refused.exit_code == 1
+        assert "Index créé : ix_events_start_date (events : start_date)" in created.output
+        mock_create.assert_called_once_with(index)
+
+
+def test_delete_users_clears_record_cache(runner):
+    with patch("epic_crm.views.admin_view.SessionLocal"), patch(
+        "epic_crm.views.admin_view.get_record_cache"
+    ) as mock_cache:
+        result = runner.invoke(admin_view.delete_users, input="master\ny\n")
+
+        assert "Tous les utilisateurs ont été supprimés." in result.output
+        mock_cache.return_value.clear.assert_called_once_with()
+
+
+def test_delete_users_dry_run_previews_the_cascade(runner, test_db_session, setup_database):
+    user = User(email="cascade@epic.com", role=Department.SALES, first_name="C", last_name="D", hashed_password="h")
+    test_db_session.add(user)
+    test_db_session.flush()
+    test_db_session.add(
+        Client(full_name="Kept", email="kept@corp.com", phone="0600000099", sales_contact_id=user.id)
+    )
+    test_db_session.commit()
+
+    with patch("epic_crm.views.admin_view.SessionLocal", return_value=test_db_session):
+        result = runner.invoke(admin_view.delete_users, ["--dry-run", "--preview", "5"], input="master\n")
+
+    assert result.exit_code == 0
+    assert "USERS : 1" in result.output
+    assert "CLIENTS : 1" in result.output
+    assert "kept@corp.com" in result.output
+    assert "Tous les utilisateurs ont été supprimés." not in result.output
+    assert test_db_session.scalar(select(func.count()).select_from(User)) == 1
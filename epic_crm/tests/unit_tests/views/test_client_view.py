@@ -1,3 +1,4 @@
+import json
 import pytest
 from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
@@ -55,7 +56,7 @@ def test_list_clients(runner):
 
     with patch("epic_crm.views.client_view.get_manager") as mock_get_manager:
         mock_manager = MagicMock()
-        mock_manager.get_all.return_value = [mock_client]
+        mock_manager.get_rows.return_value = [mock_client]
         mock_session = MagicMock()
         mock_get_manager.return_value = (mock_manager, mock_session)
 
@@ -63,6 +64,23 @@ def test_list_clients(runner):
         assert "[1] Alice - alice@test.com (AliceCorp)" in result.output
 
 
+def test_list_clients_page(runner):
+    clients = [MagicMock(id=id_, full_name=f"Client {id_}", email="c@test.com", enterprise="Corp") for id_ in (11, 12)]
+
+    with patch("epic_crm.views.client_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.get_rows.return_value = clients
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(client_view.list, ["--limit", "2", "--after", "10"])
+
+        mock_manager.get_rows.assert_called_once_with(
+            None, fields=client_view.LIST_FIELDS, limit=2, after=10, order_by=None
+        )
+        assert "[12] Client 12" in result.output
+        assert "--limit 2 --after 12" in result.output
+
+
 def test_update_client_success(runner):
     with patch("epic_crm.views.client_view.get_manager") as mock_get_manager:
         mock_manager = MagicMock()
@@ -104,3 +122,83 @@ def test_delete_client_success(runner):
 
         assert "Client 1 supprimé." in result.output
         mock_manager.delete.assert_called_once()
+
+
+def test_delete_client_dry_run(runner):
+    with patch("epic_crm.views.client_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.count_cascade.return_value = ["CLIENTS : 1", "CONTRACTS : 2,340"]
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(client_view.delete, ["--client-id", "1", "--dry-run"])
+
+        assert "CONTRACTS : 2,340" in result.output
+        mock_manager.delete.assert_not_called()
+
+
+def test_list_clients_ndjson(runner):
+    row = MagicMock(
+        id=1,
+        full_name="Alice",
+        email="alice@test.com",
+        phone="0611111111",
+        enterprise="AliceCorp",
+        creation_date=None,
+        last_update=None,
+        sales_contact_id=2,
+    )
+
+    with patch("epic_crm.views.client_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.get_rows.return_value = [row]
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(client_view.list, ["--format", "ndjson"])
+
+        assert json.loads(result.output)["enterprise"] == "AliceCorp"
+        assert mock_manager.get_rows.call_args.kwargs["fields"] == client_view.Client.HEADERS
+
+
+def test_list_clients_where_order_by_fields(runner):
+    rows = [MagicMock(id=3, email="c@test.com"), MagicMock(id=1, email="a@test.com")]
+
+    with patch("epic_crm.views.client_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.get_rows.return_value = rows
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(
+            client_view.list, ["--where", "enterprise~Corp", "--order-by", "-email", "--fields", "id,email"]
+        )
+
+        kwargs = mock_manager.get_rows.call_args.kwargs
+        assert kwargs["fields"] == ["id", "email"]
+        assert str(kwargs["order_by"][0]) == "clients.email DESC"
+        assert result.output.splitlines()[0].split() == ["id", "email"]
+
+
+def test_list_clients_unknown_field(runner):
+    with patch("epic_crm.views.client_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(client_view.list, ["--where", "password=x"])
+
+        assert "Champ inconnu : password" in result.output
+        mock_manager.get_rows.assert_not_called()
+
+
+def test_list_my_clients_streams_rows(runner):
+    row = MagicMock(id=3, full_name="Mine", enterprise="A", email="mine@corp.com")
+    with patch("epic_crm.views.client_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.get_my_client_rows.return_value = iter([row])
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(client_view.get_my_clients)
+        assert "[3] Mine - A (mine@corp.com)" in result.output
+        assert "Aucun client" not in result.output
+
+        mock_manager.filter_rows_by_name.return_value = iter([])
+        result = runner.invoke(client_view.filter_by_name, ["--name", "zz"])
+        assert "Aucun client correspondant." in result.output
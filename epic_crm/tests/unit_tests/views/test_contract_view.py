@@ -1,3 +1,5 @@
+import io
+from decimal import Decimal
 import pytest
 from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
@@ -47,7 +49,7 @@ def test_list_contracts(runner):
 
     with patch("epic_crm.views.contract_view.get_manager") as mock_get_manager:
         mock_manager = MagicMock()
-        mock_manager.get_all.return_value = [mock_contract]
+        mock_manager.get_rows.return_value = [mock_contract]
         mock_session = MagicMock()
         mock_get_manager.return_value = (mock_manager, mock_session)
 
@@ -90,3 +92,49 @@ def test_delete_contract_success(runner):
 
         assert "Contrat 5 supprimé." in result.output
         mock_manager.delete.assert_called_once()
+
+
+def test_pay_contract(runner):
+    with patch("epic_crm.views.contract_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(contract_view.pay, ["--contract-id", "3", "--amount", "250.10"])
+
+        assert "Paiement de 250.10€ enregistré sur le contrat 3." in result.output
+        mock_manager.record_payment.assert_called_once_with(3, Decimal("250.10"))
+        assert runner.invoke(contract_view.pay, ["--contract-id", "3", "--amount", "abc"]).exit_code == 2
+
+
+def test_pay_statement(runner):
+    with patch("epic_crm.views.contract_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.record_payments.return_value = "2 paiement(s) enregistré(s), 0 en échec."
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        with runner.isolated_filesystem():
+            with open("statement.csv", "w") as f:
+                f.write("date,contract_id,amount\n2025-01-02,3,250.5\n2025-01-03,4,100\n")
+            result = runner.invoke(contract_view.pay, ["--statement", "statement.csv"])
+
+        assert "2 paiement(s) enregistré(s)" in result.output
+        mock_manager.record_payments.assert_called_once_with([(3, 250.5), (4, 100.0)], chunk_size=1000)
+
+
+def test_pay_statement_invalid_line():
+    with pytest.raises(ValueError, match="Ligne 2"):
+        contract_view.read_payments(io.StringIO("contract_id,amount\n1,10\nx,5\n"))
+
+
+def test_contract_totals(runner):
+    row = MagicMock(sales_contact_id=2, contracts=3, total_amount=Decimal("1500.00"), to_be_paid=Decimal("0.10"))
+
+    with patch("epic_crm.views.contract_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.get_totals.return_value = [row]
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(contract_view.totals, ["--by", "sales_contact_id", "--format", "csv"])
+
+        assert result.output.splitlines() == ["sales_contact_id,contracts,total_amount,to_be_paid", "2,3,1500.00,0.10"]
+        assert mock_manager.get_totals.call_args.kwargs == {"group_by": "sales_contact_id"}
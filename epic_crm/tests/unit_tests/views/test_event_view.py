@@ -53,7 +53,7 @@ def test_list_events(runner):
 
     with patch("epic_crm.views.event_view.get_manager") as mock_get_manager:
         mock_manager = MagicMock()
-        mock_manager.get_all.return_value = [mock_event]
+        mock_manager.get_rows.return_value = [mock_event]
         mock_session = MagicMock()
         mock_get_manager.return_value = (mock_manager, mock_session)
 
@@ -71,7 +71,7 @@ def test_list_unassigned_events(runner):
 
     with patch("epic_crm.views.event_view.get_manager") as mock_get_manager:
         mock_manager = MagicMock()
-        mock_manager.get_unassigned_support_events.return_value = [mock_event]
+        mock_manager.get_unassigned_event_rows.return_value = [mock_event]
         mock_session = MagicMock()
         mock_get_manager.return_value = (mock_manager, mock_session)
 
@@ -89,7 +89,7 @@ def test_list_my_events(runner):
 
     with patch("epic_crm.views.event_view.get_manager") as mock_get_manager:
         mock_manager = MagicMock()
-        mock_manager.get_my_events.return_value = [mock_event]
+        mock_manager.get_my_event_rows.return_value = [mock_event]
         mock_session = MagicMock()
         mock_get_manager.return_value = (mock_manager, mock_session)
 
@@ -164,6 +164,18 @@ def test_delete_event_success(runner):
         mock_manager.delete.assert_called_once()
 
 
+def test_delete_event_dry_run(runner):
+    with patch("epic_crm.views.event_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.count_cascade.return_value = ["EVENTS : 1"]
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(event_view.delete, ["--event-id", "8", "--dry-run"])
+
+        assert "EVENTS : 1" in result.output
+        mock_manager.delete.assert_not_called()
+
+
 def test_delete_event_failure(runner):
     with patch("epic_crm.views.event_view.get_manager") as mock_get_manager:
         mock_manager = MagicMock()
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import click
+from click.testing import CliRunner
+
+from epic_crm.views.lazy_group import LazyGroup
+
+
+MAIN_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+@click.group(cls=LazyGroup, lazy_commands={"logout": "views.token_view:logout"})
+def fake_cli():
+    pass
+
+
+@fake_cli.command()
+def eager():
+    """Eager command."""
+    pass
+
+
+def test_help_lists_lazy_and_eager_commands():
+    result = CliRunner().invoke(fake_cli, ["--help"])
+
+    assert result.exit_code == 0
+    assert "logout" in result.output
+    assert "Log out the current user" in result.output
+    assert "Eager command." in result.output
+
+
+def test_lazy_command_is_loaded_on_invocation():
+    command = fake_cli.get_command(None, "logout")
+
+    assert isinstance(command, click.Command)
+    assert command.name == "logout"
+
+
+def test_help_does_not_import_views_or_sqlalchemy():
+    code = (
+        "import sys\n"
+        "from main import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "loaded = [m for m in ('sqlalchemy', 'sentry_sdk', 'bcrypt', 'views.user_view') if m in sys.modules]\n"
+        "print('LOADED=' + ','.join(loaded))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=MAIN_DIR, capture_output=True, text=True, check=True)
+
+    assert "LOADED=\n" in result.stdout
+    assert "client" in result.stdout
+
+
+def test_lazy_help_matches_command_docstrings():
+    from main import COMMANDS, cli
+
+    output = CliRunner().invoke(cli, ["--help"], terminal_width=80).output
+    listed = dict(line.strip().split(None, 1) for line in output.split("Commands:")[1].strip().splitlines())
+    limit = 80 - 6 - max(len(name) for name in COMMANDS)
+
+    assert set(listed) == set(COMMANDS)
+    for name in COMMANDS:
+        assert listed[name] == cli.get_command(None, name).get_short_help_str(limit)
@@ -0,0 +1,70 @@
+import enum
+import json
+import click
+from datetime import datetime
+from click.testing import CliRunner
+from collections import namedtuple
+
+from epic_crm.views import output
+
+
+class Department(enum.Enum):
+    SALES = 1
+    SUPPORT = 2
+
+
+Row = namedtuple("Row", ["id", "name", "role", "created"])
+
+ROWS = [
+    Row(1, "Alice", Department.SALES, datetime(2025, 1, 2, 3, 4)),
+    Row(2, "Bob, Jr", Department.SUPPORT, None),
+]
+
+
+def run_echo(records, output_format, fields=Row._fields):
+    results = {}
+
+    @click.command()
+    def command():
+        results["summary"] = output.echo_records(
+            iter(records), list(fields), output_format, text_line=lambda r: f"[{r.id}] {r.name}"
+        )
+
+    result = CliRunner().invoke(command)
+    assert result.exit_code == 0, result.output
+    return result.output, results["summary"]
+
+
+def test_text_uses_the_line_builder():
+    text, (count, last) = run_echo(ROWS, "text")
+    assert text == "[1] Alice\n[2] Bob, Jr\n"
+    assert count == 2
+    assert last.id == 2
+
+
+def test_csv_quotes_and_converts_values():
+    text, _ = run_echo(ROWS, "csv")
+    assert text.splitlines() == [
+        "id,name,role,created",
+        "1,Alice,SALES,2025-01-02T03:04:00",
+        '2,"Bob, Jr",SUPPORT,',
+    ]
+
+
+def test_json_and_ndjson():
+    text, _ = run_echo(ROWS, "json")
+    assert json.loads(text)[1] == {"id": 2, "name": "Bob, Jr", "role": "SUPPORT", "created": None}
+
+    text, _ = run_echo(ROWS, "ndjson")
+    assert [json.loads(line)["role"] for line in text.splitlines()] == ["SALES", "SUPPORT"]
+
+    text, (count, last) = run_echo([], "json")
+    assert json.loads(text) == []
+    assert (count, last) == (0, None)
+
+
+def test_table_sizes_columns_from_a_bounded_sample(monkeypatch):
+    monkeypatch.setattr(output, "TABLE_SAMPLE_SIZE", 1)
+    text, (count, _) = run_echo(ROWS, "table", fields=["id", "name"])
+    assert text.splitlines() == ["id  name", "--  -----", "1   Alice", "2   Bob,…"]
+    assert count == 2
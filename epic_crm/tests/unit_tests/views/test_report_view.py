@@ -0,0 +1,62 @@
+import json
+import pytest
+from decimal import Decimal
+from click.testing import CliRunner
+from unittest.mock import patch, MagicMock
+from epic_crm.views import report_view
+
+
+@pytest.fixture
+def runner():
+    return CliRunner()
+
+
+def receivables_row(**values):
+    amounts = {"days_0_30": Decimal("100.00"), "days_31_60": Decimal("0.00")}
+    amounts.update(days_61_90=Decimal("0.00"), days_over_90=Decimal("50.50"))
+    return MagicMock(contracts=2, to_be_paid=Decimal("150.50"), **amounts, **values)
+
+
+def test_receivables_json(runner):
+    with patch("epic_crm.views.report_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.get_receivables.return_value = [receivables_row(client_id=7)]
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(report_view.receivables, ["--by", "client_id", "--format", "json"])
+
+        assert json.loads(result.output) == [
+            {
+                "client_id": 7,
+                "contracts": 2,
+                "to_be_paid": "150.50",
+                "days_0_30": "100.00",
+                "days_31_60": "0.00",
+                "days_61_90": "0.00",
+                "days_over_90": "50.50",
+            }
+        ]
+        mock_manager.get_receivables.assert_called_once_with(group_by="client_id", as_of=None)
+
+
+def test_receivables_text(runner):
+    with patch("epic_crm.views.report_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.get_receivables.return_value = [receivables_row()]
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(report_view.receivables)
+
+        assert "2 contrat(s) - Reste à payer: 150.50€ (0-30 j : 100.00€" in result.output
+        assert "+90 j : 50.50€)" in result.output
+
+
+def test_receivables_permission_error(runner):
+    with patch("epic_crm.views.report_view.get_manager") as mock_get_manager:
+        mock_manager = MagicMock()
+        mock_manager.get_receivables.side_effect = PermissionError("Accès refusé.")
+        mock_get_manager.return_value = (mock_manager, MagicMock())
+
+        result = runner.invoke(report_view.receivables)
+
+        assert "Accès refusé." in result.output
@@ -0,0 +1,29 @@
+import pytest
+from click.testing import CliRunner
+from unittest.mock import patch
+from epic_crm.views import token_view
+
+
+@pytest.fixture
+def runner():
+    return CliRunner()
+
+
+def test_logout_with_token_file(runner, tmp_path):
+    token_path = tmp_path / ".token"
+    token_path.write_text("fake-token")
+
+    with patch("epic_crm.views.token_view.os.path.exists", return_value=True), patch(
+        "epic_crm.views.token_view.os.remove"
+    ) as mock_remove:
+
+        result = runner.invoke(token_view.logout)
+
+        assert "Déconnecté avec succès" in result.output
+        mock_remove.assert_called_once()
+
+
+def test_logout_without_token_file(runner):
+    with patch("epic_crm.views.token_view.os.path.exists", return_value=False):
+        result = runner.invoke(token_view.logout)
+        assert "Aucun token trouvé." in result.output
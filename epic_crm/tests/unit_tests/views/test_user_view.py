@@ -48,30 +48,10 @@ def test_login_failure(runner):
     with patch("epic_crm.views.user_view.authenticate_user", return_value=(False, "Identifiants invalides")):
         result = runner.invoke(user_view.login, input="user@example.com\nwrongpass\n")
 
-        assert result.exit_code == 0
+        assert result.exit_code == 1
         assert "Identifiants invalides" in result.output
 
 
-def test_logout_with_token_file(runner, tmp_path):
-    token_path = tmp_path / ".token"
-    token_path.write_text("fake-token")
-
-    with patch("epic_crm.views.user_view.os.path.exists", return_value=True), patch(
-        "epic_crm.views.user_view.os.remove"
-    ) as mock_remove:
-
-        result = runner.invoke(user_view.logout)
-
-        assert "Déconnecté avec succès" in result.output
-        mock_remove.assert_called_once()
-
-
-def test_logout_without_token_file(runner):
-    with patch("epic_crm.views.user_view.os.path.exists", return_value=False):
-        result = runner.invoke(user_view.logout)
-        assert "Aucun token trouvé." in result.output
-
-
 def test_current_user_success(monkeypatch, runner):
     mock_user = MagicMock()
     mock_user.full_name = "Jean Dupont"
@@ -105,9 +85,39 @@ def test_list_users_success(runner):
 
     with patch("epic_crm.views.user_view.get_manager") as mock_get_manager:
         mock_manager = MagicMock()
-        mock_manager.get_all.return_value = [mock_user]
+        mock_manager.get_rows.return_value = [mock_user]
         mock_session = MagicMock()
         mock_get_manager.return_value = (mock_manager, mock_session)
 
         result = runner.invoke(user_view.list_users)
         assert "[1] John Doe - john@example.com (SUPPORT)" in result.output
+
+
+def test_import_users_reads_csv(runner, tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("firstname,lastname,email,password,role,team\nJane,Doe,jane@example.com,pw,sales,A\n")
+    mock_manager = MagicMock()
+    mock_manager.create_many.return_value.failures = []
+    mock_manager.create_many.return_value.__str__.return_value = "1 créé(s), 0 en échec."
+
+    with patch("epic_crm.views.user_view.get_manager", return_value=(mock_manager, MagicMock())):
+        result = runner.invoke(user_view.import_users, [str(path), "--workers", "2"])
+
+    assert result.exit_code == 0
+    assert "1 créé(s), 0 en échec." in result.output
+    [row] = mock_manager.create_many.call_args.args[0]
+    assert row.pop("role").name == "SALES"
+    assert row == {"firstname": "Jane", "lastname": "Doe", "email": "jane@example.com", "password": "pw"}
+    assert mock_manager.create_many.call_args.kwargs["workers"] == 2
+
+
+def test_import_users_rejects_unknown_role(runner, tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text('[{"firstname": "Jane", "email": "jane@example.com", "password": "pw", "role": "boss"}]')
+    mock_manager = MagicMock()
+
+    with patch("epic_crm.views.user_view.get_manager", return_value=(mock_manager, MagicMock())):
+        result = runner.invoke(user_view.import_users, [str(path)])
+
+    assert "rôle inconnu 'boss'" in result.output
+    mock_manager.create_many.assert_not_called()
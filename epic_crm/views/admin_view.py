@@ -1,9 +1,94 @@
 import click
+import sqlalchemy
+from sqlalchemy.exc import SQLAlchemyError
 from controllers.user_controller import UserManager
-from controllers.database_controller import SessionLocal, engine
+from controllers.database_controller import (
+    SessionLocal,
+    create_index_online,
+    get_engine,
+    get_missing_indexes,
+    get_unmigrated_money_columns,
+    migrate_money_column,
+)
 from controllers.authentication import require_master_password
+from controllers.cache import get_record_cache
+from controllers.cascade_controller import CascadeResolver
+from controllers.seeding import SEED_CHUNK_SIZE, DatasetSeeder
 from models.base import Base
 from models.users import User
+from views.output import dry_run_options, echo_cascade, echo_error
+
+
+@click.command(name="init-db")
+def init_db():
+    """
+    Initialize the MySQL database schema.
+
+    This command creates all tables defined in the SQLAlchemy models.
+    """
+    Base.metadata.create_all(bind=get_engine())
+    click.echo("Base de données MySQL initialisée avec succès.")
+
+
+@click.command(name="add-indexes")
+@click.option("--dry-run", is_flag=True, help="Only list the missing indexes.")
+@require_master_password
+def add_indexes(dry_run):
+    """
+    Add the indexes declared in the models that are missing from the database.
+
+    Unlike ``reset-db``, the data is kept: each missing index is created on the live
+    tables, without blocking writes where the database allows it. As it changes the
+    schema, it requires the master password.
+    """
+    missing = get_missing_indexes(Base.metadata)
+    if not missing:
+        click.secho("Tous les index sont déjà présents.", fg="green")
+        return
+
+    for index in missing:
+        columns = ", ".join(column.name for column in index.columns)
+        if dry_run:
+            click.echo(f"Index manquant : {index.name} ({index.table.name} : {columns})")
+            continue
+        create_index_online(index)
+        click.secho(f"Index créé : {index.name} ({index.table.name} : {columns})", fg="green")
+
+
+@click.command(name="migrate-money")
+@click.option("--dry-run", is_flag=True, help="Only list the columns to migrate.")
+@require_master_password
+def migrate_money(dry_run):
+    """
+    Convert the amounts stored as decimal numbers to integer numbers of cents.
+
+    Databases created before amounts were stored in cents keep floating-point columns:
+    each of them is converted in place, keeping the data (rounded to the cent). The
+    columns and their indexes are rebuilt on the live table, so the command requires
+    the master password and an explicit confirmation.
+    """
+    columns = get_unmigrated_money_columns(Base.metadata)
+    if not columns:
+        click.secho("Tous les montants sont déjà stockés en centimes.", fg="green")
+        return
+
+    if not dry_run:
+        names = ", ".join(f"{column.table.name}.{column.name}" for column in columns)
+        confirm = click.confirm(
+            f"ATTENTION !! Les colonnes {names} vont être reconstruites. Sauvegardez la base avant. Continuer ?",
+            default=False,
+        )
+        if not confirm:
+            click.echo("Opération annulée.")
+            return
+
+    for column in columns:
+        if dry_run:
+            click.echo(f"Colonne à migrer : {column.table.name}.{column.name}")
+            continue
+        migrate_money_column(column)
+        get_record_cache().clear()
+        click.secho(f"Colonne migrée : {column.table.name}.{column.name}", fg="green")
 
 
 @click.command(name="create-admin")
@@ -36,7 +121,7 @@ def create_admin():
         user = manager._create_admin_raw(firstname=firstname, lastname=lastname, email=email, password=password)
         click.secho(f"Administrateur {user.email} créé avec succès !", fg="green")
     except Exception as e:
-        click.secho(f"Erreur : {e}", fg="red")
+        echo_error(f"Erreur : {e}")
     finally:
         session.close()
 
@@ -58,31 +143,72 @@ def reset_db():
         click.echo("Opération annulée.")
         return
 
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.drop_all(bind=get_engine())
+    Base.metadata.create_all(bind=get_engine())
+    get_record_cache().clear()
     click.secho("Base de données réinitialisée avec succès.", fg="yellow")
 
 
 @click.command(name="delete-users")
+@dry_run_options
 @require_master_password
-def delete_users():
+def delete_users(dry_run, preview):
     """
     Delete all users from the system.
 
     This command removes all user entries from the database after a confirmation prompt.
-    It requires the master password for authorization.
+    It requires the master password for authorization. With ``--dry-run``, only the
+    number of users, clients, contracts and events the deletion would remove is displayed,
+    and ``--preview`` lists the first of them.
 
     Warning:
         All users will be permanently deleted.
     """
     session = SessionLocal()
     try:
+        if dry_run:
+            resolver = CascadeResolver(session)
+            echo_cascade(resolver, resolver.summarize_user_cascade(sqlalchemy.true()), preview)
+            return
         confirm = click.confirm("ATTENTION !! Supprimer tous les utilisateurs ?", default=False)
         if not confirm:
             click.echo("Opération annulée.")
             return
         session.query(User).delete()
         session.commit()
+        # The deletion bypasses the managers and cascades to the clients, contracts and events.
+        get_record_cache().clear()
         click.secho("Tous les utilisateurs ont été supprimés.", fg="red")
     finally:
         session.close()
+
+
+@click.command(name="seed")
+@click.option("--users", default=100, show_default=True, type=click.IntRange(min=0), help="Number of users.")
+@click.option("--clients", default=1000, show_default=True, type=click.IntRange(min=0), help="Number of clients.")
+@click.option("--contracts", default=1000, show_default=True, type=click.IntRange(min=0), help="Number of contracts.")
+@click.option("--events", default=500, show_default=True, type=click.IntRange(min=0), help="Number of events.")
+@click.option("--seed", "seed_value", default=0, show_default=True, help="Seed of the generated data.")
+@click.option(
+    "--chunk-size", default=SEED_CHUNK_SIZE, show_default=True, type=click.IntRange(min=1), help="Rows per INSERT."
+)
+@click.option(
+    "--workers", type=click.IntRange(min=1), default=None, help="Chunks inserted in parallel (1 on SQLite by default)."
+)
+@require_master_password
+def seed(users, clients, contracts, events, seed_value, chunk_size, workers):
+    """
+    Fill the database with a deterministic synthetic dataset.
+
+    The same seed on the same database gives the same data. The rows are added after
+    the existing ones; every seeded user has the password ``password``.
+    """
+    seeder = DatasetSeeder(get_engine(), seed=seed_value, chunk_size=chunk_size, workers=workers)
+    try:
+        report = seeder.run(users=users, clients=clients, contracts=contracts, events=events)
+    except (ValueError, SQLAlchemyError) as e:
+        echo_error(f"Erreur : {e}")
+    finally:
+        # Rows are inserted without the managers, even when a later table fails.
+        get_record_cache().clear()
+    click.secho(str(report), fg="green")
@@ -0,0 +1,26 @@
+import click
+
+
+@click.command(name="run-batch")
+@click.argument("script", type=click.File("r", encoding="utf-8"), default="-")
+@click.option("--transaction", is_flag=True, help="Run every line in one transaction, with a savepoint per line.")
+@click.option(
+    "--stop-on-error", is_flag=True, help="Stop at the first failed line (nothing is committed with --transaction)."
+)
+@click.pass_context
+def run_batch(ctx, script, transaction, stop_on_error):
+    """
+    Run a script of CRM commands (one per line) in a single process.
+
+    Each line is a command as typed after `python main.py`, e.g.
+    `client create --full-name "Jean Dupont" --email ...`; `#` starts a comment.
+    SCRIPT defaults to the standard input. Every option must be given: a command
+    that would prompt fails instead. The commands share one connection and the
+    authenticated principal; the result of each line and the throughput are
+    written on the error output.
+    """
+    from batch import run_batch as run_script
+
+    results = run_script(script, single_transaction=transaction, stop_on_error=stop_on_error)
+    if not all(result.ok for result in results):
+        ctx.exit(1)
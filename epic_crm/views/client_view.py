@@ -1,8 +1,14 @@
 import click
 from controllers.client_controller import ClientsManager
+from controllers.filters import parse_query
 from controllers.utils import get_manager
+from views.output import dry_run_options, echo_cascade, echo_error, echo_records, format_option
+from views.pagination import pagination_options, query_options, resolve_fields, echo_next_page
 from models.clients import Client
 
+# Fields displayed by the list command.
+LIST_FIELDS = ["id", "full_name", "email", "enterprise"]
+
 
 @click.group()
 def client():
@@ -36,61 +42,83 @@ def create(full_name, email, phone, company_name):
         client = manager.create(email=email, full_name=full_name, phone=phone, enterprise=company_name)
         click.secho(f"Client {client.full_name} créé (ID: {client.id})", fg="green")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @client.command()
-def list():
+@pagination_options
+@query_options
+@format_option
+def list(limit, after, where, order_by, fields, output_format):
     """
     List all clients.
 
     Displays a summary of all clients registered in the system,
     including their ID, name, email, and associated company.
+    Clients are streamed by ID, or displayed one page at a time with ``--limit`` and ``--after``.
+    ``--where``, ``--order-by`` and ``--fields`` filter, sort and select the fields in SQL.
     """
     manager, session = get_manager(ClientsManager)
     try:
-        clients = manager.get_all()
-        for c in clients:
-            click.echo(f"[{c.id}] {c.full_name} - {c.email} ({c.enterprise})")
+        where_clause, order_by, selected = parse_query(Client, where, order_by, fields)
+        fields, output_format = resolve_fields(selected, LIST_FIELDS, Client.HEADERS, output_format)
+        displayed, last = echo_records(
+            manager.get_rows(where_clause, fields=fields, limit=limit, after=after, order_by=order_by),
+            fields,
+            output_format,
+            text_line=lambda c: f"[{c.id}] {c.full_name} - {c.email} ({c.enterprise})",
+        )
+        if last is not None and not order_by:
+            echo_next_page(getattr(last, "id", None), displayed, limit)
+    except ValueError as e:
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @client.command(name="list-my")
-def get_my_clients():
+@format_option
+def get_my_clients(output_format):
     """
     Liste les clients assignés à l'utilisateur connecté (Sales uniquement).
     """
     manager, session = get_manager(ClientsManager)
     try:
-        clients = manager.get_my_clients()
-        if not clients:
+        displayed, _ = echo_records(
+            manager.get_my_client_rows(),
+            Client.HEADERS,
+            output_format,
+            text_line=lambda c: f"[{c.id}] {c.full_name} - {c.enterprise} ({c.email})",
+        )
+        if not displayed and output_format == "text":
             click.secho("Aucun client assigné.", fg="yellow")
-        for c in clients:
-            click.echo(f"[{c.id}] {c.full_name} - {c.enterprise} ({c.email})")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @client.command(name="filter-by-name")
 @click.option("--name", prompt="Nom ou partie du nom à rechercher")
-def filter_by_name(name):
+@format_option
+def filter_by_name(name, output_format):
     """
     Recherche les clients dont le nom contient la chaîne fournie.
     """
     manager, session = get_manager(ClientsManager)
     try:
-        results = manager.filter_by_name(name)
-        if not results:
+        displayed, _ = echo_records(
+            manager.filter_rows_by_name(name),
+            Client.HEADERS,
+            output_format,
+            text_line=lambda c: f"[{c.id}] {c.full_name} - {c.enterprise} ({c.email})",
+        )
+        if not displayed and output_format == "text":
             click.secho("Aucun client correspondant.", fg="yellow")
-        for c in results:
-            click.echo(f"[{c.id}] {c.full_name} - {c.enterprise} ({c.email})")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()
 
@@ -118,25 +146,33 @@ def update(client_id, email, phone, company_name):
         manager.update(Client.id == int(client_id), email=email, phone=phone, enterprise=company_name)
         click.secho(f"Client {client_id} mis à jour avec succès.", fg="green")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @client.command()
 @click.option("--client-id", prompt="ID du client")
-def delete(client_id):
+@dry_run_options
+def delete(client_id, dry_run, preview):
     """
     Delete a client.
 
     Removes the client with the specified ID from the system. This operation
     may trigger a cascade deletion of related data, depending on database constraints.
+    With ``--dry-run``, only the number of affected records per table is displayed, and
+    ``--preview`` lists the first of them.
 
     Args:
         client_id (int): The ID of the client to delete.
+        dry_run (bool): Count the affected records instead of deleting them.
+        preview (int): Number of affected records listed per table with ``dry_run``.
     """
     manager, session = get_manager(ClientsManager)
     try:
+        if dry_run:
+            echo_cascade(manager.cascade_resolver, manager.count_cascade(Client.id == int(client_id)), preview)
+            return
         manager.delete(Client.id == int(client_id))
         click.secho(f"Client {client_id} supprimé.", fg="yellow")
     finally:
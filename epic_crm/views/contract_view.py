@@ -1,8 +1,17 @@
+import csv
+from decimal import Decimal
 import click
-from controllers.contract_controller import ContractsManager
+from typing import List, TextIO
+from controllers.contract_controller import ContractsManager, PAYMENT_CHUNK_SIZE, TOTALS_GROUP_FIELDS
+from controllers.filters import parse_conditions, parse_query
 from controllers.utils import get_manager
+from views.output import dry_run_options, echo_cascade, echo_error, echo_records, format_option
+from views.pagination import pagination_options, query_options, resolve_fields, echo_next_page
 from models.contracts import Contract
 
+# Fields displayed by the list command.
+LIST_FIELDS = ["id", "client_id", "total_amount", "is_signed"]
+
 
 @click.group()
 def contract():
@@ -36,26 +45,40 @@ def create(client_id, amount_total, amount_remaining, is_signed):
         contract = manager.create(client_id, amount_total, amount_remaining, is_signed)
         click.secho(f"Contrat créé avec ID : {contract.id}", fg="green")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @contract.command()
-def list():
+@pagination_options
+@query_options
+@format_option
+def list(limit, after, where, order_by, fields, output_format):
     """
     List all contracts in the system.
 
     Displays contract ID, client ID, total amount, and signature status
     for each contract accessible to the authenticated user.
+    Contracts are streamed by ID, or displayed one page at a time with ``--limit`` and ``--after``.
+    ``--where``, ``--order-by`` and ``--fields`` filter, sort and select the fields in SQL.
     """
     manager, session = get_manager(ContractsManager)
     try:
-        contracts = manager.get_all()
-        for c in contracts:
-            click.echo(
+        where_clause, order_by, selected = parse_query(Contract, where, order_by, fields)
+        fields, output_format = resolve_fields(selected, LIST_FIELDS, Contract.HEADERS, output_format)
+        displayed, last = echo_records(
+            manager.get_rows(where_clause, fields=fields, limit=limit, after=after, order_by=order_by),
+            fields,
+            output_format,
+            text_line=lambda c: (
                 f"[{c.id}] Client #{c.client_id} - Total: {c.total_amount}€ - Signé: {'Oui' if c.is_signed else 'Non'}"
-            )
+            ),
+        )
+        if last is not None and not order_by:
+            echo_next_page(getattr(last, "id", None), displayed, limit)
+    except ValueError as e:
+        echo_error(str(e))
     finally:
         session.close()
 
@@ -85,25 +108,140 @@ def update(contract_id, amount_total, amount_remaining, is_signed):
         )
         click.secho("Contrat mis à jour.", fg="green")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
+    finally:
+        session.close()
+
+
+@contract.command()
+@click.option("--by", "group_by", type=click.Choice(TOTALS_GROUP_FIELDS), default=None, help="Group the totals.")
+@click.option(
+    "--where",
+    multiple=True,
+    help="Filter such as is_signed=true or to_be_paid>0 (=, !=, <, <=, >, >=, ~). Repeatable.",
+)
+@format_option
+def totals(group_by, where, output_format):
+    """
+    Display the number of contracts, their total amount and the amount remaining to be paid.
+
+    The sums are computed by the database (``SUM``/``GROUP BY``), optionally per client,
+    sales contact or signature status with ``--by``.
+    """
+    manager, session = get_manager(ContractsManager)
+    try:
+        rows = manager.get_totals(parse_conditions(Contract, where), group_by=group_by)
+        fields = ([group_by] if group_by else []) + ["contracts", "total_amount", "to_be_paid"]
+        echo_records(
+            rows,
+            fields,
+            output_format,
+            text_line=lambda r: (
+                (f"[{group_by} = {getattr(r, group_by)}] " if group_by else "")
+                + f"{r.contracts} contrat(s) - Total: {r.total_amount}€ - Reste à payer: {r.to_be_paid}€"
+            ),
+        )
+    except Exception as e:
+        echo_error(str(e))
+    finally:
+        session.close()
+
+
+def read_payments(file: TextIO) -> List[tuple]:
+    """
+    Read the payments of a bank statement.
+
+    Args:
+        file (TextIO): CSV file with a header line holding (at least) ``contract_id`` and ``amount``.
+
+    Returns:
+        List[tuple]: ``(contract ID, amount)`` pairs, in the order of the file.
+
+    Raises:
+        ValueError: If a column is missing or a line does not hold an ID and an amount.
+    """
+    reader = csv.DictReader(file)
+    if not {"contract_id", "amount"} <= set(reader.fieldnames or ()):
+        raise ValueError("Le relevé doit avoir les colonnes contract_id et amount.")
+    payments = []
+    for number, record in enumerate(reader, start=1):
+        try:
+            payments.append((int(record["contract_id"]), Decimal(record["amount"])))
+        except (TypeError, ValueError, ArithmeticError):
+            raise ValueError(f"Ligne {number} : paiement invalide {record['contract_id']!r}, {record['amount']!r}.")
+    return payments
+
+
+def parse_amount(ctx, param, value):
+    """
+    Read an amount in euros as an exact ``Decimal`` (click callback).
+
+    Raises:
+        click.BadParameter: If the value is not a number.
+    """
+    if value is None:
+        return None
+    try:
+        return Decimal(value)
+    except ArithmeticError:
+        raise click.BadParameter(f"montant invalide : {value!r}.")
+
+
+@contract.command()
+@click.option("--contract-id", type=int, default=None, help="ID of the paid contract.")
+@click.option("--amount", callback=parse_amount, default=None, help="Amount of the payment, in euros.")
+@click.option(
+    "--statement",
+    type=click.File("r", encoding="utf-8"),
+    default=None,
+    help="CSV bank statement (contract_id,amount columns) to apply instead of one payment.",
+)
+@click.option("--chunk-size", type=click.IntRange(min=1), default=PAYMENT_CHUNK_SIZE, show_default=True)
+def pay(contract_id, amount, statement, chunk_size):
+    """
+    Record a payment on a contract, or the payments of a bank statement.
+
+    The amount is subtracted from the amount remaining to be paid by the database, so
+    concurrent payments add up; a payment exceeding the remaining amount is rejected.
+    Only accounting users can record payments.
+    """
+    if statement is None and (contract_id is None or amount is None):
+        raise click.UsageError("Indiquez --contract-id et --amount, ou --statement.")
+    manager, session = get_manager(ContractsManager)
+    try:
+        if statement is not None:
+            click.echo(str(manager.record_payments(read_payments(statement), chunk_size=chunk_size)))
+            return
+        manager.record_payment(contract_id, amount)
+        click.secho(f"Paiement de {amount}€ enregistré sur le contrat {contract_id}.", fg="green")
+    except Exception as e:
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @contract.command()
 @click.option("--contract-id", prompt="ID du contrat")
-def delete(contract_id):
+@dry_run_options
+def delete(contract_id, dry_run, preview):
     """
     Delete a contract.
 
     Removes the specified contract if the authenticated user has permission.
     Sales users may only delete contracts they own.
+    With ``--dry-run``, only the number of affected records per table is displayed, and
+    ``--preview`` lists the first of them.
 
     Args:
         contract_id (int): ID of the contract to delete.
+        dry_run (bool): Count the affected records instead of deleting them.
+        preview (int): Number of affected records listed per table with ``dry_run``.
     """
     manager, session = get_manager(ContractsManager)
     try:
+        if dry_run:
+            echo_cascade(manager.cascade_resolver, manager.count_cascade(Contract.id == int(contract_id)), preview)
+            return
         manager.delete(Contract.id == int(contract_id))
         click.secho(f"Contrat {contract_id} supprimé.", fg="yellow")
     finally:
@@ -0,0 +1,83 @@
+import click
+import os
+import subprocess
+import sys
+import time
+
+import daemon as crm_daemon
+from views.output import echo_error
+
+
+@click.group()
+def daemon():
+    """
+    Persistent CRM daemon command group.
+
+    The daemon keeps the database connection pool and the ORM loaded between commands.
+    While it is running, `python main.py ...` commands are executed by the daemon
+    through a local Unix socket; they run directly when it is stopped.
+    """
+    pass
+
+
+@daemon.command()
+@click.option("--foreground", is_flag=True, help="Rester au premier plan (ne pas détacher le processus).")
+@click.option("--wait", default=10.0, show_default=True, help="Délai d'attente du démarrage, en secondes.")
+def start(foreground, wait):
+    """
+    Start the daemon.
+    """
+    try:
+        status = crm_daemon.send_request({"command": "ping"}, timeout=1)
+        click.secho(f"Le démon est déjà démarré (PID {status['pid']}).", fg="yellow")
+        return
+    except OSError:
+        pass
+
+    if foreground:
+        click.secho(f"Démon à l'écoute sur {crm_daemon.get_socket_path()}", fg="green")
+        crm_daemon.serve()
+        return
+
+    main_path = os.path.join(os.path.dirname(os.path.abspath(crm_daemon.__file__)), "main.py")
+    subprocess.Popen(
+        [sys.executable, main_path, "daemon", "start", "--foreground"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        try:
+            status = crm_daemon.send_request({"command": "ping"}, timeout=1)
+            click.secho(f"Démon démarré (PID {status['pid']}).", fg="green")
+            return
+        except OSError:
+            time.sleep(0.1)
+    echo_error("Le démon n'a pas démarré. Lancer 'daemon start --foreground' pour voir l'erreur.")
+
+
+@daemon.command()
+def stop():
+    """
+    Stop the daemon.
+    """
+    try:
+        crm_daemon.send_request({"command": "shutdown"}, timeout=5)
+        click.secho("Démon arrêté.", fg="green")
+    except OSError:
+        click.secho("Aucun démon en cours d'exécution.", fg="yellow")
+
+
+@daemon.command()
+def status():
+    """
+    Display whether the daemon is running.
+    """
+    try:
+        status = crm_daemon.send_request({"command": "ping"}, timeout=1)
+        click.echo(f"Démon actif (PID {status['pid']}), {status['served']} commande(s) exécutée(s).")
+    except OSError:
+        click.secho("Aucun démon en cours d'exécution.", fg="yellow")
@@ -1,8 +1,14 @@
 import click
 from controllers.event_controller import EventsManager
+from controllers.filters import parse_query
 from controllers.utils import get_manager
+from views.output import dry_run_options, echo_cascade, echo_error, echo_records, format_option
+from views.pagination import pagination_options, query_options, resolve_fields, echo_next_page
 from models.events import Event
 
+# Fields displayed by the list command.
+LIST_FIELDS = ["id", "event_name", "start_date", "location", "contract_id", "support_contact_id"]
+
 
 @click.group()
 def event():
@@ -66,33 +72,48 @@ def create(name, start_date, end_date, location, attendees, notes, contract_id,
 
         click.secho(f"Événement créé (ID: {event.id})", fg="green")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @event.command()
-def list():
+@pagination_options
+@query_options
+@format_option
+def list(limit, after, where, order_by, fields, output_format):
     """
     List all events (accessible to authorized users).
 
     Displays each event's ID, name, start date, location, contract ID,
     and assigned support contact (if any).
+    Events are streamed by ID, or displayed one page at a time with ``--limit`` and ``--after``.
+    ``--where``, ``--order-by`` and ``--fields`` filter, sort and select the fields in SQL.
     """
     manager, session = get_manager(EventsManager)
     try:
-        events = manager.get_all()
-        for e in events:
-            click.echo(
+        where_clause, order_by, selected = parse_query(Event, where, order_by, fields)
+        fields, output_format = resolve_fields(selected, LIST_FIELDS, Event.HEADERS, output_format)
+        displayed, last = echo_records(
+            manager.get_rows(where_clause, fields=fields, limit=limit, after=after, order_by=order_by),
+            fields,
+            output_format,
+            text_line=lambda e: (
                 f"[{e.id}] {e.event_name} - {e.start_date} à {e.location} "
                 f"(Contrat #{e.contract_id}, Support: {e.support_contact_id})"
-            )
+            ),
+        )
+        if last is not None and not order_by:
+            echo_next_page(getattr(last, "id", None), displayed, limit)
+    except ValueError as e:
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @event.command(name="list-unassigned")
-def list_unassigned():
+@format_option
+def list_unassigned(output_format):
     """
     List events without an assigned support user (Management only).
 
@@ -101,15 +122,14 @@ def list_unassigned():
     """
     manager, session = get_manager(EventsManager)
     try:
-        events = manager.get_unassigned_support_events()
-        for e in events:
-            click.echo(f"[{e.id}] {e.event_name} - {e.start_date} à {e.location}")
+        echo_records(manager.get_unassigned_event_rows(), Event.HEADERS, output_format, text_line=short_event_line)
     finally:
         session.close()
 
 
 @event.command(name="list-my")
-def list_my_events():
+@format_option
+def list_my_events(output_format):
     """
     List events assigned to the authenticated support user.
 
@@ -117,13 +137,18 @@ def list_my_events():
     """
     manager, session = get_manager(EventsManager)
     try:
-        events = manager.get_my_events()
-        for e in events:
-            click.echo(f"[{e.id}] {e.event_name} - {e.start_date} à {e.location}")
+        echo_records(manager.get_my_event_rows(), Event.HEADERS, output_format, text_line=short_event_line)
     finally:
         session.close()
 
 
+def short_event_line(e) -> str:
+    """
+    Text line of an event in the ``list-unassigned`` and ``list-my`` commands.
+    """
+    return f"[{e.id}] {e.event_name} - {e.start_date} à {e.location}"
+
+
 @event.command()
 @click.option("--event-id", prompt="ID de l'événement")
 @click.option("--location", default=None)
@@ -161,28 +186,33 @@ def update(event_id, location, attendees, notes, support_id):
         manager.update(Event.id == int(event_id), **values)
         click.secho("Événement mis à jour avec succès.", fg="green")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()
 
 
 @event.command()
 @click.option("--event-id", prompt="ID de l'événement")
-def delete(event_id):
+@dry_run_options
+def delete(event_id, dry_run, preview):
     """
     Delete an event (requires proper permissions).
 
     Only support staff can delete their own events. ACCOUNTING can delete
-    any event.
+    any event. With ``--dry-run``, the event is only counted, and ``--preview``
+    lists it.
 
     Raises:
         Exception: If unauthorized or deletion fails.
     """
     manager, session = get_manager(EventsManager)
     try:
+        if dry_run:
+            echo_cascade(manager.cascade_resolver, manager.count_cascade(Event.id == int(event_id)), preview)
+            return
         manager.delete(Event.id == int(event_id))
         click.secho(f"Événement {event_id} supprimé.", fg="yellow")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()
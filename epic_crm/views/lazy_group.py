@@ -0,0 +1,101 @@
+import ast
+import click
+from importlib import import_module
+from importlib.util import find_spec
+
+
+class LazyGroup(click.Group):
+    """
+    Click group whose subcommands are imported only when they are invoked.
+
+    Each lazy subcommand is declared by name with the ``"module:attribute"`` path of
+    the click command. ``--help`` reads the short help of the commands from the
+    docstrings in the source of their modules, without importing any view module (and
+    therefore without loading the controllers, SQLAlchemy, bcrypt...).
+    """
+
+    def __init__(self, *args, lazy_commands: dict = None, **kwargs) -> None:
+        """
+        Initialize the group.
+
+        Args:
+            lazy_commands (dict): Mapping ``name -> import_path`` where ``import_path``
+                is formatted as ``"module:attribute"``.
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx):
+        """
+        Return the names of the eager and lazy subcommands, sorted.
+        """
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        """
+        Return a subcommand, importing its module if it is a lazy one.
+        """
+        if cmd_name in self.lazy_commands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name):
+        """
+        Import a lazy subcommand and return it.
+
+        Raises:
+            ValueError: If the imported attribute is not a click command.
+        """
+        import_path = self.lazy_commands[cmd_name]
+        module_name, attribute = import_path.split(":")
+        command = getattr(import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise ValueError(f"{import_path} is not a click command.")
+        return command
+
+    def invoke(self, ctx):
+        """
+        Invoke the group, keeping the invoked command line in ``ctx.meta["command_line"]``
+        (the group callback only sees its own options).
+        """
+        ctx.meta.setdefault("command_line", [*ctx.protected_args, *ctx.args])
+        return super().invoke(ctx)
+
+    def _read_docstring(self, cmd_name) -> str:
+        """
+        Read the docstring of a lazy subcommand from the source of its module, without
+        importing the module.
+
+        Returns:
+            str: The docstring, or an empty string if it cannot be found.
+        """
+        module_name, attribute = self.lazy_commands[cmd_name].split(":")
+        spec = find_spec(module_name)
+        with open(spec.origin, encoding="utf-8") as file:
+            tree = ast.parse(file.read())
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and node.name == attribute:
+                return ast.get_docstring(node) or ""
+        return ""
+
+    def format_commands(self, ctx, formatter):
+        """
+        Write the commands section of the help page, reading the help of the lazy
+        subcommands from their source (see ``_read_docstring``).
+        """
+        names = self.list_commands(ctx)
+        # Same width as the help of a regular click group.
+        limit = formatter.width - 6 - max((len(name) for name in names), default=0)
+        rows = []
+        for name in names:
+            if name in self.lazy_commands:
+                rows.append((name, click.utils.make_default_short_help(self._read_docstring(name), limit)))
+            else:
+                command = super().get_command(ctx, name)
+                if command is None or command.hidden:
+                    continue
+                rows.append((name, command.get_short_help_str(limit)))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
@@ -0,0 +1,218 @@
+import csv
+import enum
+import itertools
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Iterable, List, Tuple
+
+import click
+
+
+OUTPUT_FORMATS = ("text", "table", "csv", "json", "ndjson")
+
+# Number of rows read before printing a table, to compute the column widths.
+TABLE_SAMPLE_SIZE = 100
+
+
+def format_option(command):
+    """
+    Add the ``--format`` option of the list commands.
+
+    ``text`` is the historical human-readable output; ``table``, ``csv``, ``json`` and
+    ``ndjson`` print every field of the model's ``HEADERS``.
+    """
+    return click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(OUTPUT_FORMATS),
+        default="text",
+        show_default=True,
+        help="Output format.",
+    )(command)
+
+
+def dry_run_options(command):
+    """
+    Add the ``--dry-run`` and ``--preview`` options of the delete commands.
+
+    With ``--dry-run``, the command only counts the records the deletion would remove
+    (see ``echo_cascade``) and ``--preview`` also lists the first records of each table.
+    """
+    command = click.option(
+        "--preview",
+        type=click.IntRange(min=0),
+        default=0,
+        show_default=True,
+        help="With --dry-run, also list this many affected records per table.",
+    )(command)
+    command = click.option(
+        "--dry-run", is_flag=True, help="Only display the number of records the deletion would remove."
+    )(command)
+    return command
+
+
+def echo_cascade(resolver, counts: Iterable, preview: int = 0):
+    """
+    Display the records a deletion would remove: their number per table and, with a
+    preview, the first page of each table (``CascadeResolver.get_cascade_page``).
+
+    Args:
+        resolver (CascadeResolver): Resolver loading the pages.
+        counts (Iterable[CascadeCount]): Summary of the cascade.
+        preview (int): Number of records listed per table (0 for the counts only).
+    """
+    for count in counts:
+        click.echo(str(count))
+        if preview and count.count:
+            click.echo(str(resolver.get_cascade_page(count, limit=preview)))
+            if count.count > preview:
+                click.echo(f"... et {count.count - preview:,} autre(s).")
+
+
+def echo_error(message: str):
+    """
+    Print the error of a command in red and end the command with exit code 1.
+
+    The exit code is what scripts, the batch runner and the daemon read to know that
+    the command failed: the colour of the output is only meant for humans.
+
+    Args:
+        message (str): Error message.
+    """
+    click.secho(message, fg="red")
+    click.get_current_context().exit(1)
+
+
+def to_json_value(value):
+    """
+    Convert a column value to a JSON-compatible value (enums by name, dates in ISO 8601,
+    decimals as strings to keep their precision).
+    """
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def to_text(value) -> str:
+    """
+    Convert a column value to the text written in CSV files and tables (empty for None).
+    """
+    value = to_json_value(value)
+    return "" if value is None else str(value)
+
+
+def record_values(record, fields: List[str]) -> tuple:
+    """
+    Read the fields of a record, which can be a model instance or a row of ``get_rows``.
+    """
+    return tuple(getattr(record, field) for field in fields)
+
+
+def echo_records(
+    records: Iterable, fields: List[str], output_format: str = "text", text_line: Callable = None
+) -> Tuple[int, object]:
+    """
+    Write records in the requested format, one at a time.
+
+    Records are consumed as they come from the database cursor: the memory used does not
+    depend on the number of records (the ``table`` format only buffers the first
+    ``TABLE_SAMPLE_SIZE`` records to size its columns).
+
+    Args:
+        records (Iterable): Model instances or rows.
+        fields (List[str]): Fields written by the machine-readable formats.
+        output_format (str): One of ``OUTPUT_FORMATS``.
+        text_line (Callable): Builds the line of a record in the ``text`` format.
+
+    Returns:
+        Tuple[int, object]: Number of written records and last record (None if there is none).
+    """
+    writers = {
+        "text": lambda records: _echo_text(records, text_line),
+        "table": lambda records: _echo_table(records, fields),
+        "csv": lambda records: _echo_csv(records, fields),
+        "json": lambda records: _echo_json(records, fields),
+        "ndjson": lambda records: _echo_ndjson(records, fields),
+    }
+    counter = _Counter(records)
+    writers[output_format](counter)
+    return counter.count, counter.last
+
+
+class _Counter:
+    """
+    Iterable wrapper counting the records and remembering the last one.
+    """
+
+    def __init__(self, records: Iterable) -> None:
+        self.records = records
+        self.count = 0
+        self.last = None
+
+    def __iter__(self):
+        for record in self.records:
+            self.count += 1
+            self.last = record
+            yield record
+
+
+def _echo_text(records, text_line: Callable):
+    for record in records:
+        click.echo(text_line(record))
+
+
+def _echo_csv(records, fields: List[str]):
+    stream = click.get_text_stream("stdout")
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(fields)
+    for record in records:
+        writer.writerow([to_text(value) for value in record_values(record, fields)])
+
+
+def _echo_ndjson(records, fields: List[str]):
+    for record in records:
+        values = (to_json_value(value) for value in record_values(record, fields))
+        click.echo(json.dumps(dict(zip(fields, values)), ensure_ascii=False))
+
+
+def _echo_json(records, fields: List[str]):
+    # The array is written element by element instead of being serialized at once.
+    separator = "["
+    for record in records:
+        values = (to_json_value(value) for value in record_values(record, fields))
+        click.echo(separator + json.dumps(dict(zip(fields, values)), ensure_ascii=False))
+        separator = ","
+    click.echo("[]" if separator == "[" else "]")
+
+
+def _echo_table(records, fields: List[str]):
+    records = iter(records)
+    sample = [
+        [to_text(value) for value in record_values(record, fields)]
+        for record in itertools.islice(records, TABLE_SAMPLE_SIZE)
+    ]
+    widths = [max([len(field)] + [len(row[i]) for row in sample]) for i, field in enumerate(fields)]
+
+    def line(cells):
+        return "  ".join(_fit(cell, width) for cell, width in zip(cells, widths)).rstrip()
+
+    click.echo(line(fields))
+    click.echo("  ".join("-" * width for width in widths))
+    for row in sample:
+        click.echo(line(row))
+    for record in records:
+        click.echo(line([to_text(value) for value in record_values(record, fields)]))
+
+
+def _fit(cell: str, width: int) -> str:
+    """
+    Pad a cell to the column width, truncating it when it is longer (rows after the sample).
+    """
+    if len(cell) > width:
+        return cell[: width - 1] + "…"
+    return cell.ljust(width)
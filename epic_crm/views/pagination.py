@@ -0,0 +1,76 @@
+import click
+
+
+def pagination_options(command):
+    """
+    Add the ``--limit`` and ``--after`` options of the list commands.
+
+    Without ``--limit`` every record is streamed; with it, one page is displayed and
+    the ``--after`` value of the next page is suggested.
+    """
+    command = click.option(
+        "--after", type=int, default=None, help="Only list records with an ID greater than this one."
+    )(command)
+    command = click.option(
+        "--limit", type=click.IntRange(min=1), default=None, help="Maximum number of records to display."
+    )(command)
+    return command
+
+
+def query_options(command):
+    """
+    Add the ``--where``, ``--order-by`` and ``--fields`` options of the list commands.
+
+    The options are compiled by ``controllers.filters.parse_query`` into the SELECT itself:
+    only the fields of the model's ``HEADERS`` are accepted.
+    """
+    command = click.option(
+        "--fields", default=None, help="Comma-separated fields to display, e.g. id,email."
+    )(command)
+    command = click.option(
+        "--order-by", default=None, help="Comma-separated sort fields, '-' prefixed for a descending order."
+    )(command)
+    command = click.option(
+        "--where",
+        multiple=True,
+        help="Filter such as to_be_paid>0 or full_name~dupont (=, !=, <, <=, >, >=, ~). Repeatable.",
+    )(command)
+    return command
+
+
+def resolve_fields(selected, text_fields, headers, output_format: str):
+    """
+    Choose the displayed fields and the output format of a list command.
+
+    Without ``--fields``, the ``text`` format keeps its historical fields and the other
+    formats use every field of ``HEADERS``. The ``text`` lines cannot show arbitrary
+    fields, so selecting fields switches it to ``table``.
+
+    Args:
+        selected (List[str]): Fields given with ``--fields``, or None.
+        text_fields (List[str]): Fields of the ``text`` format.
+        headers (List[str]): Fields of the model's ``HEADERS``.
+        output_format (str): Requested output format.
+
+    Returns:
+        tuple: ``(fields, output_format)``.
+    """
+    if selected:
+        return selected, "table" if output_format == "text" else output_format
+    return (text_fields if output_format == "text" else headers), output_format
+
+
+def echo_next_page(last_id: int, displayed: int, limit: int = None):
+    """
+    Suggest the option displaying the next page when the current one is full.
+
+    The hint is written on the error output, to keep the machine-readable formats valid.
+    It is skipped when the ID of the last record is unknown (not among the ``--fields``).
+
+    Args:
+        last_id (int): ID of the last displayed record.
+        displayed (int): Number of displayed records.
+        limit (int): Page size (None when every record was streamed).
+    """
+    if last_id is not None and limit is not None and displayed == limit:
+        click.secho(f"Page suivante : --limit {limit} --after {last_id}", fg="yellow", err=True)
@@ -0,0 +1,63 @@
+import click
+from controllers.contract_controller import AGEING_BUCKETS, TOTALS_GROUP_FIELDS, ContractsManager
+from controllers.utils import get_manager
+from views.output import format_option, echo_error, echo_records
+
+# Labels of the ageing buckets in the text format.
+BUCKET_LABELS = {"days_0_30": "0-30 j", "days_31_60": "31-60 j", "days_61_90": "61-90 j", "days_over_90": "+90 j"}
+
+
+@click.group()
+def report():
+    """
+    Reporting command group.
+
+    This group provides subcommands computing reports on the whole database,
+    aggregated by the database itself.
+    """
+    pass
+
+
+@report.command()
+@click.option(
+    "--by",
+    "group_by",
+    type=click.Choice(TOTALS_GROUP_FIELDS),
+    default=None,
+    help="Group the balances per client, sales contact or signature status (one total by default).",
+)
+@click.option(
+    "--as-of",
+    type=click.DateTime(),
+    default=None,
+    help="Date the ages of the contracts are computed at (now by default).",
+)
+@format_option
+def receivables(group_by, as_of, output_format):
+    """
+    Display the amounts remaining to be paid, split by age of the contracts.
+
+    The balances of the unpaid contracts are summed by the database, in one query,
+    with ageing buckets on the creation date of the contracts: 0-30, 31-60, 61-90
+    and more than 90 days. Only accounting users can run it.
+    """
+    manager, session = get_manager(ContractsManager)
+    try:
+        rows = manager.get_receivables(group_by=group_by, as_of=as_of)
+        buckets = [field for field, _, _ in AGEING_BUCKETS]
+        fields = ([group_by] if group_by else []) + ["contracts", "to_be_paid"] + buckets
+        echo_records(
+            rows,
+            fields,
+            output_format,
+            text_line=lambda r: (
+                (f"[{group_by} = {getattr(r, group_by)}] " if group_by else "")
+                + f"{r.contracts} contrat(s) - Reste à payer: {r.to_be_paid}€ ("
+                + ", ".join(f"{BUCKET_LABELS[field]} : {getattr(r, field)}€" for field in buckets)
+                + ")"
+            ),
+        )
+    except Exception as e:
+        echo_error(str(e))
+    finally:
+        session.close()
@@ -0,0 +1,16 @@
+import click
+
+
+@click.command()
+def shell():
+    """
+    Open an interactive shell running the CRM commands in a single process.
+
+    The user is authenticated once; the database connection pool, the loaded modules
+    and the authenticated principal are kept between commands. The tab key completes
+    command names, options and the IDs given to --client-id, --contract-id, --event-id
+    and --support-id (IDs cached until a command of the shell writes to their table).
+    """
+    from shell import run_shell
+
+    run_shell()
@@ -0,0 +1,17 @@
+import click
+import os
+
+
+@click.command()
+def logout():
+    """
+    Log out the current user by deleting the local JWT token file.
+
+    If the `.token` file does not exist, notifies the user.
+    """
+
+    if os.path.exists(".token"):
+        os.remove(".token")
+        click.secho("Déconnecté avec succès. Token supprimé.", fg="green")
+    else:
+        click.secho("Aucun token trouvé.", fg="yellow")
@@ -1,9 +1,16 @@
 import click
-import os
+import csv
+import json
+import time
+from typing import List, TextIO
 from controllers.authentication import retrieve_authenticated_user, authenticate_user
+from controllers.base_controller import CREATE_CHUNK_SIZE
 from controllers.user_controller import UserManager
+from controllers.filters import parse_query
 from controllers.utils import get_manager
-from models.users import Department
+from models.users import Department, User
+from views.output import format_option, echo_error, echo_records
+from views.pagination import query_options, resolve_fields
 
 
 @click.command()
@@ -28,7 +35,77 @@ def create_user_cmd(firstname, lastname, email, password, role):
         user = manager.create(firstname, lastname, email, password, role_enum)
         click.secho(f"Utilisateur {user.email} créé (ID: {user.id})", fg="green")
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
+    finally:
+        session.close()
+
+
+# Fields of a user in the files of import-users (the options of create-user).
+IMPORT_FIELDS = ("firstname", "lastname", "email", "password", "role")
+
+
+def read_user_rows(file: TextIO, file_format: str) -> List[dict]:
+    """
+    Read the users of an import file.
+
+    Args:
+        file (TextIO): CSV file with a header line, or JSON file holding a list of objects.
+        file_format (str): ``csv`` or ``json``.
+
+    Returns:
+        List[dict]: The ``IMPORT_FIELDS`` of each user (other fields are ignored), the role
+        converted to a ``Department``.
+
+    Raises:
+        ValueError: If the JSON is not a list of objects or a role is unknown.
+    """
+    if file_format == "json":
+        records = json.load(file)
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise ValueError("Le fichier JSON doit contenir une liste d'utilisateurs.")
+    else:
+        records = list(csv.DictReader(file))
+
+    rows = []
+    for number, record in enumerate(records, start=1):
+        row = {key: value for key, value in record.items() if key in IMPORT_FIELDS}
+        role = str(row.get("role") or "").upper()
+        if role not in Department.__members__:
+            raise ValueError(f"Utilisateur {number} : rôle inconnu '{row.get('role')}'.")
+        row["role"] = Department[role]
+        rows.append(row)
+    return rows
+
+
+@click.command(name="import-users")
+@click.argument("file", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(["csv", "json"]),
+    default=None,
+    help="Format of the file (guessed from its extension by default).",
+)
+@click.option("--workers", type=click.IntRange(min=1), default=None, help="Processes hashing the passwords.")
+@click.option("--chunk-size", type=click.IntRange(min=1), default=CREATE_CHUNK_SIZE, show_default=True)
+def import_users(file, file_format, workers, chunk_size):
+    """
+    Create users in bulk from a CSV or JSON file.
+
+    Each user has a firstname, lastname, email, password and role (accounting, sales or
+    support). The passwords are hashed in parallel, one process per available core by
+    default. Only available to ACCOUNTING users.
+    """
+    file_format = file_format or ("json" if file.name.lower().endswith(".json") else "csv")
+    manager, session = get_manager(UserManager)
+    try:
+        rows = read_user_rows(file, file_format)
+        start = time.perf_counter()
+        result = manager.create_many(rows, chunk_size=chunk_size, workers=workers)
+        click.secho(str(result), fg="red" if result.failures else "green")
+        click.echo(f"{len(rows)} utilisateur(s) traité(s) en {time.perf_counter() - start:.1f} s")
+    except Exception as e:
+        echo_error(str(e))
     finally:
         session.close()
 
@@ -57,22 +134,7 @@ def login(email, password, save_token):
                 f.write(token_or_msg)
             click.secho("Token sauvegardé dans .token", fg="yellow")
     else:
-        click.secho(f"{token_or_msg}", fg="red")
-
-
-@click.command()
-def logout():
-    """
-    Log out the current user by deleting the local JWT token file.
-
-    If the `.token` file does not exist, notifies the user.
-    """
-
-    if os.path.exists(".token"):
-        os.remove(".token")
-        click.secho("Déconnecté avec succès. Token supprimé.", fg="green")
-    else:
-        click.secho("Aucun token trouvé.", fg="yellow")
+        echo_error(f"{token_or_msg}")
 
 
 @click.command()
@@ -90,26 +152,34 @@ def current_user():
         user = retrieve_authenticated_user(session)
         click.echo(f"Connecté en tant que {user.full_name} ({user.role.name})")
     except ValueError as e:
-        click.secho(f"{str(e)}", fg="red")
+        echo_error(f"{str(e)}")
 
 
 @click.command(name="list-users")
-def list_users():
+@query_options
+@format_option
+def list_users(where, order_by, fields, output_format):
     """
     List all users registered in the system.
 
     Accessible to ACCOUNTING users only. Displays ID, name, email,
-    and department role for each user.
+    and department role for each user; ``--where``, ``--order-by`` and ``--fields``
+    filter, sort and select the fields in SQL.
 
     Raises:
         Exception: If the request fails or permission is denied.
     """
     manager, session = get_manager(UserManager)
     try:
-        users = manager.get_all()
-        for u in users:
-            click.echo(f"[{u.id}] {u.full_name} - {u.email} ({u.role.name})")
+        where_clause, order_by, selected = parse_query(User, where, order_by, fields)
+        fields, output_format = resolve_fields(selected, User.HEADERS, User.HEADERS, output_format)
+        echo_records(
+            manager.get_rows(where_clause, fields=fields, order_by=order_by),
+            fields,
+            output_format,
+            text_line=lambda u: f"[{u.id}] {u.full_name} - {u.email} ({u.role.name})",
+        )
     except Exception as e:
-        click.secho(str(e), fg="red")
+        echo_error(str(e))
     finally:
         session.close()